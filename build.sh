@@ -1,4 +1,7 @@
 #!/bin/bash
 pip install --upgrade pip
 pip install -r requirements.txt
+# The web service runs under ASGI (see render.yaml): gunicorn's uvicorn
+# worker class and psycopg's connection pool (DATABASE_POOL).
+pip install uvicorn-worker "psycopg[pool]"
 python manage.py collectstatic --noinput
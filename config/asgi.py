@@ -13,4 +13,20 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up (it touches models).
+from products.sse import SSE_PATH_RE, import_progress_app  # noqa: E402
+
+
+async def application(scope, receive, send):
+    """
+    Routes the import-progress SSE stream to its dedicated ASGI app;
+    everything else goes to Django.
+    """
+    if scope["type"] == "http":
+        match = SSE_PATH_RE.match(scope["path"])
+        if match:
+            await import_progress_app(scope, receive, send, match["job_id"])
+            return
+    await django_application(scope, receive, send)
@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import task_postrun, task_prerun
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
@@ -9,3 +10,17 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 
 # auto-discover tasks from all apps
 app.autodiscover_tasks()
+
+# Per-task query count / SQL time (see config/querycount.py).
+from config.querycount import task_finished, task_started  # noqa: E402
+
+task_prerun.connect(task_started, weak=False)
+task_postrun.connect(task_finished, weak=False)
+
+
+@task_postrun.connect(weak=False)
+def flush_metrics(**kwargs) -> None:
+    # Push the task's metrics now rather than on the next timed flush.
+    from config.metrics import REGISTRY
+
+    REGISTRY.flush()
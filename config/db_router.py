@@ -0,0 +1,143 @@
+"""
+Read-replica routing.
+
+Writes, and every read that hasn't opted in, go to "default" (the primary).
+Read-only views opt in with `@use_replica`; code outside a request can use
+`read_from_replica()`. Inside either, reads go to a random alias from
+settings.DATABASE_REPLICAS.
+
+Read-your-writes: any unsafe request (POST, ...) sets a short-lived cookie
+(ReplicaStickinessMiddleware) and while it is present `@use_replica` views
+read from the primary, so a user never sees a replica that hasn't caught up
+with their own change yet.
+
+Imports, bulk actions and signal handlers never opt in and stay on the
+primary, and so does any read inside an open transaction on the primary
+(it may depend on that transaction's own uncommitted writes).
+
+Locally, point DATABASE_REPLICA_URLS at the same database as DATABASE_URL
+to exercise the routing with two aliases.
+"""
+
+import contextvars
+import functools
+import random
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+PRIMARY_PIN_COOKIE = "primary_pin"
+
+_read_from_replica = contextvars.ContextVar("read_from_replica", default=False)
+
+
+def replica_aliases():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+@contextmanager
+def read_from_replica() -> Iterator[None]:
+    token = _read_from_replica.set(True)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+def iter_from_replica(iterable: Iterable) -> Iterator:
+    """
+    Wrap a lazy iterable (e.g. a streaming response body) so each step reads
+    from a replica, without the flag leaking to the consumer between steps.
+    """
+    iterator = iter(iterable)
+    while True:
+        with read_from_replica():
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def use_replica(view):
+    """
+    Route the view's reads to a replica unless the client is pinned to the
+    primary after a recent write. Works for async views too: the flag is a
+    context variable, which the async ORM carries into its worker thread.
+    """
+
+    if iscoroutinefunction(view):
+
+        @functools.wraps(view)
+        async def async_wrapped(request, *args, **kwargs):
+            if PRIMARY_PIN_COOKIE in request.COOKIES:
+                return await view(request, *args, **kwargs)
+            with read_from_replica():
+                return await view(request, *args, **kwargs)
+
+        return async_wrapped
+
+    @functools.wraps(view)
+    def wrapped(request, *args, **kwargs):
+        if PRIMARY_PIN_COOKIE in request.COOKIES:
+            return view(request, *args, **kwargs)
+        with read_from_replica():
+            return view(request, *args, **kwargs)
+
+    return wrapped
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if replicas and _read_from_replica.get() and not connections["default"].in_atomic_block:
+            return random.choice(replicas)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication.
+        return db not in replica_aliases()
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Pin the client to the primary for REPLICA_STICKY_SECONDS after any
+    request that may have written.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self._pin(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._pin(request, await self.get_response(request))
+
+    def _pin(self, request, response):
+        if replica_aliases() and request.method not in ("GET", "HEAD", "OPTIONS", "TRACE"):
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,67 @@
+"""
+Signal-free bulk deletes.
+
+QuerySet.delete() loads every matching row so it can send pre/post_delete
+signals and emulate cascades. That is wrong for the bulk paths here: a
+full-sync sweep or a seed/bench cleanup must not fan out one
+product.deleted webhook per row, and they keep the facet counters and the
+catalog version in step themselves. Those paths delete by primary key with
+plain SQL through the helpers below instead of Django's private
+QuerySet._raw_delete.
+
+No signals are sent and nothing cascades: only use these on models with no
+dependent rows, or whose dependents the database removes (ON DELETE).
+"""
+from typing import Callable, Iterable, List
+
+from django.db import connections, router
+from django.db.models import QuerySet
+
+
+def delete_pks(model, pks: Iterable, using: str = "default") -> int:
+    """
+    DELETE the `model` rows with these primary keys; returns the row count.
+    """
+    connection = connections[using]
+    pk_field = model._meta.pk
+    values = [pk_field.get_db_prep_value(pk, connection) for pk in pks]
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(pk_field.column)
+    # SQLite caps the number of bound parameters per statement.
+    step = connection.features.max_query_params or len(values) or 1
+
+    deleted = 0
+    with connection.cursor() as cursor:
+        for i in range(0, len(values), step):
+            chunk = values[i:i + step]
+            cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({', '.join(['%s'] * len(chunk))})", chunk)
+            deleted += cursor.rowcount
+    return deleted
+
+
+def delete_in_batches(
+    qs: QuerySet,
+    batch_size: int,
+    on_batch: Callable[[List], None] | None = None,
+) -> int:
+    """
+    Delete the rows matching `qs`, `batch_size` primary keys at a time.
+
+    `on_batch(pks)` runs before each batch is deleted (e.g. to remove files
+    the rows point at). Outside a transaction every batch commits on its
+    own, which keeps locks and WAL bursts short. Reads and deletes both go
+    to the model's write database, so a lagging replica can't hand back
+    rows that are already gone.
+    """
+    using = router.db_for_write(qs.model)
+    qs = qs.using(using)
+    deleted = 0
+    while True:
+        batch = list(qs.values_list("pk", flat=True)[:batch_size])
+        if not batch:
+            return deleted
+        if on_batch is not None:
+            on_batch(batch)
+        deleted += delete_pks(qs.model, batch, using=using)
+        if len(batch) < batch_size:
+            return deleted
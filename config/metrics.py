@@ -0,0 +1,369 @@
+"""
+Prometheus-style metrics shared by the web and Celery processes.
+
+Counters and histograms aggregate in process memory (a dict update under a
+lock, cheap enough for the import loop) and a background thread flushes
+them every METRICS_FLUSH_SECONDS with one pipelined HINCRBYFLOAT batch into
+Redis, so gunicorn workers and Celery workers all add into the same totals.
+Recording a metric never waits on Redis, which matters on the ASGI event
+loop. The
+`/metrics` view renders the Redis totals in the Prometheus text format,
+plus any scrape-time collectors (queue depth, job counts).
+
+Without Redis the view falls back to the serving process's own values.
+"""
+import atexit
+import hmac
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis ships with celery[redis]
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+METRICS_KEY_PREFIX = "metrics:"
+METRICS_FLUSH_SECONDS = 5.0
+# Same bounds as the progress client (products/progress.py): a hung Redis
+# delays a flush or a scrape by seconds, not indefinitely.
+REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS = 1.0
+REDIS_SOCKET_TIMEOUT_SECONDS = 2.0
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Separates label values (and the histogram suffix) inside a Redis field.
+_SEP = "\x1f"
+
+# (name, documentation, type, [(sample name, labels dict, value), ...])
+Family = Tuple[str, str, str, List[Tuple[str, Dict[str, str], float]]]
+
+
+class Registry:
+    """
+    Holds the metric definitions and the not-yet-flushed increments.
+    """
+
+    def __init__(self) -> None:
+        self.metrics: Dict[str, "Metric"] = {}
+        self.collectors: List[Callable[[], Iterable[Family]]] = []
+        self._lock = threading.Lock()
+        # name -> field -> amount, since the last flush / since start.
+        self._pending: Dict[str, Dict[str, float]] = {}
+        self._local: Dict[str, Dict[str, float]] = {}
+        self._client = None
+        self._client_pid = None
+        self._flusher_pid = None
+
+    def register(self, metric: "Metric") -> None:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name!r} is already registered.")
+        self.metrics[metric.name] = metric
+
+    def add_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        """
+        Register a callable evaluated on every scrape (for gauges such as
+        queue depth that are cheaper to read than to maintain).
+        """
+        self.collectors.append(collector)
+
+    def add(self, name: str, field: str, amount: float) -> None:
+        with self._lock:
+            pending = self._pending.setdefault(name, {})
+            pending[field] = pending.get(field, 0.0) + amount
+            local = self._local.setdefault(name, {})
+            local[field] = local.get(field, 0.0) + amount
+        self._ensure_flusher()
+
+    def _ensure_flusher(self) -> None:
+        # One flusher thread per process; threads don't survive the fork
+        # after gunicorn --preload.
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+        threading.Thread(target=self._run_flusher, name="metrics-flusher", daemon=True).start()
+
+    def _run_flusher(self) -> None:
+        while True:
+            time.sleep(METRICS_FLUSH_SECONDS)
+            self.flush()
+
+    def _get_client(self):
+        # One client per process: gunicorn --preload forks after import.
+        if self._client_pid != os.getpid():
+            self._client = None
+            self._client_pid = os.getpid()
+            if redis is not None and settings.REDIS_URL:
+                self._client = redis.Redis.from_url(
+                    settings.REDIS_URL,
+                    socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS,
+                    socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+                )
+        return self._client
+
+    def flush(self) -> None:
+        """
+        Push pending increments to Redis. Never raises; on failure the
+        increments are kept for the next attempt.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for name, fields in pending.items():
+                for field, amount in fields.items():
+                    pipe.hincrbyfloat(METRICS_KEY_PREFIX + name, field, amount)
+            pipe.execute()
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("Could not flush metrics: %s", exc)
+            with self._lock:
+                for name, fields in pending.items():
+                    merged = self._pending.setdefault(name, {})
+                    for field, amount in fields.items():
+                        merged[field] = merged.get(field, 0.0) + amount
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """
+        Cluster-wide totals from Redis, or this process's own if Redis is
+        unavailable.
+        """
+        self.flush()
+        client = self._get_client()
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                names = list(self.metrics)
+                for name in names:
+                    pipe.hgetall(METRICS_KEY_PREFIX + name)
+                return {
+                    name: {field.decode(): float(value) for field, value in raw.items()}
+                    for name, raw in zip(names, pipe.execute())
+                }
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("Could not read metrics from Redis: %s", exc)
+        with self._lock:
+            return {name: dict(fields) for name, fields in self._local.items()}
+
+    def render(self) -> str:
+        totals = self.totals()
+        lines: List[str] = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.extend(_render_family(*metric.samples(totals.get(name, {}))))
+        for collector in self.collectors:
+            try:
+                for family in collector():
+                    lines.extend(_render_family(*family))
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Metrics collector %r failed: %s", collector, exc)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+atexit.register(REGISTRY.flush)
+
+
+class Metric:
+    kind = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Registry = REGISTRY,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry
+        registry.register(self)
+
+    def _field(self, labels: Dict[str, object], suffix: str = "") -> str:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        values = [str(labels[name]) for name in self.labelnames]
+        if suffix:
+            values.append(suffix)
+        return _SEP.join(values)
+
+    def _labels(self, parts: Sequence[str]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, parts))
+
+    def samples(self, fields: Dict[str, float]) -> Family:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        self.registry.add(self.name, self._field(labels), amount)
+
+    def samples(self, fields: Dict[str, float]) -> Family:
+        samples = []
+        for field, value in sorted(fields.items()):
+            parts = field.split(_SEP) if self.labelnames else []
+            samples.append((self.name + "_total", self._labels(parts), value))
+        return self.name, self.documentation, self.kind, samples
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        idx = bisect_left(self.buckets, value)
+        le = repr(self.buckets[idx]) if idx < len(self.buckets) else "+Inf"
+        # Per-bucket (non-cumulative) counts; cumulated when rendered.
+        self.registry.add(self.name, self._field(labels, "le=" + le), 1)
+        self.registry.add(self.name, self._field(labels, "sum"), value)
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self, fields: Dict[str, float]) -> Family:
+        series: Dict[Tuple[str, ...], Dict[str, float]] = {}
+        for field, value in fields.items():
+            parts = field.split(_SEP)
+            series.setdefault(tuple(parts[:-1]), {})[parts[-1]] = value
+
+        samples = []
+        for key, values in sorted(series.items()):
+            labels = self._labels(key)
+            cumulative = 0.0
+            for le in [repr(b) for b in self.buckets] + ["+Inf"]:
+                cumulative += values.get("le=" + le, 0.0)
+                samples.append((self.name + "_bucket", {**labels, "le": le}, cumulative))
+            samples.append((self.name + "_sum", labels, values.get("sum", 0.0)))
+            samples.append((self.name + "_count", labels, cumulative))
+        return self.name, self.documentation, self.kind, samples
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _render_family(name: str, documentation: str, kind: str, samples) -> List[str]:
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for sample_name, labels, value in samples:
+        if labels:
+            rendered = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+            sample_name = f"{sample_name}{{{rendered}}}"
+        value = float(value)
+        lines.append(f"{sample_name} {int(value) if value.is_integer() else repr(value)}")
+    return lines
+
+
+def _collect_queue_depth() -> Iterable[Family]:
+    """
+    Messages waiting in the Celery queue (Redis broker: one list per queue).
+    """
+    client = REGISTRY._get_client()
+    if client is None:
+        return []
+    queue = getattr(settings, "CELERY_TASK_DEFAULT_QUEUE", "celery")
+    return [
+        (
+            "importer_celery_queue_length",
+            "Tasks waiting in the Celery queue.",
+            "gauge",
+            [("importer_celery_queue_length", {"queue": queue}, client.llen(queue))],
+        )
+    ]
+
+
+REGISTRY.add_collector(_collect_queue_depth)
+
+
+def _may_scrape(request) -> bool:
+    """
+    Staff sessions, or a scraper sending `Authorization: Bearer
+    <METRICS_TOKEN>`. With no token configured only staff get in.
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_active and user.is_staff:
+        return True
+    token = settings.METRICS_TOKEN
+    if not token:
+        return False
+    scheme, _, supplied = request.headers.get("Authorization", "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(supplied.strip(), token)
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. Queue depth and job counts aren't public,
+    so anonymous requests get a 403.
+    """
+    if not _may_scrape(request):
+        return HttpResponseForbidden("Metrics require staff access or the METRICS_TOKEN bearer token.")
+    return HttpResponse(REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "importer_http_request_seconds",
+    "Time spent handling a request, by view.",
+    ["view", "method"],
+)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records request latency per URL name (bounded label set; unresolved
+    paths are grouped as "unmatched").
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        return self._observe(request, self.get_response(request), start)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        return self._observe(request, await self.get_response(request), start)
+
+    def _observe(self, request, response, start: float):
+        match = getattr(request, "resolver_match", None)
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            view=(match.url_name or match.view_name) if match else "unmatched",
+            method=request.method,
+        )
+        return response
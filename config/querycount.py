@@ -0,0 +1,201 @@
+"""
+Per-request and per-task SQL accounting.
+
+Every query run while a request (QueryCountMiddleware) or Celery task
+(connected in config/celery.py) is in flight goes through a
+`connection.execute_wrapper`, which counts it and times it. Requests get a
+`Server-Timing` header (visible in the browser's network panel) and every
+request/task is logged on the "config.querycount" logger at DEBUG.
+
+Views can declare the most queries they should ever need with
+`@query_budget(n)`; QueryBudgetTestMixin enforces the budget in tests, and
+the middleware logs a warning if it is exceeded at runtime.
+"""
+import contextlib
+import logging
+import time
+from typing import Callable, Dict, Iterator
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """
+    Running totals for one request or task; used as an execute wrapper.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0  # seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+
+@contextlib.contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Count and time the queries run on every configured database inside the
+    block.
+    """
+    stats = QueryStats()
+    with contextlib.ExitStack() as stack:
+        for alias in settings.DATABASES:
+            stack.enter_context(connections[alias].execute_wrapper(stats))
+        yield stats
+
+
+def query_budget(max_queries: int) -> Callable:
+    """
+    Declare the most queries a view may run, e.g. `@query_budget(3)`.
+
+    Apply it outermost so the attribute sits on the function the URLconf
+    routes to.
+    """
+
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+
+    return decorator
+
+
+class QueryCountMiddleware:
+    """
+    Adds `Server-Timing: db;dur=..;desc="N queries", app;dur=..` to every
+    response and logs the totals. Keep it first in MIDDLEWARE so queries made
+    by other middleware (sessions, auth) are counted too.
+
+    For streaming responses only the queries run before the first byte are
+    included.
+
+    Async-capable, so async views aren't pushed back onto a thread. Their ORM
+    calls run in the request's thread-sensitive worker thread (connections
+    are per thread), so the wrappers are installed and removed there.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with track_queries() as stats:
+            response = self.get_response(request)
+        return self._report(request, response, stats, start)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        stack = contextlib.ExitStack()
+        stats = await sync_to_async(stack.enter_context)(track_queries())
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self._report(request, response, stats, start)
+
+    def _report(self, request, response, stats: QueryStats, start: float):
+        total_ms = (time.perf_counter() - start) * 1000
+
+        timing = f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries", app;dur={total_ms:.1f}'
+        existing = response.get("Server-Timing")
+        response["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+        budget = getattr(request, "query_budget", None)
+        if budget is not None and stats.count > budget:
+            logger.warning(
+                "%s %s ran %d queries (budget %d)", request.method, request.path, stats.count, budget
+            )
+        else:
+            logger.debug(
+                "%s %s: %d queries, %.1f ms SQL, %.1f ms total",
+                request.method,
+                request.path,
+                stats.count,
+                stats.duration_ms,
+                total_ms,
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = getattr(view_func, "query_budget", None)
+        return None
+
+
+# Celery: task id -> (ExitStack holding the wrappers, stats, start time).
+_task_stats: Dict[str, tuple] = {}
+
+
+def task_started(task_id=None, task=None, **kwargs) -> None:
+    """
+    `task_prerun` handler: start counting queries for this task.
+    """
+    stack = contextlib.ExitStack()
+    stats = stack.enter_context(track_queries())
+    _task_stats[task_id] = (stack, stats, time.perf_counter())
+
+
+def task_finished(task_id=None, task=None, state=None, **kwargs) -> None:
+    """
+    `task_postrun` handler: log the task's query totals.
+    """
+    entry = _task_stats.pop(task_id, None)
+    if entry is None:
+        return
+    stack, stats, start = entry
+    stack.close()
+    logger.debug(
+        "task %s [%s] %s: %d queries, %.1f ms SQL, %.1f ms total",
+        getattr(task, "name", "?"),
+        task_id,
+        state,
+        stats.count,
+        stats.duration_ms,
+        (time.perf_counter() - start) * 1000,
+    )
+
+
+class QueryBudgetTestMixin:
+    """
+    TestCase mixin that fails when a view runs more queries than its
+    `@query_budget`, listing the SQL so the regression is easy to find.
+    """
+
+    def assertQueryBudget(self, path: str, method: str = "get", **kwargs):
+        view = resolve(path.split("?", 1)[0]).func
+        budget = getattr(view, "query_budget", None)
+        if budget is None:
+            self.fail(f"{path} has no @query_budget")
+
+        with self.assertMaxQueries(budget):
+            response = getattr(self.client, method)(path, **kwargs)
+        return response
+
+    @contextlib.contextmanager
+    def assertMaxQueries(self, max_queries: int, using: str = "default"):
+        with CaptureQueriesContext(connections[using]) as ctx:
+            yield ctx
+        if len(ctx) > max_queries:
+            queries = "\n".join(f"{i}. {q['sql']}" for i, q in enumerate(ctx.captured_queries, 1))
+            self.fail(f"{len(ctx)} queries executed, budget is {max_queries}:\n{queries}")
@@ -43,6 +43,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so queries made by the other middleware are counted too.
+    "config.querycount.QueryCountMiddleware",
+    "config.metrics.RequestMetricsMiddleware",
+    "config.db_router.ReplicaStickinessMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -72,15 +76,66 @@ TEMPLATES = [
 WSGI_APPLICATION = "config.wsgi.application"
 
 
-CONN_MAX_AGE = 60
-
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Persistent connections: seconds a connection is kept and reused across
+# requests (and, through Celery's Django fixup, across tasks); 0 reconnects
+# every time. Reused connections are health-checked first.
+DB_CONN_MAX_AGE = int(os.environ.get("DB_CONN_MAX_AGE", "600"))
+
+# Optional psycopg 3 connection pool per process (needs psycopg[pool]), in
+# place of persistent connections; PostgreSQL only. Pooled connections are
+# health-checked on checkout as well.
+DATABASE_POOL = os.environ.get("DATABASE_POOL", "").lower() in ("1", "true", "yes")
+DATABASE_POOL_MIN_SIZE = int(os.environ.get("DATABASE_POOL_MIN_SIZE", "1"))
+DATABASE_POOL_MAX_SIZE = int(os.environ.get("DATABASE_POOL_MAX_SIZE", "4"))
+# Seconds to wait for a free pooled connection before erroring.
+DATABASE_POOL_TIMEOUT = float(os.environ.get("DATABASE_POOL_TIMEOUT", "10"))
+
+
+def _connection_options(db: dict) -> dict:
+    if DATABASE_POOL and db.get("ENGINE") == "django.db.backends.postgresql":
+        # Django refuses a pool combined with persistent connections.
+        db["CONN_MAX_AGE"] = 0
+        db.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": DATABASE_POOL_MIN_SIZE,
+            "max_size": DATABASE_POOL_MAX_SIZE,
+            "timeout": DATABASE_POOL_TIMEOUT,
+        }
+    return db
+
+
 DATABASES = {
-    'default': dj_database_url.config(default=os.environ.get("DATABASE_URL"))
+    "default": _connection_options(
+        dj_database_url.config(
+            default=os.environ.get("DATABASE_URL"),
+            conn_max_age=DB_CONN_MAX_AGE,
+            conn_health_checks=True,
+        )
+    )
 }
 
+# Read replicas (comma-separated URLs). Only views decorated with
+# @use_replica and the export scan read from them; see config/db_router.py.
+# Pointing this at DATABASE_URL gives a two-alias setup for local testing.
+DATABASE_REPLICAS = []
+for _idx, _url in enumerate(u for u in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if u.strip()):
+    _alias = f"replica_{_idx}"
+    DATABASES[_alias] = _connection_options(
+        dj_database_url.parse(_url.strip(), conn_max_age=DB_CONN_MAX_AGE, conn_health_checks=True)
+    )
+    # The test runner points replicas at the test primary instead of
+    # creating separate test databases.
+    DATABASES[_alias]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(_alias)
+
+DATABASE_ROUTERS = ["config.db_router.ReplicaRouter"]
+
+# How long a client reads from the primary after a write (read-your-writes);
+# keep it above the replicas' worst normal lag.
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", "15"))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -126,6 +181,41 @@ REDIS_URL = os.getenv("REDIS_URL")
 CELERY_BROKER_URL = REDIS_URL
 CELERY_RESULT_BACKEND = REDIS_URL
 
+# Bearer token Prometheus sends to scrape /metrics; staff sessions are
+# always allowed. Unset means staff only.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Share of webhook deliveries run under the sampling profiler (0 disables).
+WEBHOOK_PROFILE_SAMPLE_RATE = float(os.getenv("WEBHOOK_PROFILE_SAMPLE_RATE", "0"))
+
+# Retention for the raw webhook delivery log and its rollups (see
+# webhooks/rollups.py); pruned daily by the beat schedule below.
+WEBHOOK_DELIVERY_RETENTION_DAYS = int(os.getenv("WEBHOOK_DELIVERY_RETENTION_DAYS", "30"))
+WEBHOOK_MINUTE_ROLLUP_RETENTION_DAYS = int(os.getenv("WEBHOOK_MINUTE_ROLLUP_RETENTION_DAYS", "2"))
+WEBHOOK_HOUR_ROLLUP_RETENTION_DAYS = int(os.getenv("WEBHOOK_HOUR_ROLLUP_RETENTION_DAYS", "400"))
+# Stored event payloads only need to outlive their queued deliveries.
+WEBHOOK_EVENT_RETENTION_HOURS = int(os.getenv("WEBHOOK_EVENT_RETENTION_HOURS", "24"))
+
+CELERY_BEAT_SCHEDULE = {
+    "prune-webhook-deliveries": {
+        "task": "webhooks.tasks.prune_webhook_deliveries",
+        "schedule": 24 * 60 * 60,
+    },
+    "prune-webhook-events": {
+        "task": "webhooks.tasks.prune_webhook_events",
+        "schedule": 60 * 60,
+    },
+}
+
+# Local directory of supplier delta files imported in batches (see
+# products/dropfolder.py); empty disables the periodic ingest.
+IMPORT_DROPFOLDER = os.getenv("IMPORT_DROPFOLDER", "")
+if IMPORT_DROPFOLDER:
+    CELERY_BEAT_SCHEDULE["ingest-dropfolder"] = {
+        "task": "products.tasks.ingest_dropfolder",
+        "schedule": 30,
+    }
+
 ALLOWED_HOSTS = ["*"]
 
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
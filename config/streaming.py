@@ -0,0 +1,45 @@
+"""
+Streaming responses that stay streamed under ASGI.
+
+Django's ASGI handler reads a streaming response through `__aiter__`, and
+for a sync iterator that falls back to `sync_to_async(list)(...)`: the
+whole body is built in memory before the first byte is sent. The
+responses below pull one chunk (or file block) at a time through
+`sync_to_async` instead. The pulls are thread-sensitive, so they run on
+the thread that ran the view and keep using its database connection (an
+export's server-side cursor lives there).
+
+Under WSGI they behave exactly like Django's own classes.
+"""
+from asgiref.sync import sync_to_async
+from django.http import FileResponse as DjangoFileResponse
+from django.http import StreamingHttpResponse as DjangoStreamingHttpResponse
+
+_DONE = object()
+
+
+def _next_part(iterator):
+    return next(iterator, _DONE)
+
+
+class _PullPerChunkMixin:
+    async def __aiter__(self):
+        if self.is_async:
+            async for part in super().__aiter__():
+                yield part
+            return
+        iterator = iter(self.streaming_content)
+        pull = sync_to_async(_next_part)
+        while True:
+            part = await pull(iterator)
+            if part is _DONE:
+                return
+            yield part
+
+
+class StreamingHttpResponse(_PullPerChunkMixin, DjangoStreamingHttpResponse):
+    pass
+
+
+class FileResponse(_PullPerChunkMixin, DjangoFileResponse):
+    pass
@@ -1,9 +1,14 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from config.metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
 
+    # Prometheus scrape endpoint
+    path("metrics", metrics_view, name="metrics"),
+
     # Product management
     path("", include("products.urls")),              # Root → product list
     path("products/", include("products.urls")),     # Explicit products prefix
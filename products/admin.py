@@ -1,3 +1,9 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ImportProfile
+
+
+@admin.register(ImportProfile)
+class ImportProfileAdmin(admin.ModelAdmin):
+    list_display = ("name", "delimiter", "encoding", "max_reject_rate", "created_at")
+    search_fields = ("name",)
@@ -0,0 +1,52 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import CatalogVersion
+
+# CatalogVersion is a single-row table.
+CATALOG_VERSION_PK = 1
+
+# Reported before the first product write ever happens.
+CATALOG_EPOCH = datetime(2000, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def bump_catalog_version() -> None:
+    """
+    Record that the catalog changed.
+
+    Call inside the transaction that writes products so readers never see a
+    new version before the rows themselves are visible.
+    """
+    now = timezone.now()
+    updated = CatalogVersion.objects.filter(pk=CATALOG_VERSION_PK).update(
+        version=F("version") + 1,
+        updated_at=now,
+    )
+    if not updated:
+        CatalogVersion.objects.get_or_create(
+            pk=CATALOG_VERSION_PK,
+            defaults={"version": 1, "updated_at": now},
+        )
+
+
+def get_catalog_version() -> CatalogVersion:
+    """
+    Current catalog version (one primary-key lookup, never a products scan).
+    """
+    version = CatalogVersion.objects.filter(pk=CATALOG_VERSION_PK).first()
+    if version is None:
+        # Nothing has been written yet; report a stable epoch version.
+        version = CatalogVersion(pk=CATALOG_VERSION_PK, version=0, updated_at=CATALOG_EPOCH)
+    return version
+
+
+async def aget_catalog_version() -> CatalogVersion:
+    """
+    Async variant of get_catalog_version() for async views.
+    """
+    version = await CatalogVersion.objects.filter(pk=CATALOG_VERSION_PK).afirst()
+    if version is None:
+        version = CatalogVersion(pk=CATALOG_VERSION_PK, version=0, updated_at=CATALOG_EPOCH)
+    return version
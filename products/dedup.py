@@ -0,0 +1,105 @@
+"""
+Whole-file SKU deduplication for imports.
+
+A first, cheap pass over the file records the last line on which each SKU
+key appears; the import pass then only writes a row if it is that last
+occurrence, so every SKU is written exactly once with its final values.
+
+The index is a plain dict until it holds `max_in_memory` keys, after which
+it spills to an on-disk SQLite table in a temp file, keeping memory bounded
+for very large files.
+"""
+import os
+import sqlite3
+import tempfile
+from typing import Dict, Iterable
+
+# Keys held in memory before spilling to disk (~100 bytes each).
+DEDUP_MEMORY_KEYS = 500_000
+
+# SQLite's default limit on bound parameters is 999.
+_LOOKUP_BATCH = 900
+
+
+class LastOccurrenceIndex:
+    """
+    sku_key -> last line number, with spill-to-disk.
+
+    Usage: `add()` every row in file order, `finish()`, then resolve rows
+    with `last_lines()`. Use as a context manager so the spill file is
+    always removed.
+    """
+
+    def __init__(self, max_in_memory: int = DEDUP_MEMORY_KEYS) -> None:
+        self.max_in_memory = max_in_memory
+        self._mem: Dict[str, int] = {}
+        self._db: sqlite3.Connection | None = None
+        self._path: str | None = None
+
+    def __enter__(self) -> "LastOccurrenceIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def spilled(self) -> bool:
+        return self._db is not None
+
+    def add(self, key: str, line: int) -> None:
+        self._mem[key] = line
+        if len(self._mem) >= self.max_in_memory:
+            self._spill()
+
+    def finish(self) -> None:
+        """
+        Call once all rows were added. Moves any remaining buffered keys to
+        disk if the index has spilled, so lookups hit a single store.
+        """
+        if self._db is not None and self._mem:
+            self._spill()
+
+    def last_lines(self, keys: Iterable[str]) -> Dict[str, int]:
+        if self._db is None:
+            mem = self._mem
+            return {key: mem[key] for key in keys if key in mem}
+
+        keys = list(set(keys))
+        found: Dict[str, int] = {}
+        for i in range(0, len(keys), _LOOKUP_BATCH):
+            batch = keys[i:i + _LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            found.update(
+                self._db.execute(
+                    f"SELECT key, line FROM last_seen WHERE key IN ({placeholders})", batch
+                )
+            )
+        return found
+
+    def _spill(self) -> None:
+        if self._db is None:
+            fd, self._path = tempfile.mkstemp(prefix="import-dedup-", suffix=".sqlite3")
+            os.close(fd)
+            self._db = sqlite3.connect(self._path)
+            # Scratch data: no journal, no fsync.
+            self._db.execute("PRAGMA journal_mode=OFF")
+            self._db.execute("PRAGMA synchronous=OFF")
+            self._db.execute("CREATE TABLE last_seen (key TEXT PRIMARY KEY, line INTEGER NOT NULL)")
+
+        self._db.executemany(
+            "INSERT OR REPLACE INTO last_seen (key, line) VALUES (?, ?)",
+            self._mem.items(),
+        )
+        self._db.commit()
+        self._mem.clear()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        if self._path:
+            try:
+                os.remove(self._path)
+            except FileNotFoundError:
+                pass
+            self._path = None
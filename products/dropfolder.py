@@ -0,0 +1,126 @@
+"""
+Drop-folder ingest.
+
+Suppliers that send many small delta files drop them into a local directory
+(settings.IMPORT_DROPFOLDER) instead of uploading each one. `ingest()`
+groups the files that have arrived into one ImportJob per window, so a
+burst of files costs one job, one Celery task, one round of SKU lookups per
+chunk and one `import.completed` webhook instead of one of each per file.
+
+- Files are taken in arrival order (modification time, then name). Rows are
+  numbered across the batch, so the last row for a SKU wins, whichever file
+  it is in (see tasks._batch_rows).
+- A file is only picked up once it hasn't changed for `settle` seconds, so
+  half-written files are left alone.
+- A batch is released once its oldest file has waited `window` seconds, or
+  as soon as it reaches `max_files` / `max_bytes`.
+- Claimed files are moved into storage under imports/batches/<job id>/, so
+  a file is imported once. Run a single ingester at a time (the beat
+  schedule or the `ingest_dropfolder` command).
+"""
+import os
+import time
+from typing import List, NamedTuple
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+from .models import ImportJob, ImportProfile
+from .sources import IMPORT_EXTENSIONS
+from .tasks import process_import_job
+
+# Seconds the oldest waiting file may sit before its batch is imported.
+DROPFOLDER_WINDOW_SECONDS = 60
+# Seconds a file must go unmodified before it counts as fully written.
+DROPFOLDER_SETTLE_SECONDS = 5
+DROPFOLDER_MAX_FILES = 500
+DROPFOLDER_MAX_BYTES = 256 * 1024 * 1024
+
+
+class DroppedFile(NamedTuple):
+    path: str
+    size: int
+    mtime: float
+
+
+def pending_files(directory: str, settle: float = DROPFOLDER_SETTLE_SECONDS) -> List[DroppedFile]:
+    """
+    Importable files in `directory` that have settled, oldest first.
+    """
+    cutoff = time.time() - settle
+    found = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith(".") or not entry.is_file():
+                continue
+            if os.path.splitext(entry.name)[1].lower() not in IMPORT_EXTENSIONS:
+                continue
+            stat = entry.stat()
+            if stat.st_mtime <= cutoff:
+                found.append(DroppedFile(entry.path, stat.st_size, stat.st_mtime))
+    found.sort(key=lambda f: (f.mtime, os.path.basename(f.path)))
+    return found
+
+
+def _next_batch(files: List[DroppedFile], max_files: int, max_bytes: int) -> List[DroppedFile]:
+    # Always at least one file, even if it alone exceeds max_bytes.
+    batch = files[:1]
+    size = batch[0].size
+    for f in files[1:max_files]:
+        if size + f.size > max_bytes:
+            break
+        batch.append(f)
+        size += f.size
+    return batch
+
+
+def _claim(batch: List[DroppedFile], profile: ImportProfile | None) -> ImportJob:
+    job = ImportJob(profile=profile, status=ImportJob.STATUS_PENDING)
+    entries = []
+    for seq, dropped in enumerate(batch):
+        name = os.path.basename(dropped.path)
+        with open(dropped.path, "rb") as fh:
+            stored = default_storage.save(f"imports/batches/{job.pk}/{seq:04d}-{name}", File(fh))
+        entries.append({"name": name, "path": stored, "size": dropped.size})
+
+    first, last = entries[0]["name"], entries[-1]["name"]
+    label = first if len(entries) == 1 else f"{len(entries)} files: {first} … {last}"
+    job.original_filename = label[:255]
+    job.batch_files = entries
+    job.save()
+
+    # Only once the job exists: a crash before this point re-ingests the
+    # files next time (harmless, the import is an upsert) instead of
+    # losing them.
+    for dropped in batch:
+        os.remove(dropped.path)
+    return job
+
+
+def ingest(
+    directory: str,
+    window: float = DROPFOLDER_WINDOW_SECONDS,
+    settle: float = DROPFOLDER_SETTLE_SECONDS,
+    max_files: int = DROPFOLDER_MAX_FILES,
+    max_bytes: int = DROPFOLDER_MAX_BYTES,
+    profile: ImportProfile | None = None,
+    flush: bool = False,
+) -> List[ImportJob]:
+    """
+    Claim the batches that are ready and queue one import per batch.
+    `flush` releases a partial batch without waiting out the window.
+
+    Returns the created jobs.
+    """
+    files = pending_files(directory, settle)
+    jobs = []
+    while files:
+        batch = _next_batch(files, max_files, max_bytes)
+        full = len(batch) < len(files) or len(batch) >= max_files
+        if not (full or flush or time.time() - batch[0].mtime >= window):
+            break
+        job = _claim(batch, profile)
+        process_import_job.delay(str(job.pk))
+        jobs.append(job)
+        files = files[len(batch):]
+    return jobs
@@ -0,0 +1,227 @@
+"""
+Streaming catalog export (CSV / JSON Lines / Parquet).
+
+Rows are read with ``values_list(...).iterator(chunk_size=...)`` so Postgres
+uses a server-side cursor and no model instances are built. Output is
+produced one chunk at a time, so memory stays flat whether the export has
+1k or 5M rows.
+"""
+import csv
+import json
+import zlib
+from io import StringIO
+from typing import Dict, Iterable, Iterator
+
+from django.db.models import QuerySet
+
+try:  # Parquet support is optional.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on the deployment
+    pa = None
+    pq = None
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+FORMAT_PARQUET = "parquet"
+
+FORMAT_CHOICES = [
+    (FORMAT_CSV, "CSV"),
+    (FORMAT_JSONL, "JSON Lines"),
+    (FORMAT_PARQUET, "Parquet"),
+]
+
+CONTENT_TYPES = {
+    FORMAT_CSV: "text/csv",
+    FORMAT_JSONL: "application/x-ndjson",
+    FORMAT_PARQUET: "application/vnd.apache.parquet",
+}
+
+# Same column names the importer reads, so a CSV export can be re-imported.
+EXPORT_FIELDS = ("sku", "name", "description", "price", "is_active")
+
+# Rows fetched per round-trip from the server-side cursor.
+EXPORT_CHUNK_SIZE = 2000
+
+
+class ExportError(ValueError):
+    """Raised for an unsupported format / option combination."""
+
+
+def export_filename(fmt: str, compress: bool = False) -> str:
+    name = f"products.{fmt}"
+    if compress and fmt != FORMAT_PARQUET:
+        name += ".gz"
+    return name
+
+
+def export_content_type(fmt: str, compress: bool = False) -> str:
+    if compress and fmt != FORMAT_PARQUET:
+        return "application/gzip"
+    return CONTENT_TYPES[fmt]
+
+
+def iter_export_chunks(
+    qs: QuerySet,
+    fmt: str,
+    compress: bool = False,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    stats: Dict[str, int] | None = None,
+) -> Iterator[bytes]:
+    """
+    Yield the export of `qs` as a sequence of byte chunks.
+
+    - `compress` gzips CSV / JSONL output on the fly (Parquet is always
+      compressed internally, so the flag is ignored for it).
+    - `stats`, if given, gets a running "rows" count.
+    """
+    if fmt not in CONTENT_TYPES:
+        raise ExportError(f"Unsupported export format: {fmt!r}")
+    if fmt == FORMAT_PARQUET and pa is None:
+        raise ExportError("Parquet export requires the 'pyarrow' package.")
+
+    if stats is None:
+        stats = {}
+    stats.setdefault("rows", 0)
+
+    rows = (
+        qs.order_by("id")
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+
+    if fmt == FORMAT_PARQUET:
+        yield from _iter_parquet(rows, chunk_size, stats)
+        return
+
+    encoder = _iter_csv if fmt == FORMAT_CSV else _iter_jsonl
+    chunks = encoder(rows, chunk_size, stats)
+    if compress:
+        chunks = _gzip_chunks(chunks)
+    yield from chunks
+
+
+def _batched(rows: Iterable[tuple], size: int) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _iter_csv(rows: Iterable[tuple], chunk_size: int, stats: Dict[str, int]) -> Iterator[bytes]:
+    out = StringIO()
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_FIELDS)
+
+    for batch in _batched(rows, chunk_size):
+        for sku, name, description, price, is_active in batch:
+            writer.writerow([sku, name, description, price, "true" if is_active else "false"])
+        stats["rows"] += len(batch)
+        yield out.getvalue().encode("utf-8")
+        out.seek(0)
+        out.truncate(0)
+
+    # Header-only export (no matching rows).
+    if out.tell():
+        yield out.getvalue().encode("utf-8")
+
+
+def _iter_jsonl(rows: Iterable[tuple], chunk_size: int, stats: Dict[str, int]) -> Iterator[bytes]:
+    for batch in _batched(rows, chunk_size):
+        lines = [
+            json.dumps(
+                {
+                    "sku": sku,
+                    "name": name,
+                    "description": description,
+                    "price": str(price),
+                    "is_active": is_active,
+                },
+                ensure_ascii=False,
+            )
+            for sku, name, description, price, is_active in batch
+        ]
+        stats["rows"] += len(batch)
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    # wbits=31 -> gzip container, so the output is a regular .gz file.
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class _ByteSink:
+    """
+    Minimal writable file object handed to ParquetWriter.
+
+    Bytes accumulate until `drain()` is called, so each row group can be sent
+    to the client as soon as it is written.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_schema():
+    return pa.schema(
+        [
+            ("sku", pa.string()),
+            ("name", pa.string()),
+            ("description", pa.string()),
+            ("price", pa.decimal128(12, 2)),
+            ("is_active", pa.bool_()),
+        ]
+    )
+
+
+def _iter_parquet(rows: Iterable[tuple], chunk_size: int, stats: Dict[str, int]) -> Iterator[bytes]:
+    schema = _parquet_schema()
+    sink = _ByteSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for batch in _batched(rows, chunk_size):
+            columns = list(zip(*batch))
+            table = pa.Table.from_arrays(
+                [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+                schema=schema,
+            )
+            # One row group per chunk keeps the writer's buffer bounded.
+            writer.write_table(table)
+            stats["rows"] += len(batch)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
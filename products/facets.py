@@ -0,0 +1,241 @@
+"""
+Incrementally maintained catalog counters.
+
+CatalogFacet holds one row per counter: the total, active and inactive
+product counts and one per price band. Every product write applies the
+matching +/-1 deltas in the same transaction (one UPDATE ... CASE for all
+touched counters), so the list page and API read facet totals with a single
+small query instead of GROUP BY scans. `reconcile_facets()` rebuilds the
+table from the products table if it ever drifts.
+"""
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, Tuple
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Value, When
+
+from .models import CatalogFacet, Product
+
+FACET_TOTAL = "total"
+FACET_ACTIVE = "active"
+FACET_INACTIVE = "inactive"
+
+# Upper bounds (exclusive) of the price bands; the last band is open-ended.
+PRICE_BANDS = (Decimal("10"), Decimal("50"), Decimal("100"), Decimal("500"), Decimal("1000"))
+
+
+def _band_keys() -> Tuple[str, ...]:
+    keys = []
+    lower = Decimal("0")
+    for upper in PRICE_BANDS:
+        keys.append(f"price:{lower}-{upper}")
+        lower = upper
+    keys.append(f"price:{lower}+")
+    return tuple(keys)
+
+
+PRICE_BAND_KEYS = _band_keys()
+FACET_KEYS = (FACET_TOTAL, FACET_ACTIVE, FACET_INACTIVE) + PRICE_BAND_KEYS
+
+# (is_active, price) of a stored product row.
+FacetState = Tuple[bool, Decimal]
+
+_deferred = threading.local()
+
+
+def price_band(price) -> str:
+    price = Decimal(price or 0)
+    for idx, upper in enumerate(PRICE_BANDS):
+        if price < upper:
+            return PRICE_BAND_KEYS[idx]
+    return PRICE_BAND_KEYS[-1]
+
+
+def state_deltas(old: FacetState | None, new: FacetState | None) -> Counter:
+    """
+    Counter deltas for a row changing from `old` to `new` (None: the row
+    doesn't exist on that side).
+    """
+    deltas: Counter = Counter()
+    for state, sign in ((old, -1), (new, 1)):
+        if state is None:
+            continue
+        is_active, price = state
+        deltas[FACET_TOTAL] += sign
+        deltas[FACET_ACTIVE if is_active else FACET_INACTIVE] += sign
+        deltas[price_band(price)] += sign
+    return deltas
+
+
+def changes_deltas(changes: Iterable[Tuple[FacetState | None, FacetState | None]]) -> Counter:
+    """
+    Summed deltas for many (old, new) row changes, e.g. one import chunk.
+    """
+    deltas: Counter = Counter()
+    for old, new in changes:
+        deltas.update(state_deltas(old, new))
+    return deltas
+
+
+def _band_case() -> Case:
+    whens = []
+    for idx, upper in enumerate(PRICE_BANDS):
+        whens.append(When(price__lt=upper, then=Value(PRICE_BAND_KEYS[idx])))
+    return Case(*whens, default=Value(PRICE_BAND_KEYS[-1]))
+
+
+def queryset_deltas(qs, sign: int = -1) -> Counter:
+    """
+    Deltas for removing (sign=-1) or adding every row of `qs`, computed with
+    one GROUP BY over just those rows. For bulk writes that bypass signals
+    (full-sync sweep, raw deletes).
+    """
+    deltas: Counter = Counter()
+    rows = qs.order_by().annotate(band=_band_case()).values("is_active", "band").annotate(n=Count("pk"))
+    for row in rows:
+        n = row["n"] * sign
+        deltas[FACET_TOTAL] += n
+        deltas[FACET_ACTIVE if row["is_active"] else FACET_INACTIVE] += n
+        deltas[row["band"]] += n
+    return deltas
+
+
+def apply_deltas(deltas: Dict[str, int]) -> None:
+    """
+    Apply counter deltas with a single UPDATE. Call inside the transaction
+    that writes the products. Inside `deferred_facet_updates()` the deltas
+    are accumulated and applied once when the block exits.
+    """
+    deltas = {key: n for key, n in deltas.items() if n}
+    if not deltas:
+        return
+
+    pending = getattr(_deferred, "pending", None)
+    if pending is not None:
+        pending.update(deltas)
+        return
+
+    updated = CatalogFacet.objects.filter(key__in=deltas).update(
+        count=F("count") + Case(*(When(key=key, then=Value(n)) for key, n in deltas.items()), default=Value(0))
+    )
+    if updated < len(deltas):
+        # A counter row is missing (table never reconciled): create it.
+        existing = set(CatalogFacet.objects.filter(key__in=deltas).values_list("key", flat=True))
+        for key in deltas.keys() - existing:
+            _, created = CatalogFacet.objects.get_or_create(key=key, defaults={"count": deltas[key]})
+            if not created:
+                CatalogFacet.objects.filter(key=key).update(count=F("count") + deltas[key])
+
+
+@contextmanager
+def deferred_facet_updates() -> Iterator[None]:
+    """
+    Collect the deltas of many single-row writes (e.g. a bulk delete that
+    fires post_delete per row) and apply them in one UPDATE at the end.
+    """
+    outer = getattr(_deferred, "pending", None)
+    if outer is not None:
+        yield
+        return
+    _deferred.pending = Counter()
+    try:
+        yield
+        pending = _deferred.pending
+    finally:
+        _deferred.pending = None
+    apply_deltas(pending)
+
+
+def get_facets() -> Dict[str, int]:
+    """
+    All counters, read in one query over a handful of rows.
+    """
+    facets = dict.fromkeys(FACET_KEYS, 0)
+    facets.update(CatalogFacet.objects.values_list("key", "count"))
+    return facets
+
+
+async def aget_facets() -> Dict[str, int]:
+    """
+    Async variant of get_facets() for async views.
+    """
+    facets = dict.fromkeys(FACET_KEYS, 0)
+    facets.update([row async for row in CatalogFacet.objects.values_list("key", "count")])
+    return facets
+
+
+def facet_summary(facets: Dict[str, int]) -> Dict[str, object]:
+    """
+    API / template shape: totals plus an ordered list of price bands.
+    """
+    return {
+        "total": facets[FACET_TOTAL],
+        "active": facets[FACET_ACTIVE],
+        "inactive": facets[FACET_INACTIVE],
+        "price_bands": [
+            {"band": key.split(":", 1)[1], "count": facets[key]} for key in PRICE_BAND_KEYS
+        ],
+    }
+
+
+def filtered_count(filters: Dict[str, str], facets: Dict[str, int]) -> int | None:
+    """
+    Row count for the product list's `filters` if the counters answer it
+    (no text or range filters), else None and the caller has to COUNT.
+    """
+    if any(filters.get(key) for key in ("sku", "name", "description", "price_min", "price_max", "updated_since")):
+        return None
+    active = filters.get("active")
+    if active == "true":
+        return facets[FACET_ACTIVE]
+    if active == "false":
+        return facets[FACET_INACTIVE]
+    return facets[FACET_TOTAL]
+
+
+def compute_facets() -> Dict[str, int]:
+    """
+    Counters recomputed from the products table (one aggregate scan).
+    """
+    facets = dict.fromkeys(FACET_KEYS, 0)
+    facets.update(queryset_deltas(Product.objects.all(), sign=1))
+    return facets
+
+
+def reconcile_facets() -> Dict[str, Tuple[int, int]]:
+    """
+    Rebuild every counter from the products table. Returns the counters
+    that had drifted as {key: (stored, actual)}.
+
+    The counter rows are locked first: concurrent writers queue behind the
+    lock and apply their deltas on top of the recomputed values.
+    """
+    with transaction.atomic():
+        stored = dict(CatalogFacet.objects.select_for_update().values_list("key", "count"))
+        actual = compute_facets()
+        drift = {
+            key: (stored.get(key, 0), count)
+            for key, count in actual.items()
+            if stored.get(key) != count
+        }
+        for key, (_, count) in drift.items():
+            CatalogFacet.objects.update_or_create(key=key, defaults={"count": count})
+        # Counters for bands that no longer exist.
+        CatalogFacet.objects.exclude(key__in=FACET_KEYS).delete()
+    return drift
+
+
+def loaded_state(instance: Product) -> FacetState | None:
+    """
+    (is_active, price) of `instance` as last read from / written to the
+    database (see Product.from_db), or None for an unsaved row.
+    """
+    return getattr(instance, "_facet_state", None)
+
+
+def remember_state(instances: Iterable[Product]) -> None:
+    for instance in instances:
+        instance._facet_state = (instance.is_active, instance.price)
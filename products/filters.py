@@ -0,0 +1,158 @@
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Mapping, Tuple
+
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import normalize_sku_key
+
+# `sort` values -> ORDER BY. Every order ends in a unique column so keyset
+# cursors are stable, and each matches a composite index on Product:
+# the primary key, sku_key (unique), (price, id) / (is_active, price, id)
+# and (updated_at, id).
+SORTS = {
+    "id": ("id",),
+    "sku": ("sku_key",),
+    "price": ("price", "id"),
+    "-price": ("-price", "-id"),
+    "updated": ("updated_at", "id"),
+    "-updated": ("-updated_at", "-id"),
+}
+DEFAULT_SORT = "sku"
+
+
+class FilterError(ValueError):
+    """
+    A filter value that can't be parsed (strict mode only).
+    """
+
+
+def _parse_decimal(value: str) -> Decimal | None:
+    try:
+        parsed = Decimal(value)
+    except InvalidOperation:
+        return None
+    return parsed if parsed.is_finite() else None
+
+
+def _parse_since(value: str) -> datetime | None:
+    parsed = parse_datetime(value)
+    if parsed is not None and timezone.is_naive(parsed):
+        # <input type="datetime-local"> sends no offset.
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _clean(value: str, parse, error: str, strict: bool):
+    # (parsed, cleaned string); an unparseable value is dropped or raises.
+    if not value:
+        return None, ""
+    try:
+        parsed = parse(value)
+    except ValueError:  # parse_datetime: well-formed but out of range
+        parsed = None
+    if parsed is None:
+        if strict:
+            raise FilterError(error)
+        return None, ""
+    return parsed, value
+
+
+def filter_products(
+    qs: QuerySet,
+    params: Mapping[str, str],
+    strict: bool = False,
+) -> Tuple[QuerySet, Dict[str, str]]:
+    """
+    Apply the product list filters (sku, name, description, active,
+    price_min / price_max, updated_since).
+
+    Shared by the HTML list, the export endpoint and the management command so
+    an export always contains exactly what the list page shows.
+
+    Unparseable price / date values are dropped, or raise FilterError with
+    `strict` (the JSON API).
+
+    Returns the filtered queryset and the cleaned filter values.
+    """
+    q_sku = params.get("sku") or ""
+    q_name = params.get("name") or ""
+    q_desc = params.get("description") or ""
+    q_active = params.get("active") or ""  # "true"/"false"/""
+    q_price_min = (params.get("price_min") or "").strip()
+    q_price_max = (params.get("price_max") or "").strip()
+    q_updated_since = (params.get("updated_since") or "").strip()
+
+    if q_sku:
+        # sku_key is already lower-cased, so no UPPER()/LOWER() per row.
+        qs = qs.filter(sku_key__contains=normalize_sku_key(q_sku))
+    if q_name:
+        qs = qs.filter(name__icontains=q_name)
+    if q_desc:
+        qs = qs.filter(description__icontains=q_desc)
+    if q_active in ["true", "false"]:
+        qs = qs.filter(is_active=(q_active == "true"))
+
+    # Range predicates: index range scans on (price, id) / (is_active,
+    # price, id) and (updated_at, id).
+    price_min, q_price_min = _clean(q_price_min, _parse_decimal, "price_min must be a number.", strict)
+    price_max, q_price_max = _clean(q_price_max, _parse_decimal, "price_max must be a number.", strict)
+    updated_since, q_updated_since = _clean(
+        q_updated_since, _parse_since, "updated_since must be an ISO 8601 datetime.", strict
+    )
+    if price_min is not None:
+        qs = qs.filter(price__gte=price_min)
+    if price_max is not None:
+        qs = qs.filter(price__lte=price_max)
+    if updated_since is not None:
+        qs = qs.filter(updated_at__gte=updated_since)
+
+    return qs, {
+        "sku": q_sku,
+        "name": q_name,
+        "description": q_desc,
+        "active": q_active,
+        "price_min": q_price_min,
+        "price_max": q_price_max,
+        "updated_since": q_updated_since,
+    }
+
+
+def sort_products(
+    qs: QuerySet,
+    sort: str | None,
+    strict: bool = False,
+    default: str = DEFAULT_SORT,
+) -> Tuple[QuerySet, str]:
+    """
+    Order `qs` by one of SORTS (unknown values fall back to `default`, or
+    raise FilterError with `strict`). Returns the queryset and the sort used.
+    """
+    sort = sort or default
+    if sort not in SORTS:
+        if strict:
+            raise FilterError(f"sort must be one of: {', '.join(SORTS)}.")
+        sort = default
+    return qs.order_by(*SORTS[sort]), sort
+
+
+def after_cursor(qs: QuerySet, sort: str, value, last_id: int) -> QuerySet:
+    """
+    Keyset condition for "rows after (value, last_id)" in `sort` order.
+
+    Written as `price >= v AND (price > v OR id > last)` rather than
+    `price > v OR (price = v AND id > last)`: the leading conjunct is a plain
+    range on the index, so the scan starts at the cursor instead of filtering
+    from the top of the index.
+    """
+    field = SORTS[sort][0]
+    if len(SORTS[sort]) == 1:
+        # Unique on its own.
+        return qs.filter(**{f"{field}__gt": value})
+    descending = field.startswith("-")
+    field = field.lstrip("-")
+    if descending:
+        return qs.filter(Q(**{f"{field}__lte": value}), Q(**{f"{field}__lt": value}) | Q(id__lt=last_id))
+    return qs.filter(Q(**{f"{field}__gte": value}), Q(**{f"{field}__gt": value}) | Q(id__gt=last_id))
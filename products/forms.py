@@ -1,21 +1,78 @@
+import os
+
 from django import forms
-from .models import Product
+from .models import ImportJob, ImportProfile, Product, normalize_sku_key
+from .sources import IMPORT_EXTENSIONS, format_unavailable, import_format
 
 
 class ImportForm(forms.Form):
     file = forms.FileField(
-        label="Product CSV file",
+        label="Product file",
         help_text=(
-            "Upload a UTF-8 CSV containing columns like "
-            "sku, name, description, price, is_active."
+            "Upload a UTF-8 CSV, JSON Lines (.jsonl) or Parquet file with "
+            "columns like sku, name, description, price."
         ),
         widget=forms.ClearableFileInput(
             attrs={
                 "class": "form-control",
-                "accept": ".csv",
+                "accept": ",".join(IMPORT_EXTENSIONS),
             }
         ),
     )
+    profile = forms.ModelChoiceField(
+        label="Import profile",
+        queryset=ImportProfile.objects.all(),
+        required=False,
+        empty_label="Default (sku, name, description, price)",
+        help_text="Column mapping and parsing options for this supplier's files.",
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    validate_only = forms.BooleanField(
+        label="Validate only",
+        required=False,
+        help_text=(
+            "Dry run: report how many products would be created, updated, "
+            "left unchanged or rejected, without writing anything."
+        ),
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    )
+    full_sync = forms.BooleanField(
+        label="Full sync",
+        required=False,
+        help_text=(
+            "The file is a complete catalog snapshot: products whose SKU is "
+            "not in it are swept once the import finishes."
+        ),
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    )
+    sync_action = forms.ChoiceField(
+        label="Missing products",
+        choices=ImportJob.SYNC_ACTION_CHOICES,
+        initial=ImportJob.SYNC_DEACTIVATE,
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    sampling_enabled = forms.BooleanField(
+        label="Profile this run",
+        required=False,
+        help_text=(
+            "Record where the worker spends its time (collapsed stacks, "
+            "downloadable from the status page). Adds a little overhead."
+        ),
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    )
+
+    def clean_file(self):
+        uploaded = self.cleaned_data["file"]
+        ext = os.path.splitext(uploaded.name)[1].lower()
+        if ext not in IMPORT_EXTENSIONS:
+            raise forms.ValidationError(
+                f"Unsupported file type {ext or '(none)'}; use one of {', '.join(IMPORT_EXTENSIONS)}."
+            )
+        problem = format_unavailable(import_format(uploaded.name))
+        if problem:
+            raise forms.ValidationError(problem)
+        return uploaded
 
 
 class ProductForm(forms.ModelForm):
@@ -67,3 +124,15 @@ class ProductForm(forms.ModelForm):
             "sku": "Used to uniquely identify the product.",
             "is_active": "Uncheck to hide this product from active listings.",
         }
+
+    def clean_sku(self):
+        """
+        SKUs are unique case-insensitively; check against the indexed key.
+        """
+        sku = self.cleaned_data["sku"].strip()
+        clash = Product.objects.filter(sku_key=normalize_sku_key(sku))
+        if self.instance.pk:
+            clash = clash.exclude(pk=self.instance.pk)
+        if clash.exists():
+            raise forms.ValidationError("A product with this SKU already exists.")
+        return sku
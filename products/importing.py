@@ -0,0 +1,155 @@
+"""
+Import profiles: map supplier columns onto product fields.
+
+A profile (ImportProfile, or the built-in default) is turned into a
+ProfileSpec, which is compiled once per file against the header into
+positional extractors. Headers are matched once per file; each data row is
+then a few list lookups plus the configured transforms.
+"""
+import re
+from itertools import chain
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence
+
+# Fields a profile can populate, in importer order.
+PRODUCT_FIELDS = ("sku", "name", "description", "price")
+REQUIRED_FIELDS = ("sku",)
+
+# Rows inspected before committing to a full import.
+SNIFF_ROWS = 200
+DEFAULT_MAX_REJECT_RATE = 0.5
+
+_CURRENCY_RE = re.compile(r"[^\d,.\-]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class ImportFormatError(ValueError):
+    """
+    The file does not match the expected layout (missing columns, too many
+    unusable rows). Raised early so a bad file fails fast.
+    """
+
+
+def _decimal_comma(value: str) -> str:
+    # "1.234,56" -> "1234.56"
+    return value.replace(".", "").replace(",", ".")
+
+
+# Per-field transforms, applied in order to string values.
+TRANSFORMS: Dict[str, Callable[[str], str]] = {
+    "strip": str.strip,
+    "upper": str.upper,
+    "lower": str.lower,
+    "collapse_whitespace": lambda v: _WHITESPACE_RE.sub(" ", v).strip(),
+    "strip_currency": lambda v: _CURRENCY_RE.sub("", v),
+    "decimal_comma": _decimal_comma,
+}
+
+
+class ProfileSpec:
+    """
+    Plain description of how to read one supplier's files.
+
+    Kept free of ORM objects so it can be pickled to worker processes.
+    """
+
+    def __init__(
+        self,
+        column_map: Dict[str, str] | None = None,
+        transforms: Dict[str, List[str]] | None = None,
+        delimiter: str = ",",
+        encoding: str = "utf-8",
+        max_reject_rate: float = DEFAULT_MAX_REJECT_RATE,
+        sniff_rows: int = SNIFF_ROWS,
+    ) -> None:
+        # Unmapped fields default to a column of the same name.
+        self.column_map = {field: field for field in PRODUCT_FIELDS}
+        self.column_map.update(column_map or {})
+        self.transforms = transforms or {}
+        self.delimiter = delimiter
+        self.encoding = encoding
+        self.max_reject_rate = max_reject_rate
+        self.sniff_rows = sniff_rows
+
+        unknown = sorted(
+            name for names in self.transforms.values() for name in names if name not in TRANSFORMS
+        )
+        if unknown:
+            raise ImportFormatError(f"Unknown transforms: {', '.join(unknown)}")
+
+
+def compile_extractor(
+    spec: ProfileSpec,
+    header: Sequence[str],
+    fields: Sequence[str] = PRODUCT_FIELDS,
+) -> Callable[[Sequence], Dict[str, object]]:
+    """
+    Resolve the profile against `header` and return `extract(row) -> dict`.
+
+    Header matching is case- and whitespace-insensitive. Raises
+    ImportFormatError if a required column is missing. Pass `fields` to
+    extract only a subset (e.g. just "sku" for a pre-scan).
+    """
+    positions = {str(name).strip().lower(): idx for idx, name in enumerate(header)}
+
+    plan = []
+    missing = []
+    for field in fields:
+        source = spec.column_map.get(field)
+        idx = positions.get(str(source).strip().lower()) if source else None
+        if idx is None:
+            if field in REQUIRED_FIELDS:
+                missing.append(f"{field} (column {source!r})")
+            continue
+        funcs = tuple(TRANSFORMS[name] for name in spec.transforms.get(field, []))
+        plan.append((field, idx, funcs))
+
+    if missing:
+        found = ", ".join(str(h) for h in header[:20]) or "none"
+        raise ImportFormatError(
+            f"Missing required column(s): {', '.join(missing)}. Found columns: {found}."
+        )
+
+    plan = tuple(plan)
+
+    def extract(row: Sequence) -> Dict[str, object]:
+        out: Dict[str, object] = {}
+        width = len(row)
+        for field, idx, funcs in plan:
+            value = row[idx] if idx < width else None
+            if funcs and isinstance(value, str):
+                for func in funcs:
+                    value = func(value)
+            out[field] = value
+        return out
+
+    return extract
+
+
+def sniff_rows(
+    rows: Iterable[Sequence],
+    is_rejected: Callable[[Sequence], bool],
+    spec: ProfileSpec,
+) -> Iterator[Sequence]:
+    """
+    Look at the first `spec.sniff_rows` rows and fail fast if too many are
+    unusable; otherwise return an iterator that replays them followed by the
+    rest of the file.
+    """
+    rows = iter(rows)
+    head = []
+    for row in rows:
+        head.append(row)
+        if len(head) >= spec.sniff_rows:
+            break
+
+    if head:
+        rejected = sum(1 for row in head if is_rejected(row))
+        rate = rejected / len(head)
+        if rate > spec.max_reject_rate:
+            raise ImportFormatError(
+                f"{rejected} of the first {len(head)} rows are unusable "
+                f"({rate:.0%} > {spec.max_reject_rate:.0%} allowed); aborting import."
+            )
+
+    return chain(head, rows)
+
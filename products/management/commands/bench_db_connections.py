@@ -0,0 +1,183 @@
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.utils import timezone
+
+MODES = ("per_request", "persistent", "pool")
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    return {
+        "mean_ms": round(statistics.fmean(values), 3),
+        "p50_ms": round(statistics.median(values), 3),
+        "p95_ms": round(values[min(len(values) - 1, int(len(values) * 0.95))], 3),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark database connection handling in-process: the cost of "
+        "getting a usable connection at a request boundary, and requests/sec "
+        "against one endpoint, with a new connection per request "
+        "(CONN_MAX_AGE=0, the old behaviour), persistent connections and a "
+        "psycopg connection pool (PostgreSQL with psycopg[pool] only). Each "
+        "request is bracketed by close_old_connections(), as the WSGI "
+        "request signals do under gunicorn."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/api/products/?limit=20&fields=sku,price")
+        parser.add_argument("--requests", type=int, default=500, help="Requests per mode.")
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument("--connects", type=int, default=50, help="Connection samples per mode.")
+        parser.add_argument("--modes", default=",".join(MODES))
+        parser.add_argument("--output", help="Report path (default bench-db-connections-<timestamp>.json).")
+
+    def handle(self, *args, **options):
+        modes = [m.strip() for m in options["modes"].split(",") if m.strip()]
+        unknown = sorted(set(modes) - set(MODES))
+        if unknown:
+            raise CommandError(f"Unknown mode(s): {', '.join(unknown)}")
+        if "pool" in modes and not self._pool_available():
+            self.stderr.write("Skipping pool: needs PostgreSQL with psycopg[pool] installed.")
+            modes.remove("pool")
+
+        opened = [0]
+        lock = threading.Lock()
+
+        def count_connection(**kwargs) -> None:
+            with lock:
+                opened[0] += 1
+
+        connection_created.connect(count_connection, weak=False)
+        started_at = timezone.now()
+        results = {}
+        try:
+            for mode in modes:
+                with self._mode(mode):
+                    opened[0] = 0
+                    connect = self._bench_connect(options["connects"])
+                    result = {"connect": connect, **self._bench_requests(options)}
+                    result["connections_opened"] = opened[0]
+                    pool = connections["default"].pool if mode == "pool" else None
+                    if pool is not None:
+                        result["pool_stats"] = pool.get_stats()
+                    results[mode] = result
+        finally:
+            connection_created.disconnect(count_connection)
+
+        report = {
+            "started_at": started_at.isoformat(),
+            "database": connection.vendor,
+            "path": options["path"],
+            "requests": options["requests"],
+            "concurrency": options["concurrency"],
+            "configured": {
+                "conn_max_age": settings.DB_CONN_MAX_AGE,
+                "pool": settings.DATABASE_POOL,
+            },
+            "modes": results,
+        }
+        path = options["output"] or f"bench-db-connections-{started_at:%Y%m%d-%H%M%S}.json"
+        with open(path, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+        for mode, result in results.items():
+            self.stdout.write(
+                f"  {mode:<12} connect p50 {result['connect']['p50_ms']:>8.3f} ms  "
+                f"{result['requests_per_s']:>8.1f} req/s  p95 {result['latency']['p95_ms']:>8.2f} ms  "
+                f"{result['connections_opened']} connections opened"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Report written to {path}"))
+
+    def _pool_available(self) -> bool:
+        if connection.vendor != "postgresql":
+            return False
+        try:
+            import psycopg_pool  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @contextmanager
+    def _mode(self, mode: str):
+        """
+        Reconfigure the default alias for `mode`. Every thread shares its
+        settings dict, so new connections pick the change up.
+        """
+        settings_dict = connections["default"].settings_dict
+        saved = settings_dict["CONN_MAX_AGE"], settings_dict["OPTIONS"].get("pool")
+        connections.close_all()
+        settings_dict["OPTIONS"].pop("pool", None)
+        if mode == "per_request":
+            settings_dict["CONN_MAX_AGE"] = 0
+        elif mode == "persistent":
+            settings_dict["CONN_MAX_AGE"] = settings.DB_CONN_MAX_AGE or 600
+        else:
+            settings_dict["CONN_MAX_AGE"] = 0
+            settings_dict["OPTIONS"]["pool"] = saved[1] or {"min_size": 1, "max_size": 4}
+        try:
+            yield
+        finally:
+            connections.close_all()
+            if mode == "pool":
+                connections["default"].close_pool()
+            settings_dict["CONN_MAX_AGE"], pool = saved
+            settings_dict["OPTIONS"].pop("pool", None)
+            if pool:
+                settings_dict["OPTIONS"]["pool"] = pool
+
+    def _bench_connect(self, samples: int) -> Dict[str, float]:
+        """
+        Time from a request boundary to a finished `SELECT 1`: a fresh
+        connect, a pool checkout, or a health check on a kept connection.
+        """
+        timings = []
+        close_old_connections()
+        for _ in range(samples + 1):
+            start = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            timings.append((time.perf_counter() - start) * 1000)
+            close_old_connections()
+        # The first sample may include opening the pool.
+        return _summary(timings[1:])
+
+    def _bench_requests(self, options) -> Dict[str, object]:
+        per_worker = max(1, options["requests"] // options["concurrency"])
+
+        def run(_) -> List[float]:
+            client = Client()
+            latencies = []
+            try:
+                for _ in range(per_worker):
+                    start = time.perf_counter()
+                    close_old_connections()
+                    response = client.get(options["path"])
+                    close_old_connections()
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    if response.status_code >= 400:
+                        raise CommandError(f"{options['path']} returned {response.status_code}")
+            finally:
+                connections.close_all()
+            return latencies
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            latencies = [ms for worker in pool.map(run, range(options["concurrency"])) for ms in worker]
+        elapsed = time.perf_counter() - start
+        return {
+            "requests_per_s": round(len(latencies) / elapsed, 1),
+            "latency": _summary(latencies),
+        }
@@ -0,0 +1,145 @@
+import json
+import random
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from products.management.commands.loadtest import REQUEST_TIMEOUT, _percentile
+from products.models import ImportJob
+
+TARGETS = {
+    "import_status": "/api/import/{job}/",
+    "products_api": "/api/products/?limit=50&fields=sku,price",
+}
+# A step with more failed polls than this is over capacity.
+MAX_ERROR_RATE = 0.01
+
+
+class Command(BaseCommand):
+    help = (
+        "Find how many concurrent polling clients one server process keeps "
+        "within a latency SLO. Each client polls the import status API (or "
+        "the product API) every --interval seconds; the client count steps "
+        "up through --clients and each step reports achieved vs. expected "
+        "requests/sec, p50/p95/p99 latency and errors. Run it once against "
+        "the WSGI server (gunicorn config.wsgi) and once against the ASGI "
+        "one (config.asgi under uvicorn workers), each with one worker, and "
+        "compare `max_clients` in the JSON reports."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--target", choices=sorted(TARGETS), default="import_status")
+        parser.add_argument("--job", help="Import job id to poll (default: the latest).")
+        parser.add_argument("--clients", default="10,25,50,100,200,400", help="Comma-separated client counts.")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds between one client's polls.")
+        parser.add_argument("--duration", type=float, default=20, help="Measured seconds per step.")
+        parser.add_argument("--slo-ms", type=float, default=500, help="p95 latency a step must stay under.")
+        parser.add_argument("--label", default="", help="Recorded in the report, e.g. 'asgi'.")
+        parser.add_argument("--output", help="Report path (default bench-polling-<timestamp>.json).")
+
+    def handle(self, *args, **options):
+        try:
+            steps = [int(n) for n in options["clients"].split(",") if n.strip()]
+        except ValueError:
+            raise CommandError("--clients must be comma-separated integers.") from None
+        path = TARGETS[options["target"]]
+        if "{job}" in path:
+            job = options["job"] or ImportJob.objects.order_by("-uploaded_at").values_list("pk", flat=True).first()
+            if job is None:
+                raise CommandError("No import job to poll; pass --job or upload a file first.")
+            path = path.format(job=job)
+        url = options["base_url"].rstrip("/") + path
+        started_at = timezone.now()
+
+        results = []
+        for clients in steps:
+            result = self._step(url, clients, options)
+            result["within_slo"] = (
+                result["requests"] > 0
+                and result["errors"] < MAX_ERROR_RATE * result["requests"]
+                and result["p95_ms"] is not None
+                and result["p95_ms"] <= options["slo_ms"]
+                # Falling behind the poll rate means requests are queueing.
+                and result["throughput_rps"] >= 0.9 * result["expected_rps"]
+            )
+            results.append(result)
+            self.stdout.write(
+                f"  {clients:>5} clients  {result['throughput_rps']:>8.1f}/{result['expected_rps']:.0f} req/s  "
+                f"p50 {result['p50_ms']} p95 {result['p95_ms']} p99 {result['p99_ms']} ms  "
+                f"errors {result['errors']}  {'ok' if result['within_slo'] else 'OVER'}"
+            )
+            if not result["within_slo"]:
+                # Higher steps only get worse.
+                break
+
+        passing = [r["clients"] for r in results if r["within_slo"]]
+        report = {
+            "started_at": started_at.isoformat(),
+            "label": options["label"],
+            "url": url,
+            "interval_s": options["interval"],
+            "duration_s": options["duration"],
+            "slo_p95_ms": options["slo_ms"],
+            "max_clients": max(passing) if passing else 0,
+            "steps": results,
+        }
+        output = options["output"] or f"bench-polling-{started_at:%Y%m%d-%H%M%S}.json"
+        with open(output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"max_clients={report['max_clients']}; report written to {output}"))
+
+    def _step(self, url: str, clients: int, options) -> Dict[str, object]:
+        interval = options["interval"]
+        t0 = time.perf_counter()
+        # One poll interval of warm-up while the clients spread out.
+        measure_from = t0 + interval
+        deadline = measure_from + options["duration"]
+        samples: List[Tuple[float, bool]] = []
+        lock = threading.Lock()
+
+        def poll(seed: int) -> None:
+            rng = random.Random(seed)
+            session = requests.Session()
+            local: List[Tuple[float, bool]] = []
+            # Stagger the first poll like independently opened tabs.
+            time.sleep(rng.random() * interval)
+            try:
+                while True:
+                    start = time.perf_counter()
+                    if start >= deadline:
+                        break
+                    try:
+                        ok = session.get(url, timeout=REQUEST_TIMEOUT).status_code < 400
+                    except requests.RequestException:
+                        ok = False
+                    elapsed = time.perf_counter() - start
+                    if start >= measure_from:
+                        local.append((elapsed * 1000, ok))
+                    time.sleep(max(0.0, interval - elapsed))
+            finally:
+                session.close()
+            with lock:
+                samples.extend(local)
+
+        threads = [threading.Thread(target=poll, args=(i,), daemon=True) for i in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        latencies = sorted(ms for ms, _ in samples)
+        return {
+            "clients": clients,
+            "requests": len(latencies),
+            "errors": sum(1 for _, ok in samples if not ok),
+            "expected_rps": round(clients / interval, 2),
+            "throughput_rps": round(len(latencies) / options["duration"], 2),
+            "p50_ms": _percentile(latencies, 0.50),
+            "p95_ms": _percentile(latencies, 0.95),
+            "p99_ms": _percentile(latencies, 0.99),
+        }
@@ -0,0 +1,55 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.export import EXPORT_CHUNK_SIZE, CONTENT_TYPES, ExportError, iter_export_chunks
+from products.filters import FilterError, filter_products
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream the product catalog to a file (or stdout) as CSV, JSON Lines "
+        "or Parquet. Accepts the same filters as the product list."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(CONTENT_TYPES), default="csv")
+        parser.add_argument("--gzip", action="store_true", help="gzip CSV/JSONL output.")
+        parser.add_argument(
+            "-o", "--output", default="-",
+            help="Destination path, or '-' for stdout (default).",
+        )
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+        parser.add_argument("--sku", default="")
+        parser.add_argument("--name", default="")
+        parser.add_argument("--description", default="")
+        parser.add_argument("--active", choices=["", "true", "false"], default="")
+        parser.add_argument("--price-min", default="")
+        parser.add_argument("--price-max", default="")
+        parser.add_argument("--updated-since", default="", help="ISO 8601 datetime.")
+
+    def handle(self, *args, **options):
+        try:
+            qs, _ = filter_products(Product.objects.all(), options, strict=True)
+        except FilterError as exc:
+            raise CommandError(str(exc)) from exc
+        stats = {}
+
+        out = sys.stdout.buffer if options["output"] == "-" else open(options["output"], "wb")
+        try:
+            for chunk in iter_export_chunks(
+                qs,
+                options["format"],
+                compress=options["gzip"],
+                chunk_size=options["chunk_size"],
+                stats=stats,
+            ):
+                out.write(chunk)
+        except ExportError as exc:
+            raise CommandError(str(exc)) from exc
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+
+        self.stderr.write(f"Exported {stats.get('rows', 0)} products.")
@@ -0,0 +1,60 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from products.dropfolder import (
+    DROPFOLDER_MAX_BYTES,
+    DROPFOLDER_MAX_FILES,
+    DROPFOLDER_SETTLE_SECONDS,
+    DROPFOLDER_WINDOW_SECONDS,
+    ingest,
+)
+from products.models import ImportProfile
+
+
+class Command(BaseCommand):
+    help = (
+        "Import the supplier files waiting in a drop folder, grouping the "
+        "files that arrive within a time / size window into one import job "
+        "(arrival order, last row per SKU wins, per-file counts on the job). "
+        "Runs once, or keeps polling with --watch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--directory", default=settings.IMPORT_DROPFOLDER,
+            help="Folder to ingest (default settings.IMPORT_DROPFOLDER).",
+        )
+        parser.add_argument("--window", type=float, default=DROPFOLDER_WINDOW_SECONDS)
+        parser.add_argument("--settle", type=float, default=DROPFOLDER_SETTLE_SECONDS)
+        parser.add_argument("--max-files", type=int, default=DROPFOLDER_MAX_FILES)
+        parser.add_argument("--max-bytes", type=int, default=DROPFOLDER_MAX_BYTES)
+        parser.add_argument("--profile", help="Import profile name.")
+        parser.add_argument("--flush", action="store_true", help="Don't wait out the window.")
+        parser.add_argument("--watch", type=float, metavar="SECONDS", help="Poll every SECONDS.")
+
+    def handle(self, *args, **options):
+        if not options["directory"]:
+            raise CommandError("No drop folder: pass --directory or set IMPORT_DROPFOLDER.")
+        profile = None
+        if options["profile"]:
+            profile = ImportProfile.objects.filter(name=options["profile"]).first()
+            if profile is None:
+                raise CommandError(f"Unknown import profile: {options['profile']}")
+
+        while True:
+            jobs = ingest(
+                options["directory"],
+                window=options["window"],
+                settle=options["settle"],
+                max_files=options["max_files"],
+                max_bytes=options["max_bytes"],
+                profile=profile,
+                flush=options["flush"],
+            )
+            for job in jobs:
+                self.stdout.write(f"Queued import {job.pk}: {job.original_filename}")
+            if not options["watch"]:
+                break
+            time.sleep(options["watch"])
@@ -0,0 +1,281 @@
+import json
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from products.catalog import bump_catalog_version
+from products.facets import deferred_facet_updates, get_facets
+from products.models import ImportJob, Product
+from products.seeding import MATERIALS, NOUNS
+from webhooks.models import Webhook
+
+DEFAULT_MIX = (
+    "list_filter=20,list_page=15,api_cursor=20,api_filter=15,"
+    "product_create=5,product_update=5,import_status_poll=15,webhook_deliveries=5"
+)
+REQUEST_TIMEOUT = 30
+# Deep offset pages are part of the mix on purpose; cap them at a page
+# real users plausibly reach.
+MAX_LIST_PAGE = 200
+
+
+def _percentile(sorted_values: List[float], q: float) -> float | None:
+    # Nearest-rank on an already sorted list.
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values) + 0.5)) - 1))
+    return round(sorted_values[idx], 2)
+
+
+class _Worker:
+    """
+    One simulated client: its own HTTP session (cookies, CSRF token, the
+    replica pin cookie) and API cursor.
+    """
+
+    def __init__(self, base_url: str, prefix: str, rng: random.Random, targets: Dict[str, object]) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.prefix = prefix
+        self.rng = rng
+        self.targets = targets
+        self.session = requests.Session()
+        self.cursor = None
+        self.created: List[str] = []
+        self.created_pks: Dict[str, int] = {}
+
+    def _get(self, path: str, **kwargs) -> requests.Response:
+        return self.session.get(self.base_url + path, timeout=REQUEST_TIMEOUT, **kwargs)
+
+    def _post_form(self, path: str, data: Dict[str, str]) -> requests.Response:
+        token = self.session.cookies.get("csrftoken")
+        if token is None:
+            # Any page with a form sets the CSRF cookie.
+            self._get("/create/")
+            token = self.session.cookies.get("csrftoken", "")
+        return self.session.post(
+            self.base_url + path,
+            data={**data, "csrfmiddlewaretoken": token},
+            headers={"X-CSRFToken": token, "Referer": self.base_url + path},
+            allow_redirects=False,
+            timeout=REQUEST_TIMEOUT,
+        )
+
+    def _product_form(self, sku: str) -> Dict[str, str]:
+        return {
+            "sku": sku,
+            "name": f"Load {self.rng.choice(MATERIALS)} {self.rng.choice(NOUNS)}",
+            "description": "Created by the load test.",
+            "price": str(Decimal(self.rng.randint(100, 99999)) / 100),
+            "is_active": "on",
+        }
+
+    # Scenarios: each returns the response of its one measured request. An
+    # optional setup_<scenario>() runs first, outside the measurement.
+
+    def list_filter(self) -> requests.Response:
+        return self._get("/", params={"name": self.rng.choice(NOUNS), "active": "true"})
+
+    def list_page(self) -> requests.Response:
+        return self._get("/", params={"page": self.rng.randint(1, MAX_LIST_PAGE)})
+
+    def api_cursor(self) -> requests.Response:
+        params = {"limit": 100, "fields": "sku,name,price"}
+        if self.cursor:
+            params["cursor"] = self.cursor
+        response = self._get("/api/products/", params=params)
+        if response.ok:
+            self.cursor = response.json().get("next_cursor")
+        return response
+
+    def api_filter(self) -> requests.Response:
+        return self._get(
+            "/api/products/", params={"name": self.rng.choice(MATERIALS), "fields": "sku,price", "limit": 50}
+        )
+
+    def product_create(self) -> requests.Response:
+        sku = f"{self.prefix}{uuid.uuid4().hex[:12]}"
+        response = self._post_form("/create/", self._product_form(sku))
+        if response.status_code == 302:
+            self.created.append(sku)
+        return response
+
+    def setup_product_update(self) -> None:
+        for sku in self.created:
+            if sku not in self.created_pks:
+                self.created_pks[sku] = Product.objects.values_list("pk", flat=True).get(sku=sku)
+
+    def product_update(self) -> requests.Response:
+        if not self.created_pks:
+            return self.product_create()
+        sku, pk = self.rng.choice(list(self.created_pks.items()))
+        return self._post_form(f"/{pk}/edit/", self._product_form(sku))
+
+    def import_status_poll(self) -> requests.Response:
+        return self._get(f"/api/import/{self.targets['import_job']}/")
+
+    def webhook_deliveries(self) -> requests.Response:
+        return self._get(f"/webhooks/{self.targets['webhook']}/deliveries/")
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay a weighted mix of list filters, pagination, API cursor walks, "
+        "product create/update and import-status polls against a running "
+        "server, and write per-endpoint throughput and p50/p95/p99 latency to "
+        "a JSON report. Run `seed_products` first for a realistic catalog. "
+        "Products created by the run are deleted afterwards unless --keep."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--duration", type=float, default=60, help="Measured seconds.")
+        parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before that.")
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--mix", default=DEFAULT_MIX, help="Comma-separated scenario=weight pairs.")
+        parser.add_argument("--output", help="Report path (default loadtest-<timestamp>.json).")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--keep", action="store_true", help="Keep the products the run created.")
+
+    def handle(self, *args, **options):
+        mix = self._parse_mix(options["mix"])
+        targets = self._targets(mix)
+        prefix = f"LOAD-{uuid.uuid4().hex[:6]}-"
+        started_at = timezone.now()
+
+        samples: List[Tuple[str, float, bool]] = []
+        lock = threading.Lock()
+        t0 = time.perf_counter()
+        measure_from = t0 + options["warmup"]
+        deadline = measure_from + options["duration"]
+
+        def run(worker_id: int) -> None:
+            rng = random.Random(options["seed"] * 1000 + worker_id)
+            worker = _Worker(options["base_url"], prefix, rng, targets)
+            names, weights = zip(*mix.items())
+            local: List[Tuple[str, float, bool]] = []
+            try:
+                while time.perf_counter() < deadline:
+                    name = rng.choices(names, weights)[0]
+                    setup = getattr(worker, f"setup_{name}", None)
+                    if setup is not None:
+                        setup()
+                    start = time.perf_counter()
+                    try:
+                        ok = getattr(worker, name)().status_code < 400
+                    except requests.RequestException:
+                        ok = False
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    if start >= measure_from:
+                        local.append((name, elapsed_ms, ok))
+            finally:
+                worker.session.close()
+                connection.close()
+            with lock:
+                samples.extend(local)
+
+        self.stdout.write(
+            f"{options['concurrency']} clients, {options['warmup']:.0f}s warm-up + "
+            f"{options['duration']:.0f}s against {options['base_url']} ..."
+        )
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            list(pool.map(run, range(options["concurrency"])))
+
+        report = self._report(samples, options, mix, started_at)
+        path = options["output"] or f"loadtest-{started_at:%Y%m%d-%H%M%S}.json"
+        with open(path, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+        for name, stats in report["endpoints"].items():
+            self.stdout.write(
+                f"  {name:<20} {stats['requests']:>7} req {stats['throughput_rps']:>8.1f}/s  "
+                f"p50 {stats['p50_ms']} p95 {stats['p95_ms']} p99 {stats['p99_ms']} ms  "
+                f"errors {stats['errors']}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Report written to {path}"))
+
+        if not options["keep"]:
+            self._cleanup(prefix)
+
+    def _parse_mix(self, spec: str) -> Dict[str, float]:
+        mix = {}
+        for part in spec.split(","):
+            name, _, weight = part.partition("=")
+            name = name.strip()
+            if name.startswith(("_", "setup_")) or not callable(getattr(_Worker, name, None)):
+                raise CommandError(f"Unknown scenario: {name}")
+            mix[name] = float(weight or 1)
+        return mix
+
+    def _targets(self, mix: Dict[str, float]) -> Dict[str, object]:
+        """
+        Existing rows the polling scenarios need; scenarios without one are
+        dropped from the mix.
+        """
+        targets = {
+            "import_job": ImportJob.objects.order_by("-uploaded_at").values_list("pk", flat=True).first(),
+            "webhook": Webhook.objects.values_list("pk", flat=True).first(),
+        }
+        for name, target in (("import_status_poll", "import_job"), ("webhook_deliveries", "webhook")):
+            if name in mix and targets[target] is None:
+                self.stderr.write(f"No {target.replace('_', ' ')} exists; skipping {name}.")
+                del mix[name]
+        if not mix:
+            raise CommandError("Nothing left to run.")
+        return targets
+
+    def _report(self, samples, options, mix, started_at) -> Dict[str, object]:
+        by_name: Dict[str, List[Tuple[float, bool]]] = {}
+        for name, ms, ok in samples:
+            by_name.setdefault(name, []).append((ms, ok))
+
+        duration = options["duration"]
+        endpoints = {}
+        for name in sorted(by_name):
+            latencies = sorted(ms for ms, _ in by_name[name])
+            endpoints[name] = {
+                "requests": len(latencies),
+                "errors": sum(1 for _, ok in by_name[name] if not ok),
+                "throughput_rps": round(len(latencies) / duration, 2),
+                "mean_ms": round(sum(latencies) / len(latencies), 2),
+                "p50_ms": _percentile(latencies, 0.50),
+                "p95_ms": _percentile(latencies, 0.95),
+                "p99_ms": _percentile(latencies, 0.99),
+                "max_ms": round(latencies[-1], 2),
+            }
+
+        latencies = sorted(ms for _, ms, _ in samples)
+        return {
+            "started_at": started_at.isoformat(),
+            "base_url": options["base_url"],
+            "duration_s": duration,
+            "warmup_s": options["warmup"],
+            "concurrency": options["concurrency"],
+            "mix": mix,
+            "catalog_size": get_facets()["total"],
+            "totals": {
+                "requests": len(latencies),
+                "errors": sum(1 for _, _, ok in samples if not ok),
+                "throughput_rps": round(len(latencies) / duration, 2),
+                "p50_ms": _percentile(latencies, 0.50),
+                "p95_ms": _percentile(latencies, 0.95),
+                "p99_ms": _percentile(latencies, 0.99),
+            },
+            "endpoints": endpoints,
+        }
+
+    def _cleanup(self, prefix: str) -> None:
+        with transaction.atomic():
+            with deferred_facet_updates():
+                deleted, _ = Product.objects.filter(sku_key__startswith=prefix.lower()).delete()
+            if deleted:
+                bump_catalog_version()
+        self.stdout.write(f"Removed {deleted} products created by the run.")
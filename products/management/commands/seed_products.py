@@ -0,0 +1,90 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from config.deletion import delete_pks
+
+from products.catalog import bump_catalog_version
+from products.facets import apply_deltas, queryset_deltas, reconcile_facets
+from products.models import Product
+from products.seeding import iter_products, seed_sql, seed_sql_params
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large synthetic catalog (default 1M products) for load tests "
+        "and benchmarks. On PostgreSQL each batch is one INSERT ... SELECT over "
+        "generate_series; other databases fall back to bulk_create. Seeded "
+        "SKUs share a prefix, existing ones are skipped, and --clear removes "
+        "them again. Facet counters and the catalog version are refreshed at "
+        "the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=1_000_000)
+        parser.add_argument("--start", type=int, default=0, help="First SKU index (to extend a seeded catalog).")
+        parser.add_argument("--batch-size", type=int, default=100_000)
+        parser.add_argument("--prefix", default="SEED-")
+        parser.add_argument("--seed", type=int, default=42, help="RNG seed for the bulk_create fallback.")
+        parser.add_argument("--clear", action="store_true", help="Delete products with --prefix instead.")
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        if options["clear"]:
+            self._clear(prefix, options["batch_size"])
+            return
+
+        start, stop = options["start"], options["start"] + options["count"]
+        batch_size = options["batch_size"]
+        set_based = connection.vendor == "postgresql"
+        rng = random.Random(options["seed"])
+
+        t0 = time.perf_counter()
+        before = Product.objects.count()
+        for lo in range(start, stop, batch_size):
+            hi = min(lo + batch_size, stop)
+            # One transaction per batch: bounded WAL bursts and locks, and an
+            # interrupted run keeps what it has written (re-run to resume).
+            with transaction.atomic():
+                if set_based:
+                    with connection.cursor() as cursor:
+                        cursor.execute(
+                            seed_sql(Product._meta.db_table), seed_sql_params(prefix, lo, hi - 1)
+                        )
+                else:
+                    Product.objects.bulk_create(
+                        iter_products(prefix, lo, hi, rng), batch_size=5000, ignore_conflicts=True
+                    )
+            self.stdout.write(f"  {hi - start:,} / {stop - start:,} ({time.perf_counter() - t0:.1f}s)")
+
+        # The inserts bypass signals; rebuild the counters in one pass.
+        reconcile_facets()
+        with transaction.atomic():
+            bump_catalog_version()
+
+        elapsed = time.perf_counter() - t0
+        inserted = Product.objects.count() - before
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Inserted {inserted:,} products in {elapsed:.1f}s "
+                f"({inserted / elapsed if elapsed else 0:,.0f} rows/s, "
+                f"{'generate_series' if set_based else 'bulk_create'})."
+            )
+        )
+
+    def _clear(self, prefix: str, batch_size: int) -> None:
+        seeded = Product.objects.filter(sku_key__startswith=prefix.lower())
+        deleted = 0
+        while True:
+            batch = list(seeded.values_list("pk", flat=True)[:batch_size])
+            if not batch:
+                break
+            rows = Product.objects.filter(pk__in=batch)
+            with transaction.atomic():
+                # A signal-free delete; keep the counters in step.
+                apply_deltas(queryset_deltas(rows))
+                deleted += delete_pks(Product, batch)
+                bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted:,} seeded products."))
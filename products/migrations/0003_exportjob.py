@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:37
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0002_alter_importjob_options_alter_importjob_status_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExportJob",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("processing", "Processing"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                        ],
+                        db_index=True,
+                        default="pending",
+                        max_length=32,
+                    ),
+                ),
+                (
+                    "format",
+                    models.CharField(
+                        choices=[
+                            ("csv", "CSV"),
+                            ("jsonl", "JSON Lines"),
+                            ("parquet", "Parquet"),
+                        ],
+                        default="csv",
+                        max_length=16,
+                    ),
+                ),
+                ("compress", models.BooleanField(default=False)),
+                ("filters", models.JSONField(blank=True, default=dict)),
+                ("row_count", models.IntegerField(default=0)),
+                ("error_message", models.TextField(blank=True)),
+                ("file", models.FileField(blank=True, null=True, upload_to="exports/")),
+            ],
+            options={
+                "ordering": ("-created_at",),
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0004_catalogversion_product_updated_at_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="full_sync",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="swept_rows",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="sync_action",
+            field=models.CharField(
+                choices=[
+                    ("deactivate", "Deactivate missing products"),
+                    ("delete", "Delete missing products"),
+                ],
+                default="deactivate",
+                max_length=16,
+            ),
+        ),
+        migrations.CreateModel(
+            name="ImportJobSku",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("sku", models.CharField(max_length=64)),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="seen_skus",
+                        to="products.importjob",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("job", "sku"), name="uniq_importjobsku_job_sku"
+                    )
+                ],
+            },
+        ),
+    ]
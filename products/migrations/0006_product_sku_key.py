@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0005_importjob_full_sync"),
+    ]
+
+    operations = [
+        # Nullable with no default: a catalog-only change on PostgreSQL, so
+        # the table is not rewritten or locked. Made NOT NULL in 0008 after
+        # the backfill.
+        migrations.AddField(
+            model_name="product",
+            name="sku_key",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+from django.db.models import Max, Min
+from django.db.models.functions import Lower, Trim
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def backfill_sku_key(apps, schema_editor):
+    """
+    Fill sku_key in id-range batches.
+
+    The migration is non-atomic, so each batch commits on its own and only
+    holds row locks for BACKFILL_BATCH_SIZE rows at a time.
+    """
+    Product = apps.get_model("products", "Product")
+    bounds = Product.objects.aggregate(lo=Min("id"), hi=Max("id"))
+    if bounds["lo"] is None:
+        return
+
+    start = bounds["lo"]
+    while start <= bounds["hi"]:
+        end = start + BACKFILL_BATCH_SIZE
+        Product.objects.filter(
+            id__gte=start,
+            id__lt=end,
+            sku_key__isnull=True,
+        ).update(sku_key=Lower(Trim("sku")))
+        start = end
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("products", "0006_product_sku_key"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_sku_key, migrations.RunPython.noop, elidable=True),
+    ]
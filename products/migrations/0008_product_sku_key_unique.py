@@ -0,0 +1,154 @@
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower, Trim
+
+NOT_NULL_CHECK = "products_product_sku_key_not_null"
+# Colliding keys listed in the error before it is cut short.
+COLLISION_REPORT_LIMIT = 20
+
+
+class AddConstraintConcurrently(migrations.AddConstraint):
+    """
+    AddConstraint for a plain unique constraint that, on PostgreSQL, builds
+    the index CONCURRENTLY first and then attaches it, so writes are never
+    blocked while the index is built.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+        model = to_state.apps.get_model(app_label, self.model_name)
+        table = schema_editor.quote_name(model._meta.db_table)
+        name = schema_editor.quote_name(self.constraint.name)
+        columns = ", ".join(
+            schema_editor.quote_name(model._meta.get_field(f).column)
+            for f in self.constraint.fields
+        )
+        schema_editor.execute(
+            f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})"
+        )
+        schema_editor.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}"
+        )
+
+
+class DropIndexConcurrently:
+    """
+    Mixin for RemoveIndex / RemoveConstraint on expression indexes: on
+    PostgreSQL, drop with DROP INDEX CONCURRENTLY.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        schema_editor.execute(
+            f"DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(self.name)}"
+        )
+
+
+class RemoveIndexConcurrently(DropIndexConcurrently, migrations.RemoveIndex):
+    pass
+
+
+class RemoveConstraintConcurrently(DropIndexConcurrently, migrations.RemoveConstraint):
+    pass
+
+
+def backfill_remaining(Product):
+    # Rows written between 0007 and now by processes still running code
+    # that doesn't set sku_key.
+    Product.objects.filter(sku_key__isnull=True).update(sku_key=Lower(Trim("sku")))
+
+
+def check_collisions(Product):
+    """
+    The old unique index was on Lower(sku); sku_key also trims, so e.g.
+    "ABC" and "ABC " collide now. Report them instead of failing the
+    unique index build with a bare IntegrityError.
+    """
+    keys = list(
+        Product.objects.values("sku_key")
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+        .values_list("sku_key", flat=True)[:COLLISION_REPORT_LIMIT + 1]
+    )
+    if not keys:
+        return
+    examples = "; ".join(
+        f"{key!r}: " + ", ".join(
+            repr(sku) for sku in Product.objects.filter(sku_key=key).values_list("sku", flat=True)
+        )
+        for key in keys[:COLLISION_REPORT_LIMIT]
+    )
+    more = " (and more)" if len(keys) > COLLISION_REPORT_LIMIT else ""
+    raise RuntimeError(
+        "Products whose SKUs differ only by surrounding whitespace can't share "
+        f"a unique sku_key: {examples}{more}. Rename or merge them, then re-run migrate."
+    )
+
+
+def add_not_null_check(apps, schema_editor):
+    Product = apps.get_model("products", "Product")
+    postgres = schema_editor.connection.vendor == "postgresql"
+    if postgres:
+        # A NOT VALID check already rejects new NULLs, so nothing can slip in
+        # between the backfill below and VALIDATE.
+        schema_editor.execute(
+            f"ALTER TABLE products_product DROP CONSTRAINT IF EXISTS {NOT_NULL_CHECK}"
+        )
+        schema_editor.execute(
+            f"ALTER TABLE products_product ADD CONSTRAINT {NOT_NULL_CHECK} "
+            "CHECK (sku_key IS NOT NULL) NOT VALID"
+        )
+
+    backfill_remaining(Product)
+    check_collisions(Product)
+
+    if postgres:
+        # A validated CHECK lets SET NOT NULL skip its full-table scan, and
+        # VALIDATE only takes a SHARE UPDATE EXCLUSIVE lock.
+        schema_editor.execute(
+            f"ALTER TABLE products_product VALIDATE CONSTRAINT {NOT_NULL_CHECK}"
+        )
+
+
+def drop_not_null_check(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"ALTER TABLE products_product DROP CONSTRAINT IF EXISTS {NOT_NULL_CHECK}"
+    )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("products", "0007_backfill_product_sku_key"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_not_null_check, drop_not_null_check),
+        migrations.AlterField(
+            model_name="product",
+            name="sku_key",
+            field=models.CharField(editable=False, max_length=64),
+        ),
+        migrations.RunPython(drop_not_null_check, migrations.RunPython.noop),
+        AddConstraintConcurrently(
+            model_name="product",
+            constraint=models.UniqueConstraint(
+                fields=("sku_key",), name="uniq_product_sku_key"
+            ),
+        ),
+        # Superseded by the plain index on sku_key.
+        RemoveConstraintConcurrently(
+            model_name="product",
+            name="uniq_product_sku_ci",
+        ),
+        RemoveIndexConcurrently(
+            model_name="product",
+            name="idx_product_sku_ci",
+        ),
+    ]
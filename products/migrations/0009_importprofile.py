@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0008_product_sku_key_unique"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportProfile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("delimiter", models.CharField(default=",", max_length=1)),
+                ("encoding", models.CharField(default="utf-8", max_length=32)),
+                ("column_map", models.JSONField(blank=True, default=dict)),
+                ("transforms", models.JSONField(blank=True, default=dict)),
+                ("max_reject_rate", models.FloatField(default=0.5)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ("name",),
+            },
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="profile",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="jobs",
+                to="products.importprofile",
+            ),
+        ),
+    ]
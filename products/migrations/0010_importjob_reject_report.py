@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0009_importprofile"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="reject_counts",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="reject_report",
+            field=models.FileField(blank=True, null=True, upload_to="import_reports/"),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0010_importjob_reject_report"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="mode",
+            field=models.CharField(
+                choices=[("import", "Import"), ("validate", "Validate only")],
+                default="import",
+                max_length=16,
+            ),
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="validation_summary",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0011_importjob_mode"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="duplicate_rows",
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0012_importjob_duplicate_rows"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="control_request",
+            field=models.CharField(
+                blank=True,
+                choices=[("cancel", "Cancel"), ("pause", "Pause")],
+                max_length=16,
+            ),
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="resume_row",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="exportjob",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("processing", "Processing"),
+                    ("completed", "Completed"),
+                    ("failed", "Failed"),
+                    ("cancelled", "Cancelled"),
+                    ("paused", "Paused"),
+                ],
+                db_index=True,
+                default="pending",
+                max_length=32,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="importjob",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("processing", "Processing"),
+                    ("completed", "Completed"),
+                    ("failed", "Failed"),
+                    ("cancelled", "Cancelled"),
+                    ("paused", "Paused"),
+                ],
+                db_index=True,
+                default="pending",
+                max_length=32,
+            ),
+        ),
+    ]
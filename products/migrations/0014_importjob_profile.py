@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0013_importjob_control"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="profile_artifact",
+            field=models.FileField(blank=True, null=True, upload_to="profiles/"),
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="profile_run",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0014_importjob_profile"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogFacet",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=32, primary_key=True, serialize=False),
+                ),
+                ("count", models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
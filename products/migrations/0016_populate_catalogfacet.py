@@ -0,0 +1,65 @@
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import Case, Count, Value, When
+
+# Frozen copy of products.facets' keys at the time of this migration.
+PRICE_BANDS = (
+    Decimal("10"),
+    Decimal("50"),
+    Decimal("100"),
+    Decimal("500"),
+    Decimal("1000"),
+)
+
+
+def populate_facets(apps, schema_editor):
+    """
+    Seed the counters with one aggregate pass over the products table.
+    """
+    Product = apps.get_model("products", "Product")
+    CatalogFacet = apps.get_model("products", "CatalogFacet")
+
+    band_keys = []
+    lower = Decimal("0")
+    for upper in PRICE_BANDS:
+        band_keys.append(f"price:{lower}-{upper}")
+        lower = upper
+    band_keys.append(f"price:{lower}+")
+
+    counts = dict.fromkeys(["total", "active", "inactive", *band_keys], 0)
+    band = Case(
+        *(
+            When(price__lt=upper, then=Value(key))
+            for upper, key in zip(PRICE_BANDS, band_keys)
+        ),
+        default=Value(band_keys[-1]),
+    )
+    rows = (
+        Product.objects.order_by()
+        .annotate(band=band)
+        .values("is_active", "band")
+        .annotate(n=Count("pk"))
+    )
+    for row in rows:
+        counts["total"] += row["n"]
+        counts["active" if row["is_active"] else "inactive"] += row["n"]
+        counts[row["band"]] += row["n"]
+
+    CatalogFacet.objects.bulk_create(
+        CatalogFacet(key=key, count=count) for key, count in counts.items()
+    )
+
+
+def clear_facets(apps, schema_editor):
+    apps.get_model("products", "CatalogFacet").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0015_catalogfacet"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_facets, clear_facets),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:17
+
+from django.db import migrations, models
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """
+    AddIndex that, on PostgreSQL, builds the index CONCURRENTLY so the
+    products table stays writable (imports keep running) while it is built.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = to_state.apps.get_model(app_label, self.model_name)
+        schema_editor.add_index(model, self.index, concurrently=True)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = from_state.apps.get_model(app_label, self.model_name)
+        schema_editor.remove_index(model, self.index, concurrently=True)
+
+
+class RemoveIndexConcurrently(migrations.RemoveIndex):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = from_state.apps.get_model(app_label, self.model_name)
+        index = from_state.models[app_label, self.model_name_lower].get_index_by_name(
+            self.name
+        )
+        schema_editor.remove_index(model, index, concurrently=True)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = to_state.apps.get_model(app_label, self.model_name)
+        index = to_state.models[app_label, self.model_name_lower].get_index_by_name(
+            self.name
+        )
+        schema_editor.add_index(model, index, concurrently=True)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("products", "0016_populate_catalogfacet"),
+    ]
+
+    # New indexes first, so sorts and filters are never without one.
+    operations = [
+        AddIndexConcurrently(
+            model_name="product",
+            index=models.Index(
+                fields=["is_active", "price", "id"], name="product_active_price_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="product",
+            index=models.Index(fields=["price", "id"], name="product_price_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="product",
+            index=models.Index(fields=["updated_at", "id"], name="product_updated_idx"),
+        ),
+        # Prefixes of the composite indexes above.
+        RemoveIndexConcurrently(
+            model_name="product",
+            name="products_pr_is_acti_ca4d9a_idx",
+        ),
+        RemoveIndexConcurrently(
+            model_name="product",
+            name="products_pr_updated_150263_idx",
+        ),
+    ]
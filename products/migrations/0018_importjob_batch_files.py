@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0017_product_sort_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="batch_files",
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="file_stats",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
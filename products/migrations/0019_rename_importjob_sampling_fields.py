@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+# The sampling-profiler fields read as if they belonged to the import
+# profile (ImportJob.profile, the column mapping); rename them.
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("products", "0018_importjob_batch_files"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="importjob",
+            old_name="profile_run",
+            new_name="sampling_enabled",
+        ),
+        migrations.RenameField(
+            model_name="importjob",
+            old_name="profile_artifact",
+            new_name="sampling_report",
+        ),
+    ]
@@ -1,17 +1,31 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
 from django.db.models import UniqueConstraint, Index
-from django.db.models.functions import Lower
 import uuid
 
+from .export import FORMAT_CHOICES as EXPORT_FORMAT_CHOICES, FORMAT_CSV
+from .importing import ImportFormatError, ProfileSpec
+
+
+def normalize_sku_key(sku: str) -> str:
+    """
+    Canonical form of a SKU used for uniqueness and lookups.
+    """
+    return (sku or "").strip().lower()
+
 
 class Product(models.Model):
     """
     A single product in the catalog.
 
-    SKU is treated as case-insensitive and is unique across all records.
+    SKU is treated as case-insensitive and is unique across all records:
+    `sku` keeps the display form, `sku_key` holds normalize_sku_key(sku) and
+    carries the unique index, so lookups are plain B-tree probes.
     """
 
     sku = models.CharField(max_length=64)
+    # Maintained by the pre_save signal and by the importer's bulk writes.
+    sku_key = models.CharField(max_length=64, editable=False)
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
@@ -24,20 +38,106 @@ class Product(models.Model):
         constraints = [
             # Ensure SKU is unique in a case-insensitive way.
             UniqueConstraint(
-                Lower("sku"),
-                name="uniq_product_sku_ci",
+                fields=["sku_key"],
+                name="uniq_product_sku_key",
             )
         ]
         indexes = [
-            # Helps lookups & upsert logic.
-            Index(Lower("sku"), name="idx_product_sku_ci"),
             Index(fields=["name"]),
-            Index(fields=["is_active"]),
+            # List/API sorts and range filters (see filters.SORTS). Each ends
+            # in id so keyset cursors on (value, id) are index range scans;
+            # (is_active, price, id) also serves plain is_active filters.
+            Index(fields=["is_active", "price", "id"], name="product_active_price_idx"),
+            Index(fields=["price", "id"], name="product_price_idx"),
+            Index(fields=["updated_at", "id"], name="product_updated_idx"),
         ]
 
     def __str__(self) -> str:
         return f"{self.sku} - {self.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored facet values, so a later save/delete can apply exact
+        # counter deltas without re-reading the row (see products.facets).
+        if not {"is_active", "price"} & instance.get_deferred_fields():
+            instance._facet_state = (instance.is_active, instance.price)
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Keep the post_save bookkeeping (catalog version, facet counters)
+        # in the same transaction as the row itself.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class CatalogVersion(models.Model):
+    """
+    Single-row catalog change counter.
+
+    Bumped in the same transaction as every product write, so read APIs can
+    answer conditional GETs (ETag / Last-Modified) without touching the
+    products table.
+    """
+
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"Catalog v{self.version}"
+
+
+class CatalogFacet(models.Model):
+    """
+    One catalog counter (total / active / inactive / a price band), kept in
+    step with product writes by products.facets.
+    """
+
+    key = models.CharField(max_length=32, primary_key=True)
+    count = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.key}: {self.count}"
+
+
+class ImportProfile(models.Model):
+    """
+    How to read one supplier's feed: delimiter, encoding, which source column
+    feeds which product field, and per-field transforms.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    delimiter = models.CharField(max_length=1, default=",")
+    encoding = models.CharField(max_length=32, default="utf-8")
+    # {"sku": "Article No", "price": "Unit Price"}; unmapped fields use their own name.
+    column_map = models.JSONField(default=dict, blank=True)
+    # {"price": ["strip_currency", "decimal_comma"]}; see products.importing.TRANSFORMS.
+    transforms = models.JSONField(default=dict, blank=True)
+    # Abort if more than this share of the sniffed rows is unusable.
+    max_reject_rate = models.FloatField(default=0.5)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("name",)
+
+    def __str__(self) -> str:
+        return self.name
+
+    def clean(self) -> None:
+        try:
+            self.as_spec()
+        except ImportFormatError as exc:
+            raise ValidationError({"transforms": str(exc)})
+
+    def as_spec(self) -> ProfileSpec:
+        return ProfileSpec(
+            column_map=self.column_map,
+            transforms=self.transforms,
+            delimiter=self.delimiter,
+            encoding=self.encoding,
+            max_reject_rate=self.max_reject_rate,
+        )
+
 
 class ImportJob(models.Model):
     """
@@ -51,12 +151,16 @@ class ImportJob(models.Model):
     STATUS_PROCESSING = "processing"
     STATUS_COMPLETED = "completed"
     STATUS_FAILED = "failed"
+    STATUS_CANCELLED = "cancelled"
+    STATUS_PAUSED = "paused"
 
     STATUS_CHOICES = [
         (STATUS_PENDING, "Pending"),
         (STATUS_PROCESSING, "Processing"),
         (STATUS_COMPLETED, "Completed"),
         (STATUS_FAILED, "Failed"),
+        (STATUS_CANCELLED, "Cancelled"),
+        (STATUS_PAUSED, "Paused"),
     ]
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -75,12 +179,141 @@ class ImportJob(models.Model):
 
     # Stored so the worker can stream from disk.
     file = models.FileField(upload_to="imports/", blank=True, null=True)
+    # Drop-folder batches (see products/dropfolder.py): several supplier
+    # files imported as one job, in arrival order. Each entry is
+    # {"name", "path", "size"}; `path` is a storage name and `file` is unset.
+    batch_files = models.JSONField(default=list, blank=True)
+    # Per-file accounting for batches, parallel to `batch_files`: rows read,
+    # rows rejected, rows superseded by a later row for the same SKU, and
+    # the error if the file was skipped.
+    file_stats = models.JSONField(default=list, blank=True)
+    # "validate" jobs parse the file and predict the diff without writing
+    # products; the prediction lands in `validation_summary`.
+    MODE_IMPORT = "import"
+    MODE_VALIDATE = "validate"
+
+    MODE_CHOICES = [
+        (MODE_IMPORT, "Import"),
+        (MODE_VALIDATE, "Validate only"),
+    ]
+
+    mode = models.CharField(max_length=16, choices=MODE_CHOICES, default=MODE_IMPORT)
+    validation_summary = models.JSONField(default=dict, blank=True)
+
+    # Rows rejected or coerced during the import, by reason
+    # (see products.rejects), and the gzipped CSV listing each of them.
+    reject_counts = models.JSONField(default=dict, blank=True)
+    reject_report = models.FileField(upload_to="import_reports/", blank=True, null=True)
+
+    # Column mapping / parsing options; None means the default layout.
+    profile = models.ForeignKey(
+        ImportProfile,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+
+    # Full sync: the file is a complete snapshot, so products missing from it
+    # are deactivated (or deleted) once the import finishes.
+    SYNC_DEACTIVATE = "deactivate"
+    SYNC_DELETE = "delete"
+
+    SYNC_ACTION_CHOICES = [
+        (SYNC_DEACTIVATE, "Deactivate missing products"),
+        (SYNC_DELETE, "Delete missing products"),
+    ]
+
+    full_sync = models.BooleanField(default=False)
+    sync_action = models.CharField(
+        max_length=16,
+        choices=SYNC_ACTION_CHOICES,
+        default=SYNC_DEACTIVATE,
+    )
+    swept_rows = models.IntegerField(default=0)
+    # Rows skipped because a later row in the same file had the same SKU.
+    duplicate_rows = models.IntegerField(default=0)
+
+    # Cancel/pause requests, checked by the worker between chunks. A paused
+    # job records the last committed row in `resume_row` and continues
+    # after it when resumed.
+    CONTROL_CANCEL = "cancel"
+    CONTROL_PAUSE = "pause"
+
+    CONTROL_CHOICES = [
+        (CONTROL_CANCEL, "Cancel"),
+        (CONTROL_PAUSE, "Pause"),
+    ]
+
+    control_request = models.CharField(max_length=16, choices=CONTROL_CHOICES, blank=True)
+    resume_row = models.IntegerField(default=0)
+
+    # Opt-in sampling profile of the import run (collapsed stacks; see
+    # config/profiling.py). Unrelated to `profile`, the column mapping.
+    sampling_enabled = models.BooleanField(default=False)
+    sampling_report = models.FileField(upload_to="profiles/", blank=True, null=True)
 
     class Meta:
         ordering = ("-uploaded_at",)
 
+    @property
+    def rejected_rows(self) -> int:
+        return sum(self.reject_counts.values())
+
     @property
     def progress_percent(self) -> int:
         if self.total_rows <= 0:
             return 0
         return int(self.processed_rows * 100 / self.total_rows)
+
+
+class ImportJobSku(models.Model):
+    """
+    Staging table for full-sync imports: every SKU key seen by the job.
+
+    Lets the final sweep run as one set-based anti-join in the database
+    instead of pulling the catalog into Python. Rows are removed when the
+    job finishes.
+    """
+
+    job = models.ForeignKey(ImportJob, on_delete=models.CASCADE, related_name="seen_skus")
+    sku = models.CharField(max_length=64)
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(fields=["job", "sku"], name="uniq_importjobsku_job_sku"),
+        ]
+
+
+class ExportJob(models.Model):
+    """
+    Tracks a background catalog export.
+
+    Large exports run in Celery and write to `file`; the status page links to
+    the download once the job completes.
+    """
+
+    STATUS_CHOICES = ImportJob.STATUS_CHOICES
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    status = models.CharField(
+        max_length=32,
+        choices=STATUS_CHOICES,
+        default=ImportJob.STATUS_PENDING,
+        db_index=True,
+    )
+    format = models.CharField(max_length=16, choices=EXPORT_FORMAT_CHOICES, default=FORMAT_CSV)
+    compress = models.BooleanField(default=False)
+    # The list filters (sku/name/description/active) captured at request time.
+    filters = models.JSONField(default=dict, blank=True)
+
+    row_count = models.IntegerField(default=0)
+    error_message = models.TextField(blank=True)
+
+    file = models.FileField(upload_to="exports/", blank=True, null=True)
+
+    class Meta:
+        ordering = ("-created_at",)
@@ -0,0 +1,117 @@
+"""
+Import progress fan-out over Redis pub/sub.
+
+The import task publishes a snapshot after every committed chunk; the SSE
+endpoint (products/sse.py) relays them to browsers so status pages no longer
+poll the database. The latest snapshot is also kept under a key, so the
+polling status API is answered from Redis without touching the database.
+"""
+import json
+import logging
+from typing import Dict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.urls import reverse
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis ships with celery[redis]
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_CHANNEL_PREFIX = "import-progress:"
+SNAPSHOT_KEY_PREFIX = "import-snapshot:"
+# Every status change publishes a fresh snapshot; the TTL only bounds how
+# long finished jobs linger in Redis.
+SNAPSHOT_TTL_SECONDS = 60 * 60
+# Progress is best-effort: an unreachable Redis must not stall the import
+# loop or tie up the threads async views hand their reads to.
+REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS = 1.0
+REDIS_SOCKET_TIMEOUT_SECONDS = 2.0
+
+# Statuses after which no more progress messages will be published (a paused
+# job starts a fresh stream when the status page reloads after resuming).
+TERMINAL_STATUSES = ("completed", "failed", "cancelled", "paused")
+
+_client = None
+
+
+def progress_channel(job_id) -> str:
+    return f"{PROGRESS_CHANNEL_PREFIX}{job_id}"
+
+
+def snapshot_key(job_id) -> str:
+    return f"{SNAPSHOT_KEY_PREFIX}{job_id}"
+
+
+def job_snapshot(job) -> Dict[str, object]:
+    """
+    JSON shape shared by the status API and the SSE stream.
+    """
+    return {
+        "status": job.status,
+        "control_request": job.control_request,
+        "mode": job.mode,
+        "total_rows": job.total_rows,
+        "processed_rows": job.processed_rows,
+        "progress": job.progress_percent,
+        "swept_rows": job.swept_rows,
+        "duplicate_rows": job.duplicate_rows,
+        "reject_counts": job.reject_counts,
+        "reject_report_url": (
+            reverse("import_reject_report", kwargs={"job_id": job.pk}) if job.reject_report else None
+        ),
+        "validation_summary": job.validation_summary,
+        "file_stats": job.file_stats,
+        "error_message": job.error_message,
+    }
+
+
+def _get_client():
+    global _client
+    if _client is None and redis is not None and settings.REDIS_URL:
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS,
+            socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+        )
+    return _client
+
+
+def publish_progress(job) -> None:
+    """
+    Publish the job's current progress and store it as the latest snapshot.
+    Never fails the import: if Redis is unavailable, status pages simply
+    fall back to polling the database.
+    """
+    client = _get_client()
+    if client is None:
+        return
+    payload = json.dumps(job_snapshot(job))
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.set(snapshot_key(job.pk), payload, ex=SNAPSHOT_TTL_SECONDS)
+        pipe.publish(progress_channel(job.pk), payload)
+        pipe.execute()
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("Could not publish progress for import %s: %s", job.pk, exc)
+
+
+def _read_snapshot(job_id) -> Dict[str, object] | None:
+    client = _get_client()
+    if client is None:
+        return None
+    try:
+        payload = client.get(snapshot_key(job_id))
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("Could not read the progress snapshot for import %s: %s", job_id, exc)
+        return None
+    return json.loads(payload) if payload else None
+
+
+# The latest published snapshot, or None. Runs the (thread-safe, pooled)
+# sync client off the event loop rather than holding an asyncio client per
+# loop, so it behaves the same under ASGI and WSGI.
+cached_snapshot = sync_to_async(_read_snapshot, thread_sensitive=False)
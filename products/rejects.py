@@ -0,0 +1,102 @@
+"""
+Rejected-row report for imports.
+
+Every rejected or coerced row is appended, with its line number and reason,
+to a gzip-compressed CSV in a temp file as the import runs, so memory stays
+bounded no matter how many rows are bad. The finished file is attached to
+the ImportJob.
+"""
+import csv
+import gzip
+import io
+import shutil
+import tempfile
+from typing import Dict, Sequence
+
+from django.core.files import File
+
+# Row dropped entirely.
+REASON_MISSING_SKU = "missing_sku"
+# Row imported, but a value was replaced.
+REASON_INVALID_PRICE = "invalid_price"
+
+REASON_LABELS = {
+    REASON_MISSING_SKU: "Missing SKU (row skipped)",
+    REASON_INVALID_PRICE: "Unparseable price (imported as 0)",
+}
+
+
+class RejectReport:
+    """
+    Incremental writer for the rejected-row CSV.
+
+    Use as a context manager; call `add()` per problem and `attach(job)` once
+    the import finishes. A resumed import passes the `previous` report file
+    and its `counts` so the new entries are appended to them.
+    """
+
+    def __init__(
+        self,
+        source_header: Sequence[str],
+        previous=None,
+        counts: Dict[str, int] | None = None,
+    ) -> None:
+        self.source_header = list(source_header)
+        self.counts: Dict[str, int] = dict(counts or {}) if previous else {}
+        self._previous = previous
+        self._tmp = None
+        self._gz = None
+        self._text = None
+        self._writer = None
+
+    def __enter__(self) -> "RejectReport":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def add(self, line: int, reason: str, detail: str, raw: Sequence) -> None:
+        if self._writer is None:
+            self._open()
+        self._writer.writerow([line, reason, detail, *raw])
+        self.counts[reason] = self.counts.get(reason, 0) + 1
+
+    def _open(self) -> None:
+        self._tmp = tempfile.TemporaryFile()
+        carried_over = False
+        if self._previous:
+            # Copy the earlier gzip member as-is; gzip readers concatenate
+            # members, so the result reads as one CSV with one header.
+            with self._previous.open("rb") as f:
+                shutil.copyfileobj(f, self._tmp)
+            carried_over = True
+        self._gz = gzip.GzipFile(fileobj=self._tmp, mode="wb")
+        self._text = io.TextIOWrapper(self._gz, encoding="utf-8", newline="")
+        self._writer = csv.writer(self._text)
+        if not carried_over:
+            self._writer.writerow(["line", "reason", "detail", *self.source_header])
+
+    def attach(self, job) -> None:
+        """
+        Store the report on `job.reject_report` (only if anything was
+        written). The caller saves the job.
+        """
+        if self._writer is None:
+            return
+        self._text.close()  # flushes and closes the gzip stream, not the temp file
+        self._writer = None
+        self._tmp.seek(0)
+        if self._previous:
+            # Replaced by the combined report.
+            job.reject_report.delete(save=False)
+        job.reject_report.save(f"{job.pk}-rejects.csv.gz", File(self._tmp), save=False)
+
+    def close(self) -> None:
+        if self._text is not None and not self._text.closed:
+            self._text.close()
+        if self._tmp is not None:
+            self._tmp.close()
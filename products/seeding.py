@@ -0,0 +1,139 @@
+"""
+Synthetic catalog data for benchmarks and load tests.
+
+Both generators share the same distributions:
+- SKUs `<prefix><CAT>-<00000042>`, spread over a handful of category codes.
+- Names "<adjective> <material> <noun>", words drawn with a skew towards the
+  head of each list (a few very common words, a long tail), so name filters
+  hit both large and small result sets.
+- Descriptions of 0-3 phrases; about 10% are empty.
+- Prices log-uniform between 0.99 and ~2000, mostly ending in .99.
+- About 90% of products active; timestamps spread over the last year
+  (PostgreSQL path only).
+
+`seed_sql()` does this set-based inside PostgreSQL (INSERT ... SELECT over
+generate_series); `iter_products()` is the Python equivalent for other
+databases.
+"""
+import math
+import random
+from decimal import Decimal
+from typing import Iterator, Tuple
+
+from .models import Product, normalize_sku_key
+
+CATEGORIES = ("ELC", "HOM", "TOY", "APP", "GRD", "SPT", "BKS", "AUT", "BTY", "OFF")
+ADJECTIVES = (
+    "Classic", "Premium", "Compact", "Deluxe", "Essential", "Ultra", "Smart", "Portable",
+    "Heavy-Duty", "Eco", "Vintage", "Modern", "Mini", "Pro", "Rugged", "Slim",
+)
+MATERIALS = (
+    "Steel", "Cotton", "Bamboo", "Leather", "Plastic", "Wooden", "Ceramic", "Glass",
+    "Aluminium", "Wool", "Silicone", "Carbon",
+)
+NOUNS = (
+    "Lamp", "Chair", "Bottle", "Backpack", "Speaker", "Mug", "Jacket", "Blender",
+    "Drill", "Notebook", "Kettle", "Headphones", "Tent", "Rug", "Watch", "Charger",
+    "Pan", "Shelf", "Helmet", "Brush",
+)
+PHRASES = (
+    "Built to last.",
+    "Ships in recyclable packaging.",
+    "Two-year manufacturer warranty.",
+    "Dishwasher safe.",
+    "Available in several colours.",
+    "Designed for everyday use.",
+    "Lightweight and easy to carry.",
+    "Assembly required.",
+)
+
+INACTIVE_SHARE = 0.1
+EMPTY_DESCRIPTION_SHARE = 0.1
+MAX_PRICE = 2000
+
+
+def _skewed(rng: random.Random, words: Tuple[str, ...]) -> str:
+    # random()**2 favours low indexes: a popular head and a long tail.
+    return words[int(rng.random() ** 2 * len(words))]
+
+
+def make_sku(prefix: str, i: int) -> str:
+    return f"{prefix}{CATEGORIES[i % len(CATEGORIES)]}-{i:08d}"
+
+
+def iter_products(prefix: str, start: int, stop: int, rng: random.Random) -> Iterator[Product]:
+    """
+    Unsaved Product rows for indexes [start, stop), ready for bulk_create.
+    """
+    for i in range(start, stop):
+        name = f"{_skewed(rng, ADJECTIVES)} {_skewed(rng, MATERIALS)} {_skewed(rng, NOUNS)}"
+        if rng.random() < EMPTY_DESCRIPTION_SHARE:
+            description = ""
+        else:
+            description = " ".join([name + "."] + rng.sample(PHRASES, rng.randint(0, 3)))
+        price = Decimal(round(math.exp(rng.random() * math.log(MAX_PRICE)))) - Decimal("0.01")
+        sku = make_sku(prefix, i)
+        # created_at / updated_at are auto fields: bulk_create stamps them "now".
+        yield Product(
+            sku=sku,
+            sku_key=normalize_sku_key(sku),
+            name=name,
+            description=description,
+            price=max(price, Decimal("0.99")),
+            is_active=rng.random() >= INACTIVE_SHARE,
+        )
+
+
+def seed_sql(table: str) -> str:
+    """
+    One INSERT ... SELECT that generates rows %(start)s..%(stop)s
+    (inclusive) of the catalog with the module's distributions. Existing
+    SKUs are skipped, so re-running a range is harmless.
+    """
+    phrase = "(%(phrases)s::text[])[1 + floor(random() * %(n_phrases)s)::int]"
+
+    def skewed(words: str) -> str:
+        return f"(%({words})s::text[])[1 + floor(power(random(), 2) * %(n_{words})s)::int]"
+
+    return f"""
+        INSERT INTO {table} (sku, sku_key, name, description, price, is_active, created_at, updated_at)
+        SELECT sku, lower(sku), name,
+               CASE WHEN random() < %(empty_share)s THEN ''
+                    ELSE name || '.'
+                         || CASE WHEN random() < 0.75 THEN ' ' || {phrase} ELSE '' END
+                         || CASE WHEN random() < 0.5 THEN ' ' || {phrase} ELSE '' END
+                         || CASE WHEN random() < 0.25 THEN ' ' || {phrase} ELSE '' END
+               END,
+               greatest(0.99, round(exp(random() * ln(%(max_price)s))::numeric) - 0.01),
+               random() >= %(inactive_share)s,
+               ts, ts
+        FROM (
+            SELECT %(prefix)s || (%(categories)s::text[])[1 + i %% %(n_categories)s]
+                   || '-' || lpad(i::text, 8, '0') AS sku,
+                   {skewed("adjectives")} || ' ' || {skewed("materials")} || ' ' || {skewed("nouns")} AS name,
+                   now() - random() * interval '365 days' AS ts
+            FROM generate_series(%(start)s, %(stop)s) AS i
+        ) AS seed
+        ON CONFLICT (sku_key) DO NOTHING
+    """
+
+
+def seed_sql_params(prefix: str, start: int, stop: int) -> dict:
+    return {
+        "prefix": prefix,
+        "start": start,
+        "stop": stop,
+        "categories": list(CATEGORIES),
+        "n_categories": len(CATEGORIES),
+        "adjectives": list(ADJECTIVES),
+        "n_adjectives": len(ADJECTIVES),
+        "materials": list(MATERIALS),
+        "n_materials": len(MATERIALS),
+        "nouns": list(NOUNS),
+        "n_nouns": len(NOUNS),
+        "phrases": list(PHRASES),
+        "n_phrases": len(PHRASES),
+        "empty_share": EMPTY_DESCRIPTION_SHARE,
+        "inactive_share": INACTIVE_SHARE,
+        "max_price": MAX_PRICE,
+    }
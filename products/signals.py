@@ -1,7 +1,9 @@
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .models import Product
+from .catalog import bump_catalog_version
+from .facets import apply_deltas, loaded_state, remember_state, state_deltas
+from .models import Product, normalize_sku_key
 from webhooks.tasks import trigger_event_webhooks
 
 
@@ -16,11 +18,27 @@ def _product_payload(instance: Product) -> dict:
     }
 
 
+@receiver(pre_save, sender=Product)
+def product_sku_key(sender, instance: Product, **kwargs) -> None:
+    """
+    Keep the indexed `sku_key` in sync with `sku` on every ORM save.
+    """
+    instance.sku_key = normalize_sku_key(instance.sku)
+    if not instance._state.adding and loaded_state(instance) is None:
+        # Not loaded through the ORM (e.g. built with an explicit pk):
+        # read the stored facet values before they are overwritten.
+        stored = Product.objects.filter(pk=instance.pk).values_list("is_active", "price").first()
+        instance._facet_state = stored
+
+
 @receiver(post_save, sender=Product)
 def product_saved(sender, instance: Product, created: bool, **kwargs) -> None:
     """
     STORY 4 – Automatically trigger product.created / product.updated webhooks.
     """
+    bump_catalog_version()
+    apply_deltas(state_deltas(None if created else loaded_state(instance), (instance.is_active, instance.price)))
+    remember_state([instance])
     event = "product.created" if created else "product.updated"
     trigger_event_webhooks(event=event, payload={"event": event, "product": _product_payload(instance)})
 
@@ -30,5 +48,7 @@ def product_deleted(sender, instance: Product, **kwargs) -> None:
     """
     STORY 4 – Automatically trigger product.deleted webhooks.
     """
+    bump_catalog_version()
+    apply_deltas(state_deltas(loaded_state(instance) or (instance.is_active, instance.price), None))
     event = "product.deleted"
     trigger_event_webhooks(event=event, payload={"event": event, "product": _product_payload(instance)})
@@ -0,0 +1,183 @@
+"""
+Import file readers (CSV, JSON Lines, Parquet).
+
+Every reader hands the importer the same thing: a header and an iterator
+of rows aligned with it. Profiles, sniffing, the dedup pre-scan and the
+reject report therefore work the same for every format.
+
+- CSV is streamed as text with the profile's delimiter and encoding.
+- JSON Lines holds one object per line. Only the profile's mapped keys are
+  kept, and numbers are parsed as Decimal so prices stay exact.
+- Parquet is read in record batches and only the mapped columns are
+  loaded. Decimal columns arrive as Decimal objects. The row count comes
+  from the footer metadata, so `total_rows` is exact before the first row.
+"""
+import csv
+import json
+import os
+from decimal import Decimal
+from io import TextIOWrapper
+from typing import BinaryIO, Iterator, List, Sequence, Tuple
+
+from .importing import PRODUCT_FIELDS, ImportFormatError, ProfileSpec
+
+try:  # Parquet support is optional.
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on the deployment
+    pq = None
+
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+FORMAT_PARQUET = "parquet"
+
+IMPORT_EXTENSIONS = {
+    ".csv": FORMAT_CSV,
+    ".jsonl": FORMAT_JSONL,
+    ".ndjson": FORMAT_JSONL,
+    ".parquet": FORMAT_PARQUET,
+}
+
+# Rows decoded per Parquet record batch.
+PARQUET_BATCH_ROWS = 10_000
+
+
+def import_format(filename: str) -> str:
+    """
+    Input format for `filename`, by extension. Unknown extensions are read
+    as CSV, as before other formats existed.
+    """
+    ext = os.path.splitext(filename or "")[1].lower()
+    return IMPORT_EXTENSIONS.get(ext, FORMAT_CSV)
+
+
+def format_unavailable(fmt: str) -> str | None:
+    """
+    Why `fmt` can't be imported on this deployment, or None.
+    """
+    if fmt == FORMAT_PARQUET and pq is None:
+        return "Parquet import requires the 'pyarrow' package."
+    return None
+
+
+class ImportSource:
+    """
+    An opened import file: `header`, `rows` (row sequences aligned with the
+    header) and `total_rows` when the format knows it up front.
+
+    `numbered` yields the same rows as (line, row) pairs, where `line` is
+    where the row is in the file: the physical line for CSV (so quoted
+    multi-line fields don't shift the rows after them) and JSON Lines (blank
+    lines included), the 1-based record number for Parquet. Iterate either
+    `rows` or `numbered`, not both.
+    """
+
+    def __init__(
+        self,
+        header: List[str],
+        numbered: Iterator[Tuple[int, Sequence]],
+        total_rows: int | None = None,
+    ) -> None:
+        self.header = header
+        self.numbered = numbered
+        self.total_rows = total_rows
+
+    @property
+    def rows(self) -> Iterator[Sequence]:
+        return (row for _, row in self.numbered)
+
+
+def _source_columns(spec: ProfileSpec, fields: Sequence[str]) -> List[str]:
+    # The columns the profile reads for `fields`, in field order.
+    columns = []
+    for field in fields:
+        source = spec.column_map.get(field)
+        if source and source not in columns:
+            columns.append(source)
+    return columns
+
+
+def _csv_source(f: BinaryIO, spec: ProfileSpec) -> ImportSource:
+    reader = csv.reader(TextIOWrapper(f, encoding=spec.encoding, newline=""), delimiter=spec.delimiter)
+    header = next(reader, None)
+    if header is None:
+        raise ImportFormatError("The file is empty.")
+    return ImportSource(header, _numbered_csv(reader))
+
+
+def _numbered_csv(reader) -> Iterator[Tuple[int, List[str]]]:
+    # line_num counts physical lines read so far, so a record starts one
+    # past where the previous one ended.
+    start = reader.line_num + 1
+    for row in reader:
+        yield start, row
+        start = reader.line_num + 1
+
+
+def _iter_jsonl(f: BinaryIO, spec: ProfileSpec, keys: List[str]) -> Iterator[Tuple[int, List[object]]]:
+    for lineno, line in enumerate(TextIOWrapper(f, encoding=spec.encoding), start=1):
+        if not line.strip():
+            continue
+        try:
+            obj = json.loads(line, parse_float=Decimal)
+        except ValueError as exc:
+            raise ImportFormatError(f"Line {lineno} is not valid JSON: {exc}") from None
+        if not isinstance(obj, dict):
+            raise ImportFormatError(f"Line {lineno} is not a JSON object.")
+        # Same case/whitespace-insensitive matching as CSV headers.
+        obj = {str(key).strip().lower(): value for key, value in obj.items()}
+        yield lineno, [obj.get(key) for key in keys]
+
+
+def _jsonl_source(f: BinaryIO, spec: ProfileSpec, fields: Sequence[str]) -> ImportSource:
+    # Objects carry their own keys, so the "header" is the mapped columns.
+    header = _source_columns(spec, fields)
+    keys = [str(name).strip().lower() for name in header]
+    return ImportSource(header, _iter_jsonl(f, spec, keys))
+
+
+def _iter_parquet(parquet_file, columns: List[str]) -> Iterator[tuple]:
+    for batch in parquet_file.iter_batches(batch_size=PARQUET_BATCH_ROWS, columns=columns):
+        yield from zip(*(column.to_pylist() for column in batch.columns))
+
+
+def _numbered_parquet(parquet_file, columns: List[str]) -> Iterator[Tuple[int, tuple]]:
+    # No lines in a Parquet file; the record number is what a reader can find.
+    return enumerate(_iter_parquet(parquet_file, columns), start=1)
+
+
+def _parquet_source(f: BinaryIO, spec: ProfileSpec, fields: Sequence[str]) -> ImportSource:
+    problem = format_unavailable(FORMAT_PARQUET)
+    if problem:
+        raise ImportFormatError(problem)
+    try:
+        parquet_file = pq.ParquetFile(f)
+    except Exception as exc:  # noqa: BLE001 - pyarrow raises several types
+        raise ImportFormatError(f"Not a readable Parquet file: {exc}") from None
+
+    # Project the mapped columns (matched like CSV headers); missing ones are
+    # reported by compile_extractor.
+    available = {name.strip().lower(): name for name in parquet_file.schema_arrow.names}
+    header = [
+        available[name.strip().lower()]
+        for name in _source_columns(spec, fields)
+        if name.strip().lower() in available
+    ]
+    return ImportSource(header, _numbered_parquet(parquet_file, header), parquet_file.metadata.num_rows)
+
+
+def open_source(
+    f: BinaryIO,
+    spec: ProfileSpec,
+    fmt: str = FORMAT_CSV,
+    fields: Sequence[str] = PRODUCT_FIELDS,
+) -> ImportSource:
+    """
+    Read the binary file `f` as `fmt`. `fields` limits the columns JSON Lines
+    and Parquet decode (e.g. just "sku" for the dedup pre-scan); CSV rows
+    are always whole.
+    """
+    if fmt == FORMAT_PARQUET:
+        return _parquet_source(f, spec, fields)
+    if fmt == FORMAT_JSONL:
+        return _jsonl_source(f, spec, fields)
+    return _csv_source(f, spec)
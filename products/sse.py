@@ -0,0 +1,130 @@
+"""
+Server-Sent Events endpoint for import progress.
+
+This is a raw ASGI app mounted in config/asgi.py (it needs a long-lived
+connection, which the sync Django views cannot hold cheaply). Each
+connection sends the current snapshot once, then relays messages from the
+job's Redis pub/sub channel until the import finishes or the client leaves.
+"""
+import asyncio
+import json
+import logging
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from .models import ImportJob
+from .progress import TERMINAL_STATUSES, job_snapshot, progress_channel
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis ships with celery[redis]
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+SSE_PATH_RE = re.compile(
+    r"^/(?:products/)?events/import/(?P<job_id>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})/$"
+)
+
+# Comment line sent while idle so proxies don't drop the connection.
+HEARTBEAT_SECONDS = 15
+# Close long-lived streams periodically; EventSource reconnects on its own.
+MAX_STREAM_SECONDS = 600
+
+
+@sync_to_async
+def _load_snapshot(job_id: str):
+    # Outside Django's request cycle request_started/finished never fire, so
+    # recycle this thread's connection here (and hand a pooled one back).
+    close_old_connections()
+    try:
+        job = ImportJob.objects.filter(pk=job_id).first()
+        return job_snapshot(job) if job else None
+    finally:
+        close_old_connections()
+
+
+def _event(data: dict) -> bytes:
+    return f"data: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+async def _send_body(send, body: bytes, more: bool = True) -> None:
+    await send({"type": "http.response.body", "body": body, "more_body": more})
+
+
+async def import_progress_app(scope, receive, send, job_id: str) -> None:
+    if aioredis is None or not settings.REDIS_URL:
+        # Without pub/sub there is nothing to stream; the page will poll.
+        await send({"type": "http.response.start", "status": 503, "headers": []})
+        await _send_body(send, b"", more=False)
+        return
+
+    client = aioredis.Redis.from_url(settings.REDIS_URL)
+    pubsub = client.pubsub()
+    try:
+        # Subscribe before reading the snapshot so no update falls in between.
+        await pubsub.subscribe(progress_channel(job_id))
+        snapshot = await _load_snapshot(job_id)
+        if snapshot is None:
+            await send({"type": "http.response.start", "status": 404, "headers": []})
+            await _send_body(send, b"", more=False)
+            return
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            }
+        )
+        await _send_body(send, _event(snapshot))
+        if snapshot["status"] in TERMINAL_STATUSES:
+            await _send_body(send, b"", more=False)
+            return
+
+        await _relay(pubsub, receive, send)
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
+
+
+async def _relay(pubsub, receive, send) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + MAX_STREAM_SECONDS
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+    idle = 0.0
+
+    try:
+        while not disconnected.done() and loop.time() < deadline:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            if message is None:
+                idle += 1.0
+                if idle >= HEARTBEAT_SECONDS:
+                    await _send_body(send, b": ping\n\n")
+                    idle = 0.0
+                continue
+
+            idle = 0.0
+            data = json.loads(message["data"])
+            await _send_body(send, _event(data))
+            if data.get("status") in TERMINAL_STATUSES:
+                break
+
+        if not disconnected.done():
+            await _send_body(send, b"", more=False)
+    finally:
+        disconnected.cancel()
+
+
+async def _wait_for_disconnect(receive) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
@@ -1,74 +1,171 @@
-import csv
+import bisect
+import contextlib
 import logging
+import tempfile
+import time
 from decimal import Decimal, InvalidOperation
-from io import TextIOWrapper
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
 
 from celery import shared_task
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
 from django.db import transaction
-from django.db.models.functions import Lower
-
-from .models import ImportJob, Product
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from config.db_router import iter_from_replica
+from config.deletion import delete_in_batches
+from config.metrics import Counter, Histogram
+from config.profiling import capture_profile
+
+from .catalog import bump_catalog_version
+from .dedup import LastOccurrenceIndex
+from .export import export_filename, iter_export_chunks
+from .facets import FACET_ACTIVE, FACET_INACTIVE, apply_deltas, changes_deltas, queryset_deltas
+from .filters import filter_products
+from .importing import PRODUCT_FIELDS, ImportFormatError, ProfileSpec, compile_extractor, sniff_rows
+from .models import ExportJob, ImportJob, ImportJobSku, Product, normalize_sku_key
+from .progress import publish_progress
+from .rejects import REASON_INVALID_PRICE, REASON_MISSING_SKU, RejectReport
+from .sources import import_format, open_source
 from webhooks.tasks import trigger_event_webhooks
 
 logger = logging.getLogger(__name__)
 
 # Tune this depending on DB power / deployment limits.
 CHUNK_SIZE = 5000
+# Primary keys per DELETE when a full sync deletes missing products.
+SWEEP_BATCH_SIZE = 5000
+
+# Leading columns of a drop-folder batch row (see _batch_rows); they also
+# identify the source file in the batch's reject report.
+BATCH_COLUMNS = ("file", "file_line")
+
+# Pre-scan the file so each SKU is written once, from its last row
+# (see dedup.py). Costs one extra parse pass; saves the redundant writes.
+DEDUP_ENABLED = True
+
+IMPORT_ROWS = Counter(
+    "importer_import_rows",
+    "Product rows written by imports.",
+    ["outcome"],
+)
+IMPORT_CHUNK_SECONDS = Histogram(
+    "importer_import_chunk_seconds",
+    "Time to commit one import chunk (lookup + bulk writes).",
+)
+IMPORT_JOBS = Counter(
+    "importer_import_jobs",
+    "Import jobs finished, by final status.",
+    ["status"],
+)
+IMPORT_JOB_SECONDS = Histogram(
+    "importer_import_job_seconds",
+    "Wall time of import runs that completed.",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600),
+)
 
 
 @shared_task
 def process_import_job(job_id: str) -> None:
     """
-    Background CSV import.
+    Background product import (CSV, JSON Lines or Parquet; see sources.py),
+    of one uploaded file or a drop-folder batch of files.
 
+    - Maps columns through the job's ImportProfile (or the default layout)
+      and aborts early if the header or the first rows don't fit.
     - Streams the uploaded file without loading 500k rows into memory.
     - Upserts products in chunks using bulk_create / bulk_update.
     - Treats SKU as case-insensitive and keeps it globally unique.
+    - Stops cleanly between chunks on a cancel/pause request; a resumed job
+      skips the rows it already committed.
     """
+    # Claim the job with a conditional UPDATE so a cancel issued while it was
+    # queued can't be overwritten.
+    claimed = (
+        ImportJob.objects.filter(pk=job_id)
+        .exclude(status=ImportJob.STATUS_CANCELLED)
+        .update(status=ImportJob.STATUS_PROCESSING, control_request="")
+    )
+    if not claimed:
+        return
     job = ImportJob.objects.get(pk=job_id)
 
-    # Reset progress (useful if we ever support retries).
-    job.status = ImportJob.STATUS_PROCESSING
-    job.error_message = ""
-    job.total_rows = 0
-    job.processed_rows = 0
-    job.save(update_fields=["status", "error_message", "total_rows", "processed_rows"])
-
-    try:
-        if not job.file:
-            raise ValueError("No file associated with this import job.")
+    # The sampler thread only runs for jobs that asked for it.
+    with capture_profile(job, "sampling_report", enabled=job.sampling_enabled):
+        _run_import(job)
 
-        # Stream the CSV as text; this is memory-efficient for large files.
-        with job.file.open("rb") as f:
-            wrapper = TextIOWrapper(f, encoding="utf-8", newline="")
-            reader = csv.DictReader(wrapper)
 
-            buffer: List[Dict[str, object]] = []
+def _run_import(job: ImportJob) -> None:
+    job_id = job.pk
+    started = time.perf_counter()
 
-            for idx, row in enumerate(reader, start=1):
-                # Let the UI see total rows grow so percentage is meaningful.
-                job.total_rows = idx
-                if idx % 1000 == 0:
-                    job.save(update_fields=["total_rows"])
+    # A resumed job picks up after the last committed chunk.
+    resume_after = job.resume_row
 
-                normalized = _normalize_row(row)
-                if not normalized:
-                    # Skip rows without a valid SKU.
-                    continue
-
-                buffer.append(normalized)
+    job.error_message = ""
+    update_fields = ["error_message"]
+    if not resume_after:
+        # Reset progress (useful if we ever support retries).
+        job.total_rows = 0
+        job.processed_rows = 0
+        job.swept_rows = 0
+        job.duplicate_rows = 0
+        job.reject_counts = {}
+        job.file_stats = [
+            {"name": entry["name"], "rows": 0, "rejected": 0, "superseded": 0} for entry in job.batch_files
+        ]
+        if job.reject_report:
+            job.reject_report.delete(save=False)
+        update_fields += [
+            "total_rows", "processed_rows", "swept_rows", "duplicate_rows",
+            "reject_counts", "reject_report", "file_stats",
+        ]
+    job.save(update_fields=update_fields)
+    publish_progress(job)
 
-                if len(buffer) >= CHUNK_SIZE:
-                    _upsert_products(buffer, job)
-                    buffer.clear()
+    try:
+        if not job.file and not job.batch_files:
+            raise ValueError("No file associated with this import job.")
 
-            # Flush any remaining rows.
-            if buffer:
-                _upsert_products(buffer, job)
+        spec = job.profile.as_spec() if job.profile else ProfileSpec()
+        accounting = _BatchAccounting(job.file_stats) if job.batch_files else None
+
+        with contextlib.ExitStack() as stack:
+            header, extract, rows, total_rows = _open_job_rows(job, spec, stack, accounting)
+            if total_rows is not None:
+                # Known from the file's metadata (Parquet): exact progress
+                # from the first chunk.
+                job.total_rows = total_rows
+                job.save(update_fields=["total_rows"])
+                publish_progress(job)
+
+            previous_report = job.reject_report if resume_after else None
+            with RejectReport(header, previous=previous_report, counts=job.reject_counts) as rejects, \
+                    _dedup_index(job, spec) as dedup:
+                try:
+                    _import_rows(
+                        job, rows, extract, rejects, dedup,
+                        resume_after=resume_after, count_rows=total_rows is None, accounting=accounting,
+                    )
+                finally:
+                    # Keep the report even if the import stops part-way.
+                    rejects.attach(job)
+                    job.reject_counts = rejects.counts
+                    job.save(update_fields=["reject_report", "reject_counts", "file_stats"])
+
+        if job.full_sync:
+            _sweep_missing_products(job)
 
         job.status = ImportJob.STATUS_COMPLETED
-        job.save(update_fields=["status", "processed_rows", "total_rows"])
+        job.resume_row = 0
+        # A request that arrived after the last chunk is moot.
+        job.control_request = ""
+        job.save(update_fields=["status", "processed_rows", "total_rows", "resume_row", "control_request"])
+        publish_progress(job)
+        IMPORT_JOBS.inc(status=job.status)
+        IMPORT_JOB_SECONDS.observe(time.perf_counter() - started)
 
         # Fire "import.completed" webhooks asynchronously.
         trigger_event_webhooks(
@@ -78,48 +175,342 @@ def process_import_job(job_id: str) -> None:
                 "filename": job.original_filename,
                 "total_rows": job.total_rows,
                 "processed_rows": job.processed_rows,
+                "swept_rows": job.swept_rows,
+                "duplicate_rows": job.duplicate_rows,
+                "rejected_rows": job.rejected_rows,
                 "status": job.status,
+                "files": job.file_stats,
             },
         )
 
+    except ImportInterrupted as stop:
+        # Stopped cleanly between chunks; the worker is free again.
+        logger.info("Import job %s %s after row %s", job_id, stop.status, stop.resume_row)
+        job.status = stop.status
+        job.control_request = ""
+        job.resume_row = stop.resume_row if stop.status == ImportJob.STATUS_PAUSED else 0
+        job.save(update_fields=["status", "control_request", "resume_row", "total_rows"])
+        publish_progress(job)
+        IMPORT_JOBS.inc(status=job.status)
+        if stop.status == ImportJob.STATUS_CANCELLED:
+            ImportJobSku.objects.filter(job=job).delete()
+
     except Exception as exc:
         logger.exception("Import job %s failed", job_id)
         job.status = ImportJob.STATUS_FAILED
         job.error_message = str(exc)
         job.save(update_fields=["status", "error_message"])
+        publish_progress(job)
+        IMPORT_JOBS.inc(status=job.status)
+        # A failed full sync must never sweep; just drop its staging rows.
+        ImportJobSku.objects.filter(job=job).delete()
         # Let Celery mark the task as failed.
         raise
 
 
-def _normalize_row(row: Dict[str, str]) -> Dict[str, object] | None:
+class ImportInterrupted(Exception):
+    """
+    Raised between chunks when a pause or cancel was requested.
     """
-    Normalize a CSV row into an internal representation for _upsert_products.
 
-    Returns None for rows that should be skipped (e.g., missing SKU).
+    def __init__(self, status: str, resume_row: int) -> None:
+        super().__init__(status)
+        self.status = status
+        self.resume_row = resume_row
+
+
+def _check_control(job: ImportJob, row: int) -> None:
     """
-    raw_sku = (row.get("sku") or "").strip()
-    if not raw_sku:
+    Honour a pending pause/cancel request. Called right after a chunk
+    commits, so everything up to `row` is durable.
+    """
+    request = (
+        ImportJob.objects.filter(pk=job.pk).values_list("control_request", flat=True).first()
+    )
+    if request == ImportJob.CONTROL_CANCEL:
+        raise ImportInterrupted(ImportJob.STATUS_CANCELLED, row)
+    if request == ImportJob.CONTROL_PAUSE:
+        raise ImportInterrupted(ImportJob.STATUS_PAUSED, row)
+
+
+def _open_job_rows(job: ImportJob, spec: ProfileSpec, stack: contextlib.ExitStack, accounting=None):
+    """
+    (header, extract, rows, total_rows) for the job's uploaded file or
+    drop-folder batch. `rows` yields (line, row) pairs (see
+    ImportSource.numbered); `total_rows` is None unless the format knows it
+    up front.
+    """
+    if job.batch_files:
+        header = [*BATCH_COLUMNS, *PRODUCT_FIELDS]
+        # Batch rows arrive already mapped and transformed per file.
+        return header, compile_extractor(ProfileSpec(), header), _batch_rows(job, spec, accounting=accounting), None
+
+    # Stream the file; memory stays flat however large it is.
+    f = stack.enter_context(job.file.open("rb"))
+    source = open_source(f, spec, import_format(job.original_filename or job.file.name))
+    # Fail in milliseconds on a wrong layout instead of scanning the
+    # whole file and "completing" with 0 products.
+    extract = compile_extractor(spec, source.header)
+    rows = sniff_rows(source.numbered, lambda item: _normalize_row(extract(item[1]))[0] is None, spec)
+    return source.header, extract, rows, source.total_rows
+
+
+def _batch_rows(
+    job: ImportJob,
+    spec: ProfileSpec,
+    fields: Sequence[str] = PRODUCT_FIELDS,
+    accounting: "_BatchAccounting | None" = None,
+) -> Iterator[List[object]]:
+    """
+    The rows of every file in a drop-folder batch, in arrival order, as
+    (line, [file name, line, *fields]) with `line` the row's line in its
+    own file.
+
+    Each file is read with its own format and header, so suppliers may mix
+    layouts the profile understands. A file whose layout doesn't fit is
+    skipped (and recorded) rather than failing the whole batch; both the
+    dedup pre-scan and the import pass skip the same files, so row numbers
+    line up.
+    """
+    for position, entry in enumerate(job.batch_files):
+        with default_storage.open(entry["path"], "rb") as f:
+            try:
+                source = open_source(f, spec, import_format(entry["name"]), fields=fields)
+                extract = compile_extractor(spec, source.header, fields=fields)
+                rows = sniff_rows(
+                    source.numbered, lambda item: _normalize_row(extract(item[1]))[0] is None, spec
+                )
+            except ImportFormatError as exc:
+                logger.warning("Import job %s: skipping %s: %s", job.pk, entry["name"], exc)
+                if accounting is not None:
+                    accounting.skip(position, str(exc))
+                continue
+
+            if accounting is not None:
+                accounting.start_file(position)
+            count = 0
+            for count, (line, raw) in enumerate(rows, start=1):
+                values = extract(raw)
+                yield line, [entry["name"], line, *(values.get(field) for field in fields)]
+            if accounting is not None:
+                accounting.finish_file(position, count)
+
+
+class _BatchAccounting:
+    """
+    Attributes batch rows (numbered across the whole batch) back to their
+    file and keeps the per-file counts in `stats` (job.file_stats).
+    """
+
+    def __init__(self, stats: List[Dict[str, object]]) -> None:
+        self.stats = stats
+        self._starts: List[int] = []
+        self._positions: List[int] = []
+        self._next_row = 1
+
+    def start_file(self, position: int) -> None:
+        self._starts.append(self._next_row)
+        self._positions.append(position)
+
+    def finish_file(self, position: int, rows: int) -> None:
+        # Assigned, not added: a resumed job re-reads the files it skips.
+        self.stats[position]["rows"] = rows
+        self._next_row += rows
+
+    def skip(self, position: int, error: str) -> None:
+        self.stats[position]["error"] = error
+
+    def _entry(self, row: int) -> Dict[str, object]:
+        return self.stats[self._positions[bisect.bisect_right(self._starts, row) - 1]]
+
+    def rejected(self, row: int, count: int = 1) -> None:
+        self._entry(row)["rejected"] += count
+
+    def superseded(self, row: int) -> None:
+        self._entry(row)["superseded"] += 1
+
+
+def _dedup_index(job: ImportJob, spec: ProfileSpec):
+    """
+    First pass: map each SKU key to the last data row it appears on.
+
+    Reads through a separate file handle (FieldFile.open() would rewind the
+    one the import is using) and extracts only the SKU column; JSON Lines
+    and Parquet don't decode the other columns at all. For a drop-folder
+    batch, rows are numbered across all its files, so a later file wins.
+    """
+    if not DEDUP_ENABLED:
+        return contextlib.nullcontext(None)
+
+    index = LastOccurrenceIndex()
+
+    if job.batch_files:
+        skus = (row[len(BATCH_COLUMNS)] for _, row in _batch_rows(job, spec, fields=("sku",)))
+        for idx, sku in enumerate(skus, start=1):
+            key = _sku_key(sku)
+            if key:
+                index.add(key, idx)
+    else:
+        fmt = import_format(job.original_filename or job.file.name)
+        with job.file.storage.open(job.file.name, "rb") as f:
+            source = open_source(f, spec, fmt, fields=("sku",))
+            extract_sku = compile_extractor(spec, source.header, fields=("sku",))
+            for idx, raw in enumerate(source.rows, start=1):
+                key = _sku_key(extract_sku(raw).get("sku"))
+                if key:
+                    index.add(key, idx)
+
+    index.finish()
+    return index
+
+
+def _import_rows(
+    job: ImportJob,
+    rows: Iterable,
+    extract,
+    rejects: RejectReport,
+    dedup: LastOccurrenceIndex | None = None,
+    resume_after: int = 0,
+    count_rows: bool = True,
+    accounting: _BatchAccounting | None = None,
+) -> None:
+    """
+    Normalize, report and upsert (line, row) pairs in CHUNK_SIZE batches.
+
+    Rows are counted by position (progress, dedup, resume); `line` is only
+    what the reject report shows. Rows up to `resume_after` were handled by
+    an earlier (paused) run and are skipped. Pause/cancel requests are
+    checked after every chunk. `count_rows=False` when job.total_rows is
+    already known up front. `accounting` attributes rejects and superseded
+    rows to batch files.
+    """
+    buffer: List[Dict[str, object]] = []
+
+    for idx, (line, raw) in enumerate(rows, start=1):
+        if idx <= resume_after:
+            continue
+
+        if count_rows:
+            # Let the UI see total rows grow so percentage is meaningful.
+            job.total_rows = idx
+        if idx % 1000 == 0:
+            job.reject_counts = rejects.counts
+            job.save(update_fields=["total_rows", "reject_counts"])
+
+        normalized, issues = _normalize_row(extract(raw))
+        for reason, detail in issues:
+            rejects.add(line, reason, detail, raw)
+        if issues and accounting is not None:
+            accounting.rejected(idx, len(issues))
+        if not normalized:
+            continue
+
+        normalized["line"] = idx
+        buffer.append(normalized)
+
+        if len(buffer) >= CHUNK_SIZE:
+            _upsert_products(_drop_superseded(buffer, dedup, job, accounting), job)
+            buffer.clear()
+            publish_progress(job)
+            _check_control(job, idx)
+
+    # Flush any remaining rows.
+    if buffer:
+        _upsert_products(_drop_superseded(buffer, dedup, job, accounting), job)
+
+
+def _drop_superseded(
+    buffer: List[Dict[str, object]],
+    dedup,
+    job: ImportJob,
+    accounting: _BatchAccounting | None = None,
+) -> List[Dict[str, object]]:
+    """
+    Keep only rows that are the last occurrence of their SKU in the file.
+    """
+    if dedup is None:
+        return buffer
+    last = dedup.last_lines(item["sku_key"] for item in buffer)
+    kept = []
+    for item in buffer:
+        if last.get(item["sku_key"]) == item["line"]:
+            kept.append(item)
+        elif accounting is not None:
+            accounting.superseded(item["line"])
+    job.duplicate_rows += len(buffer) - len(kept)
+    return kept
+
+
+def _text(value) -> str:
+    # Typed sources (JSON Lines, Parquet) may hand over numbers or None.
+    if value is None:
+        return ""
+    return (value if isinstance(value, str) else str(value)).strip()
+
+
+def _sku_key(raw_sku) -> str:
+    """
+    sku_key for a raw SKU value, exactly as _normalize_row derives it.
+    """
+    raw_sku = _text(raw_sku)
+    return normalize_sku_key(raw_sku.upper()) if raw_sku else ""
+
+
+def _parse_price(value) -> Decimal | None:
+    """
+    Price from a CSV string or a typed value. Decimals (Parquet decimal
+    columns, JSON numbers) are used as-is. None means unparseable.
+    """
+    if isinstance(value, Decimal):
+        return value if value.is_finite() else None
+    if isinstance(value, bool):
         return None
+    if isinstance(value, int):
+        return Decimal(value)
+    if isinstance(value, float):
+        return Decimal(repr(value)) if value == value and abs(value) != float("inf") else None
+    try:
+        price = Decimal(value.strip())
+    except (InvalidOperation, TypeError, AttributeError):
+        return None
+    return price if price.is_finite() else None
+
+
+def _normalize_row(row: Dict[str, object]) -> Tuple[Dict[str, object] | None, List[Tuple[str, str]]]:
+    """
+    Normalize an extracted row (see importing.compile_extractor) into an
+    internal representation for _upsert_products.
+
+    Returns (normalized, issues). `normalized` is None for rows that must be
+    skipped (e.g., missing SKU); `issues` lists (reason, detail) pairs for the
+    reject report, including values that were coerced.
+    """
+    issues: List[Tuple[str, str]] = []
+
+    raw_sku = _text(row.get("sku"))
+    if not raw_sku:
+        return None, [(REASON_MISSING_SKU, "sku is empty")]
 
     sku_upper = raw_sku.upper()
-    name = (row.get("name") or "").strip()
-    description = (row.get("description") or "").strip()
+    name = _text(row.get("name"))
+    description = _text(row.get("description"))
 
-    raw_price = (row.get("price") or "").strip()
-    if not raw_price:
+    raw_price = row.get("price")
+    if raw_price is None or (isinstance(raw_price, str) and not raw_price.strip()):
         price = Decimal("0")
     else:
-        try:
-            price = Decimal(raw_price)
-        except (InvalidOperation, TypeError):
+        price = _parse_price(raw_price)
+        if price is None:
             price = Decimal("0")
+            issues.append((REASON_INVALID_PRICE, f"price {raw_price!r} is not a number"))
 
     return {
         "sku_upper": sku_upper,
+        "sku_key": normalize_sku_key(sku_upper),
         "name": name,
         "description": description,
         "price": price,
-    }
+    }, issues
 
 
 def _upsert_products(buffer: Iterable[Dict[str, object]], job: ImportJob) -> None:
@@ -127,41 +518,50 @@ def _upsert_products(buffer: Iterable[Dict[str, object]], job: ImportJob) -> Non
     Bulk upsert Product rows for a buffer of normalized dicts.
 
     - SKUs are normalized to upper-case for storage.
-    - Uses a single query to fetch existing records (case-insensitive).
+    - Repeated SKUs in the buffer are collapsed (last one wins).
+    - Uses a single `sku_key IN (...)` query to fetch existing records.
     - Splits into bulk_create (new) & bulk_update (existing).
     - DOES NOT touch `is_active` on existing rows (UI controls that).
     """
+    start = time.perf_counter()
     items = list(buffer)
+
+    # Collapse repeated SKUs within the chunk, last row wins; otherwise
+    # bulk_create would insert both and hit the unique constraint.
+    by_key = {item["sku_key"]: item for item in items}
+    job.duplicate_rows += len(items) - len(by_key)
+    items = list(by_key.values())
     if not items:
         return
 
-    # Unique lower-cased SKUs for querying existing rows.
-    sku_lowers = {item["sku_upper"].lower() for item in items}
+    # Unique SKU keys for querying existing rows (plain index probe).
+    sku_keys = {item["sku_key"] for item in items}
 
-    existing_qs = (
-        Product.objects
-        .annotate(sku_lower=Lower("sku"))
-        .filter(sku_lower__in=sku_lowers)
-    )
-    existing_by_lower = {p.sku.lower(): p for p in existing_qs}
+    existing_by_key = {p.sku_key: p for p in Product.objects.filter(sku_key__in=sku_keys)}
 
     to_create: List[Product] = []
     to_update: List[Product] = []
+    # (old, new) facet state per written row; see products.facets.
+    facet_changes: List[Tuple] = []
 
     for item in items:
-        key = item["sku_upper"].lower()
-        existing = existing_by_lower.get(key)
+        existing = existing_by_key.get(item["sku_key"])
 
         if existing:
             # Overwrite main fields but preserve is_active.
             existing.name = item["name"]
             existing.description = item["description"]
+            old_state = (existing.is_active, existing.price)
             existing.price = item["price"]
+            facet_changes.append((old_state, (existing.is_active, existing.price)))
             to_update.append(existing)
         else:
+            facet_changes.append((None, (True, item["price"])))
             to_create.append(
                 Product(
                     sku=item["sku_upper"],
+                    # bulk_create skips pre_save, so set the key here.
+                    sku_key=item["sku_key"],
                     name=item["name"],
                     description=item["description"],
                     price=item["price"],
@@ -170,6 +570,14 @@ def _upsert_products(buffer: Iterable[Dict[str, object]], job: ImportJob) -> Non
             )
 
     with transaction.atomic():
+        if job.full_sync:
+            # Record the keys this chunk touched for the end-of-job sweep.
+            ImportJobSku.objects.bulk_create(
+                [ImportJobSku(job=job, sku=key) for key in sku_keys],
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
+
         if to_create:
             Product.objects.bulk_create(to_create, batch_size=1000)
 
@@ -180,5 +588,161 @@ def _upsert_products(buffer: Iterable[Dict[str, object]], job: ImportJob) -> Non
                 batch_size=1000,
             )
 
+        bump_catalog_version()
+        apply_deltas(changes_deltas(facet_changes))
+
         job.processed_rows = job.processed_rows + len(items)
-        job.save(update_fields=["processed_rows"])
+        job.save(update_fields=["processed_rows", "duplicate_rows"])
+
+    IMPORT_CHUNK_SECONDS.observe(time.perf_counter() - start)
+    IMPORT_ROWS.inc(len(to_create), outcome="created")
+    IMPORT_ROWS.inc(len(to_update), outcome="updated")
+
+
+@shared_task
+def ingest_dropfolder() -> int:
+    """
+    Periodic drop-folder ingest (scheduled in CELERY_BEAT_SCHEDULE when
+    settings.IMPORT_DROPFOLDER is set). Returns the number of batches queued.
+    """
+    # Imported here: dropfolder imports this module.
+    from .dropfolder import ingest
+
+    if not settings.IMPORT_DROPFOLDER:
+        return 0
+    return len(ingest(settings.IMPORT_DROPFOLDER))
+
+
+@shared_task
+def validate_import_job(job_id: str) -> None:
+    """
+    Background dry run of an import (ImportJob.MODE_VALIDATE).
+
+    Parses the file in parallel and stores the predicted created / updated /
+    unchanged / rejected counts plus a sample of changes on the job. Never
+    writes products.
+    """
+    # Imported here: validation imports this module for _normalize_row.
+    from .validation import validate_file
+
+    job = ImportJob.objects.get(pk=job_id)
+    job.status = ImportJob.STATUS_PROCESSING
+    job.error_message = ""
+    job.validation_summary = {}
+    job.save(update_fields=["status", "error_message", "validation_summary"])
+    publish_progress(job)
+
+    try:
+        if not job.file:
+            raise ValueError("No file associated with this import job.")
+
+        spec = job.profile.as_spec() if job.profile else ProfileSpec()
+        fmt = import_format(job.original_filename or job.file.name)
+        summary = validate_file(job.file.storage, job.file.name, spec, fmt=fmt)
+
+        job.validation_summary = summary
+        job.reject_counts = summary["reject_counts"]
+        job.total_rows = summary["total_rows"]
+        job.processed_rows = summary["total_rows"]
+        job.status = ImportJob.STATUS_COMPLETED
+        job.save(
+            update_fields=[
+                "validation_summary", "reject_counts", "total_rows", "processed_rows", "status",
+            ]
+        )
+        publish_progress(job)
+
+    except Exception as exc:
+        logger.exception("Validation job %s failed", job_id)
+        job.status = ImportJob.STATUS_FAILED
+        job.error_message = str(exc)
+        job.save(update_fields=["status", "error_message"])
+        publish_progress(job)
+        raise
+
+
+def _sweep_missing_products(job: ImportJob) -> None:
+    """
+    Full-sync sweep: deactivate (or delete) every product whose SKU the job
+    did not see.
+
+    Selects the missing rows with a NOT EXISTS anti-join against the job's
+    staging rows, so it scales with the catalog without loading it: one
+    UPDATE to deactivate, or primary-key batched DELETEs.
+    """
+    if not ImportJobSku.objects.filter(job=job).exists():
+        # An empty feed is far more likely a broken file than an empty
+        # catalog; never sweep everything.
+        logger.warning("Import job %s saw no SKUs; skipping full-sync sweep", job.pk)
+        return
+
+    missing = Product.objects.filter(
+        ~Exists(ImportJobSku.objects.filter(job=job, sku=OuterRef("sku_key")))
+    )
+
+    with transaction.atomic():
+        if job.sync_action == ImportJob.SYNC_DELETE:
+            # The facet deltas of the swept rows, from one GROUP BY over them.
+            facet_deltas = queryset_deltas(missing)
+            # No per-row signals: imports never send per-product webhooks.
+            swept = delete_in_batches(missing, SWEEP_BATCH_SIZE)
+        else:
+            missing = missing.filter(is_active=True)
+            removed = queryset_deltas(missing)
+            # Same rows and price bands, moved from active to inactive.
+            facet_deltas = {FACET_ACTIVE: removed[FACET_ACTIVE], FACET_INACTIVE: -removed[FACET_ACTIVE]}
+            swept = missing.update(
+                is_active=False,
+                updated_at=timezone.now(),
+            )
+
+        if swept:
+            bump_catalog_version()
+            apply_deltas(facet_deltas)
+
+        job.swept_rows = swept
+        job.save(update_fields=["swept_rows"])
+
+    ImportJobSku.objects.filter(job=job).delete()
+
+
+@shared_task
+def process_export_job(job_id: str) -> None:
+    """
+    Background catalog export.
+
+    - Streams the filtered catalog through a server-side cursor.
+    - Spools the output to a temp file on disk (never into memory), then
+      stores it on the job so the status page can offer a download.
+    """
+    job = ExportJob.objects.get(pk=job_id)
+    job.status = ImportJob.STATUS_PROCESSING
+    job.error_message = ""
+    job.row_count = 0
+    job.save(update_fields=["status", "error_message", "row_count"])
+
+    try:
+        qs, _ = filter_products(Product.objects.all(), job.filters)
+        stats: Dict[str, int] = {}
+
+        with tempfile.TemporaryFile() as tmp:
+            # The catalog scan is read-only and may lag a little; the job row
+            # itself stays on the primary.
+            chunks = iter_export_chunks(qs, job.format, compress=job.compress, stats=stats)
+            for chunk in iter_from_replica(chunks):
+                tmp.write(chunk)
+            tmp.seek(0)
+            job.file.save(export_filename(job.format, job.compress), File(tmp), save=False)
+
+        job.row_count = stats["rows"]
+        job.status = ImportJob.STATUS_COMPLETED
+        job.finished_at = timezone.now()
+        job.save(update_fields=["file", "row_count", "status", "finished_at"])
+
+    except Exception as exc:
+        logger.exception("Export job %s failed", job_id)
+        job.status = ImportJob.STATUS_FAILED
+        job.error_message = str(exc)
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "error_message", "finished_at"])
+        raise
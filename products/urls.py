@@ -5,9 +5,19 @@ urlpatterns = [
     path("upload/", views.upload_view, name="upload"),
     path("upload/<uuid:job_id>/status/", views.import_status, name="import_status"),
     path("api/import/<uuid:job_id>/", views.import_status_api, name="import_status_api"),
+    path("api/import/<uuid:job_id>/<str:action>/", views.import_control_api, name="import_control_api"),
+    path("upload/<uuid:job_id>/rejects/", views.import_reject_report, name="import_reject_report"),
+    path("upload/<uuid:job_id>/sampling/", views.import_sampling_report, name="import_sampling_report"),
+    # After the fixed upload/<uuid>/... routes; unknown actions are a 404.
+    path("upload/<uuid:job_id>/<str:action>/", views.import_control, name="import_control"),
     path("", views.product_list, name="product_list"),
     path("create/", views.ProductCreateView.as_view(), name="product_create"),
     path("<int:pk>/edit/", views.ProductUpdateView.as_view(), name="product_update"),
     path("<int:pk>/delete/", views.ProductDeleteView.as_view(), name="product_delete"),
     path("bulk-delete/", views.bulk_delete_products, name="bulk_delete_products"),
+    path("export/", views.export_products, name="export_products"),
+    path("export/<uuid:job_id>/status/", views.export_status, name="export_status"),
+    path("export/<uuid:job_id>/download/", views.export_download, name="export_download"),
+    path("api/products/", views.api_product_list, name="api_product_list"),
+    path("api/export/<uuid:job_id>/", views.export_status_api, name="export_status_api"),
 ]
\ No newline at end of file
@@ -0,0 +1,267 @@
+"""
+Dry-run ("validate only") imports.
+
+A CSV file is split into newline-aligned byte ranges that are parsed and
+normalized in parallel worker processes with exactly the same code path as
+a real import; JSON Lines and Parquet files are read sequentially through
+the importer's own readers. The parent merges the results (last occurrence
+of a SKU wins, as in a real import), makes one batched `sku_key IN (...)` pass over
+the existing catalog and predicts how many products would be created,
+updated or left unchanged. Nothing is written to the products table.
+
+The file is read through its storage backend. CSV ranges need a seekable
+local file, so a file on non-local storage is copied to a temp file first.
+Per SKU only the display SKU, name, price and a digest of the description
+travel back to the parent, which keeps the merged map small however long
+the descriptions are.
+"""
+import contextlib
+import csv
+import hashlib
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import Dict, List, Sequence, Tuple
+
+from django.db import connections
+
+from .importing import ImportFormatError, ProfileSpec, compile_extractor
+from .models import Product
+from .rejects import REASON_MISSING_SKU
+from .sources import FORMAT_CSV, open_source
+from .tasks import _normalize_row
+
+# Below this size the pool costs more than it saves.
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+VALIDATION_WORKERS = min(4, os.cpu_count() or 1)
+LOOKUP_BATCH_SIZE = 5000
+SAMPLE_SIZE = 20
+
+# sku_key -> (sku, name, price, description digest)
+Records = Dict[str, Tuple[str, str, Decimal, bytes]]
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+@contextlib.contextmanager
+def _local_path(storage, name: str):
+    """
+    A local path for the stored file `name`: the file itself on
+    filesystem storage, otherwise a temp copy.
+    """
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        path = None
+    if path is not None:
+        yield path
+        return
+    with tempfile.NamedTemporaryFile(suffix=os.path.splitext(name)[1]) as tmp:
+        with storage.open(name, "rb") as f:
+            shutil.copyfileobj(f, tmp)
+        tmp.flush()
+        yield tmp.name
+
+
+def _read_header(path: str, spec: ProfileSpec) -> Tuple[List[str], int]:
+    with open(path, "rb") as f:
+        line = f.readline()
+        header_end = f.tell()
+    if not line:
+        raise ImportFormatError("The file is empty.")
+    header = next(csv.reader([line.decode(spec.encoding)], delimiter=spec.delimiter))
+    return header, header_end
+
+
+def split_byte_ranges(path: str, start: int, parts: int) -> List[Tuple[int, int]]:
+    """
+    Split [start, EOF) into up to `parts` ranges, each ending on a newline.
+    """
+    size = os.path.getsize(path)
+    if parts <= 1 or size - start < PARALLEL_MIN_BYTES:
+        return [(start, size)]
+
+    step = (size - start) // parts
+    bounds = [start]
+    with open(path, "rb") as f:
+        for i in range(1, parts):
+            f.seek(start + i * step)
+            f.readline()  # move to the start of the next line
+            pos = f.tell()
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _iter_lines(path: str, start: int, end: int, encoding: str):
+    with open(path, "rb") as f:
+        f.seek(start)
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            yield line.decode(encoding)
+
+
+def _validate_range(path: str, start: int, end: int, header: Sequence[str], spec: ProfileSpec):
+    """
+    Worker: parse and normalize one byte range.
+
+    Returns (rows, reject_counts, records, multiline). `multiline` is set if
+    any field contained a newline, meaning a quoted record may straddle a
+    range boundary and the split can't be trusted.
+    """
+    reader = csv.reader(_iter_lines(path, start, end, spec.encoding), delimiter=spec.delimiter)
+    return _validate_rows(reader, compile_extractor(spec, header), check_multiline=True)
+
+
+def _validate_rows(reader, extract, check_multiline: bool = False):
+    rows = 0
+    multiline = False
+    reject_counts: Dict[str, int] = {}
+    records: Records = {}
+
+    for raw in reader:
+        rows += 1
+        if check_multiline and not multiline and any("\n" in v or "\r" in v for v in raw):
+            multiline = True
+        normalized, issues = _normalize_row(extract(raw))
+        for reason, _ in issues:
+            reject_counts[reason] = reject_counts.get(reason, 0) + 1
+        if normalized:
+            records[normalized["sku_key"]] = (
+                normalized["sku_upper"],
+                normalized["name"],
+                normalized["price"],
+                _digest(normalized["description"]),
+            )
+
+    return rows, reject_counts, records, multiline
+
+
+def _run_ranges(path: str, ranges, header, spec: ProfileSpec) -> list:
+    if len(ranges) == 1:
+        return [_validate_range(path, *ranges[0], header, spec)]
+
+    # Forked children must not share the parent's DB sockets.
+    connections.close_all()
+    ctx = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=len(ranges), mp_context=ctx) as pool:
+        futures = [pool.submit(_validate_range, path, start, end, header, spec) for start, end in ranges]
+        return [f.result() for f in futures]
+
+
+def _validate_csv(path: str, spec: ProfileSpec, workers: int) -> Tuple[list, int]:
+    header, header_end = _read_header(path, spec)
+    # Fails fast on a wrong layout, like a real import.
+    compile_extractor(spec, header)
+
+    ranges = split_byte_ranges(path, header_end, workers)
+    results = _run_ranges(path, ranges, header, spec)
+    if len(ranges) > 1 and any(r[3] for r in results):
+        # Quoted multi-line fields: redo it sequentially.
+        ranges = [(header_end, os.path.getsize(path))]
+        results = _run_ranges(path, ranges, header, spec)
+    return results, len(ranges)
+
+
+def validate_file(
+    storage,
+    name: str,
+    spec: ProfileSpec,
+    workers: int = VALIDATION_WORKERS,
+    fmt: str = FORMAT_CSV,
+) -> Dict[str, object]:
+    """
+    Predict the effect of importing the file `name` on `storage` without
+    writing any products.
+    """
+    t0 = time.monotonic()
+    if fmt == FORMAT_CSV:
+        with _local_path(storage, name) as path:
+            results, workers = _validate_csv(path, spec, workers)
+    else:
+        workers = 1
+        with storage.open(name, "rb") as f:
+            source = open_source(f, spec, fmt)
+            results = [_validate_rows(source.rows, compile_extractor(spec, source.header))]
+
+    total_rows = 0
+    reject_counts: Dict[str, int] = {}
+    records: Records = {}
+    for rows, counts, part, _ in results:
+        total_rows += rows
+        for reason, count in counts.items():
+            reject_counts[reason] = reject_counts.get(reason, 0) + count
+        # Later ranges win, matching the import's last-write-wins order.
+        records.update(part)
+
+    summary = _diff_against_catalog(records)
+    summary.update(
+        {
+            "total_rows": total_rows,
+            "unique_skus": len(records),
+            "duplicate_rows": total_rows - reject_counts.get(REASON_MISSING_SKU, 0) - len(records),
+            "reject_counts": reject_counts,
+            "workers": workers,
+            "elapsed_ms": int((time.monotonic() - t0) * 1000),
+        }
+    )
+    return summary
+
+
+def _diff_against_catalog(records: Records) -> Dict[str, object]:
+    created = updated = unchanged = 0
+    sample_create: List[Dict[str, str]] = []
+    sample_update: List[Dict[str, object]] = []
+
+    keys = list(records)
+    for i in range(0, len(keys), LOOKUP_BATCH_SIZE):
+        batch = keys[i:i + LOOKUP_BATCH_SIZE]
+        existing = {
+            key: (name, price, description)
+            for key, name, description, price in Product.objects.filter(sku_key__in=batch).values_list(
+                "sku_key", "name", "description", "price"
+            )
+        }
+
+        for key in batch:
+            sku, name, price, description_digest = records[key]
+            current = existing.get(key)
+            if current is None:
+                created += 1
+                if len(sample_create) < SAMPLE_SIZE:
+                    sample_create.append({"sku": sku, "name": name, "price": str(price)})
+                continue
+
+            old_name, old_price, old_description = current
+            changes = {
+                field: [str(old), str(new)]
+                for field, old, new in (("name", old_name, name), ("price", old_price, price))
+                if old != new
+            }
+            if _digest(old_description) != description_digest:
+                # Only the digest of the new text is known here.
+                changes["description"] = [old_description, "(changed)"]
+            if not changes:
+                unchanged += 1
+                continue
+
+            updated += 1
+            if len(sample_update) < SAMPLE_SIZE:
+                sample_update.append({"sku": sku, "changes": changes})
+
+    return {
+        "create": created,
+        "update": updated,
+        "unchanged": unchanged,
+        "sample_create": sample_create,
+        "sample_update": sample_update,
+    }
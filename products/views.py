@@ -1,14 +1,40 @@
+import base64
+import functools
+import hashlib
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Tuple
+
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.http import JsonResponse
+from django.db import transaction
+from django.http import Http404, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.urls import reverse_lazy
-from django.views.decorators.http import require_POST
+from django.urls import reverse, reverse_lazy
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import condition, require_GET, require_POST
 from django.views.generic import CreateView, DeleteView, UpdateView
 
+from config.db_router import iter_from_replica, use_replica
+from config.querycount import query_budget
+from config.streaming import FileResponse, StreamingHttpResponse
+
+from .catalog import aget_catalog_version, bump_catalog_version
+from .export import (
+    CONTENT_TYPES,
+    ExportError,
+    export_content_type,
+    export_filename,
+    iter_export_chunks,
+)
+from .facets import aget_facets, deferred_facet_updates, facet_summary, filtered_count, get_facets
+from .filters import FilterError, after_cursor, filter_products, sort_products
 from .forms import ImportForm, ProductForm
-from .models import ImportJob, Product
-from .tasks import process_import_job
+from .models import ExportJob, ImportJob, ImportJobSku, Product
+from .progress import cached_snapshot, job_snapshot, publish_progress
+from .rejects import REASON_LABELS
+from .tasks import process_export_job, process_import_job, validate_import_job
 
 
 @require_POST
@@ -20,7 +46,11 @@ def bulk_delete_products(request):
     Protected by a confirmation dialog in the UI.
     """
     try:
-        deleted_count, _ = Product.objects.all().delete()
+        with transaction.atomic():
+            # post_delete fires per row; apply the facet deltas once.
+            with deferred_facet_updates():
+                deleted_count, _ = Product.objects.all().delete()
+            bump_catalog_version()
         messages.success(request, f"Deleted {deleted_count} products.")
     except Exception as exc:
         messages.error(request, f"Failed to delete products: {exc!s}")
@@ -60,9 +90,9 @@ def upload_view(request):
     """
     STORY 1 – File Upload via UI.
 
-    - Accepts a CSV upload.
+    - Accepts a CSV, JSON Lines or Parquet upload.
     - Creates an ImportJob.
-    - Offloads heavy CSV processing to Celery.
+    - Offloads heavy processing to Celery.
     - Redirects to a status page that will poll a JSON API.
     """
     if request.method == "POST":
@@ -73,9 +103,21 @@ def upload_view(request):
                 original_filename=uploaded_file.name,
                 status=ImportJob.STATUS_PENDING,
                 file=uploaded_file,
+                profile=form.cleaned_data["profile"],
+                full_sync=form.cleaned_data["full_sync"],
+                sync_action=form.cleaned_data["sync_action"] or ImportJob.SYNC_DEACTIVATE,
+                sampling_enabled=form.cleaned_data["sampling_enabled"],
+                mode=(
+                    ImportJob.MODE_VALIDATE
+                    if form.cleaned_data["validate_only"]
+                    else ImportJob.MODE_IMPORT
+                ),
             )
             # Asynchronous background processing – avoids 30s web timeouts.
-            process_import_job.delay(str(job.id))
+            if job.mode == ImportJob.MODE_VALIDATE:
+                validate_import_job.delay(str(job.id))
+            else:
+                process_import_job.delay(str(job.id))
             return redirect("import_status", job_id=job.id)
     else:
         form = ImportForm()
@@ -83,62 +125,410 @@ def upload_view(request):
     return render(request, "products/upload.html", {"form": form})
 
 
+@query_budget(1)
 def import_status(request, job_id):
     """
     Renders the HTML status page (progress bar, etc.).
     """
     job = get_object_or_404(ImportJob, pk=job_id)
-    return render(request, "products/import_status.html", {"job": job})
+    return render(
+        request,
+        "products/import_status.html",
+        {
+            "job": job,
+            "reject_labels": REASON_LABELS,
+            "reject_summary": [
+                (REASON_LABELS.get(reason, reason), count)
+                for reason, count in job.reject_counts.items()
+            ],
+        },
+    )
 
 
-def import_status_api(request, job_id):
+@query_budget(1)
+@use_replica
+async def import_status_api(request, job_id):
     """
     STORY 1A – Upload Progress Visibility (polled via JS).
 
     Returns live JSON that the frontend uses to update progress bar & status.
+    Used as the fallback when the SSE stream (products/sse.py) is unavailable.
+
+    Async, and answered from the snapshot the worker keeps in Redis when
+    there is one, so hundreds of polling tabs cost neither a worker each nor
+    a database query; otherwise one async ORM lookup.
     """
+    snapshot = await cached_snapshot(job_id)
+    if snapshot is None:
+        job = await ImportJob.objects.filter(pk=job_id).afirst()
+        if job is None:
+            raise Http404("No such import.")
+        snapshot = job_snapshot(job)
+
+    return JsonResponse(snapshot)
+
+
+CONTROL_ACTIONS = ("cancel", "pause", "resume")
+
+
+def _control_import(job: ImportJob, action: str) -> str | None:
+    """
+    Apply a cancel/pause/resume action. Returns an error message if the
+    job's current state doesn't allow it.
+
+    Running imports are only flagged; the worker stops after its current
+    chunk commits. Each step is a conditional UPDATE so a job that changes
+    state concurrently (e.g. a worker picking up a pending job) can't be
+    moved into an inconsistent one.
+    """
+    jobs = ImportJob.objects.filter(pk=job.pk, mode=ImportJob.MODE_IMPORT)
+
+    if action == "cancel":
+        if not jobs.filter(status=ImportJob.STATUS_PROCESSING).update(
+            control_request=ImportJob.CONTROL_CANCEL
+        ):
+            # Queued, paused, or resumed but not yet picked up: nothing is
+            # running, so cancel directly.
+            if not jobs.filter(status__in=[ImportJob.STATUS_PENDING, ImportJob.STATUS_PAUSED]).update(
+                status=ImportJob.STATUS_CANCELLED, resume_row=0
+            ):
+                return "Only pending, running or paused imports can be cancelled."
+            ImportJobSku.objects.filter(job=job).delete()
+
+    elif action == "pause":
+        if not jobs.filter(status=ImportJob.STATUS_PROCESSING).update(
+            control_request=ImportJob.CONTROL_PAUSE
+        ):
+            return "Only running imports can be paused."
+
+    elif action == "resume":
+        if not jobs.filter(status=ImportJob.STATUS_PAUSED).update(
+            status=ImportJob.STATUS_PENDING, control_request=""
+        ):
+            return "Only paused imports can be resumed."
+        process_import_job.delay(str(job.pk))
+
+    # Also refreshes the snapshot the status API serves from Redis.
+    job.refresh_from_db()
+    publish_progress(job)
+    return None
+
+
+@require_POST
+def import_control(request, job_id, action):
+    """
+    Cancel, pause or resume an import from the status page.
+    """
+    if action not in CONTROL_ACTIONS:
+        raise Http404("Unknown action.")
     job = get_object_or_404(ImportJob, pk=job_id)
+    error = _control_import(job, action)
+    if error:
+        messages.error(request, error)
+    return redirect("import_status", job_id=job.id)
 
-    return JsonResponse(
-        {
-            "status": job.status,
-            "total_rows": job.total_rows,
-            "processed_rows": job.processed_rows,
-            "progress": job.progress_percent,
-            "error_message": job.error_message,
-        }
-    )
+
+@require_POST
+def import_control_api(request, job_id, action):
+    """
+    JSON variant of import_control; returns the job's status snapshot.
+    """
+    if action not in CONTROL_ACTIONS:
+        raise Http404("Unknown action.")
+    job = get_object_or_404(ImportJob, pk=job_id)
+    error = _control_import(job, action)
+    if error:
+        return JsonResponse({"error": error}, status=409)
+    job.refresh_from_db()
+    return JsonResponse(job_snapshot(job))
 
 
+@query_budget(3)
+@use_replica
 def product_list(request):
     """
     STORY 2 – Product Management UI (list + filters + pagination).
     """
-    qs = Product.objects.all().order_by("sku")
-
-    q_sku = request.GET.get("sku")
-    q_name = request.GET.get("name")
-    q_desc = request.GET.get("description")
-    q_active = request.GET.get("active")  # "true"/"false"/""/None
-
-    if q_sku:
-        qs = qs.filter(sku__icontains=q_sku)
-    if q_name:
-        qs = qs.filter(name__icontains=q_name)
-    if q_desc:
-        qs = qs.filter(description__icontains=q_desc)
-    if q_active in ["true", "false"]:
-        qs = qs.filter(is_active=(q_active == "true"))
+    qs, filters = filter_products(Product.objects.all(), request.GET)
+    qs, sort = sort_products(qs, request.GET.get("sort"))
+    facets = get_facets()
 
     paginator = Paginator(qs, 50)
+    known = filtered_count(filters, facets)
+    if known is not None:
+        # Unfiltered (or active-only) lists take the count from the facet
+        # counters instead of a COUNT(*) over the table.
+        paginator.count = known
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
     context = {
         "page_obj": page_obj,
-        "q_sku": q_sku or "",
-        "q_name": q_name or "",
-        "q_desc": q_desc or "",
-        "q_active": q_active or "",
+        "facets": facet_summary(facets),
+        "q_sku": filters["sku"],
+        "q_name": filters["name"],
+        "q_desc": filters["description"],
+        "q_active": filters["active"],
+        "q_price_min": filters["price_min"],
+        "q_price_max": filters["price_max"],
+        "q_updated_since": filters["updated_since"],
+        "sort": sort,
     }
     return render(request, "products/product_list.html", context)
+
+
+def import_reject_report(request, job_id):
+    """
+    Streams the gzipped rejected-row CSV for an import.
+    """
+    job = get_object_or_404(ImportJob, pk=job_id)
+    if not job.reject_report:
+        raise Http404("This import has no rejected rows.")
+    return FileResponse(
+        job.reject_report.open("rb"),
+        as_attachment=True,
+        filename=f"import-{job.pk}-rejects.csv.gz",
+        content_type="application/gzip",
+    )
+
+
+@require_GET
+@use_replica
+def export_products(request):
+    """
+    Catalog export (CSV / JSONL / Parquet, optionally gzipped).
+
+    Accepts the same filters as the product list. By default the export is
+    streamed straight to the client; `background=1` queues an ExportJob and
+    redirects to its status page instead.
+    """
+    fmt = request.GET.get("format") or "csv"
+    compress = request.GET.get("gzip") in ["1", "true"]
+    if fmt not in CONTENT_TYPES:
+        return HttpResponseBadRequest(f"Unsupported export format: {fmt}")
+
+    qs, filters = filter_products(Product.objects.all(), request.GET)
+
+    if request.GET.get("background") in ["1", "true"]:
+        job = ExportJob.objects.create(format=fmt, compress=compress, filters=filters)
+        process_export_job.delay(str(job.id))
+        return redirect("export_status", job_id=job.id)
+
+    try:
+        chunks = iter_export_chunks(qs, fmt, compress=compress)
+        # Pull the first chunk now so format errors become a 400, not a
+        # truncated stream. An uncompressed JSONL export of no rows is empty.
+        first = next(chunks, b"")
+    except ExportError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    def stream():
+        yield first
+        yield from chunks
+
+    # The body is read after the view returns, outside @use_replica.
+    response = StreamingHttpResponse(
+        iter_from_replica(stream()), content_type=export_content_type(fmt, compress)
+    )
+    response["Content-Disposition"] = f'attachment; filename="{export_filename(fmt, compress)}"'
+    return response
+
+
+def export_status(request, job_id):
+    """
+    Status page for a background export, with a download link once ready.
+    """
+    job = get_object_or_404(ExportJob, pk=job_id)
+    return render(request, "products/export_status.html", {"job": job})
+
+
+def import_sampling_report(request, job_id):
+    """
+    Downloads the collapsed-stack profile of an import run.
+    """
+    job = get_object_or_404(ImportJob, pk=job_id)
+    if not job.sampling_report:
+        raise Http404("This import was not profiled.")
+    return FileResponse(
+        job.sampling_report.open("rb"),
+        as_attachment=True,
+        filename=f"import-{job.pk}.folded",
+        content_type="text/plain",
+    )
+
+
+@query_budget(1)
+async def export_status_api(request, job_id):
+    """
+    JSON status for a background export (polled by the status page).
+    """
+    job = await ExportJob.objects.filter(pk=job_id).afirst()
+    if job is None:
+        raise Http404("No such export.")
+    return JsonResponse(
+        {
+            "status": job.status,
+            "row_count": job.row_count,
+            "error_message": job.error_message,
+            "download_url": (
+                reverse("export_download", kwargs={"job_id": job.id})
+                if job.status == ImportJob.STATUS_COMPLETED and job.file
+                else None
+            ),
+        }
+    )
+
+
+def export_download(request, job_id):
+    """
+    Streams a finished export file from storage.
+    """
+    job = get_object_or_404(ExportJob, pk=job_id)
+    if job.status != ImportJob.STATUS_COMPLETED or not job.file:
+        raise Http404("Export is not ready.")
+    return FileResponse(
+        job.file.open("rb"),
+        as_attachment=True,
+        filename=export_filename(job.format, job.compress),
+        content_type=export_content_type(job.format, job.compress),
+    )
+
+
+# Fields the JSON API can project with `fields=`.
+API_FIELDS = ("id", "sku", "name", "description", "price", "is_active", "created_at", "updated_at")
+API_DEFAULT_LIMIT = 100
+API_MAX_LIMIT = 1000
+
+
+def _preload_catalog_version(view):
+    """
+    Read the catalog version with the async ORM before @condition calls its
+    (sync) etag / last-modified functions, which then never query from the
+    event loop.
+    """
+
+    @functools.wraps(view)
+    async def wrapped(request, *args, **kwargs):
+        request._catalog_version = await aget_catalog_version()
+        return await view(request, *args, **kwargs)
+
+    return wrapped
+
+
+def _request_catalog_version(request):
+    # Read once per request by _preload_catalog_version; etag_func,
+    # last_modified_func and the view all use it.
+    return request._catalog_version
+
+
+def _api_etag(request, *args, **kwargs):
+    # Same catalog version + same query string => same response body.
+    version = _request_catalog_version(request)
+    query_hash = hashlib.md5(request.GET.urlencode().encode()).hexdigest()[:16]
+    return f"v{version.version}-{query_hash}"
+
+
+def _api_last_modified(request, *args, **kwargs):
+    return _request_catalog_version(request).updated_at
+
+
+# Sort column of each API sort as (values() name, cursor decoder).
+_CURSOR_KEYS = {
+    "id": ("id", int),
+    "sku": ("sku_key", str),
+    "price": ("price", Decimal),
+    "-price": ("price", Decimal),
+    "updated": ("updated_at", parse_datetime),
+    "-updated": ("updated_at", parse_datetime),
+}
+
+
+def _encode_cursor(sort: str, row: Dict[str, object]) -> str:
+    key, _ = _CURSOR_KEYS[sort]
+    payload = {"s": sort, "v": str(row[key]), "id": row["id"]}
+    if isinstance(row[key], datetime):
+        payload["v"] = row[key].isoformat()
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def _decode_cursor(cursor: str, sort: str) -> Tuple[object, int]:
+    """
+    (sort value, id) of the last row of the previous page. Raises
+    ValueError for a malformed cursor or one from a different sort.
+    """
+    payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    # Cursors issued before sorting existed carry only the id.
+    if payload.get("s", "id") != sort:
+        raise ValueError("cursor belongs to a different sort")
+    last_id = int(payload["id"])
+    _, decode = _CURSOR_KEYS[sort]
+    value = decode(payload.get("v", last_id))
+    if value is None:
+        raise ValueError("bad cursor value")
+    return value, last_id
+
+
+@query_budget(3)
+@use_replica
+@require_GET
+@_preload_catalog_version
+@condition(etag_func=_api_etag, last_modified_func=_api_last_modified)
+async def api_product_list(request):
+    """
+    Read-only JSON product API.
+
+    - Same filters as the HTML list (incl. price_min / price_max and
+      `updated_since`, ISO 8601); bad values are a 400.
+    - `sort=id|sku|price|-price|updated|-updated` (default id), each backed
+      by an index ending in id.
+    - `fields=sku,price` projects columns via .values(); no model instances.
+    - Cursor (keyset) pagination on (sort value, id): `cursor` / `limit`.
+    - ETag / Last-Modified come from the catalog version row, so a 304 never
+      touches the products table.
+    - Async (async ORM), so integrators polling it don't each hold a worker
+      under ASGI.
+    """
+    fields = [f for f in (request.GET.get("fields") or "").split(",") if f]
+    unknown = sorted(set(fields) - set(API_FIELDS))
+    if unknown:
+        return JsonResponse({"error": f"Unknown fields: {', '.join(unknown)}"}, status=400)
+    fields = fields or list(API_FIELDS)
+    if "id" not in fields:
+        # Needed for the cursor.
+        fields = ["id", *fields]
+
+    try:
+        qs, _ = filter_products(Product.objects.all(), request.GET, strict=True)
+        qs, sort = sort_products(qs, request.GET.get("sort"), strict=True, default="id")
+    except FilterError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    try:
+        limit = min(int(request.GET.get("limit") or API_DEFAULT_LIMIT), API_MAX_LIMIT)
+        after = _decode_cursor(request.GET["cursor"], sort) if request.GET.get("cursor") else None
+    except (ValueError, KeyError, TypeError, ArithmeticError):
+        return JsonResponse({"error": "Invalid limit or cursor."}, status=400)
+    if limit < 1:
+        return JsonResponse({"error": "limit must be positive."}, status=400)
+
+    if after is not None:
+        qs = after_cursor(qs, sort, *after)
+
+    # The sort column is needed for the next cursor even if not projected.
+    cursor_key, _ = _CURSOR_KEYS[sort]
+    rows = [row async for row in qs.values(*dict.fromkeys([*fields, cursor_key]))[: limit + 1]]
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = _encode_cursor(sort, rows[-1]) if has_more else None
+    if cursor_key not in fields:
+        for row in rows:
+            del row[cursor_key]
+
+    return JsonResponse(
+        {
+            "results": rows,
+            "next_cursor": next_cursor,
+            "catalog_version": _request_catalog_version(request).version,
+            "facets": facet_summary(await aget_facets()),
+        }
+    )
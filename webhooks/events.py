@@ -0,0 +1,73 @@
+"""
+Serialize-once webhook event payloads.
+
+An event's `data` is encoded a single time when it is triggered and stored
+as a WebhookEvent. Each delivery task loads those bytes by id and splices
+them into its envelope (`event`, `sent_at`, `data`), so neither the broker
+messages nor the per-delivery CPU grow with payload size times subscriber
+count.
+
+orjson is used when installed. Dates and times are handed back to Django's
+encoder (orjson would keep microseconds and write "+00:00" where Django
+writes milliseconds and "Z"), so both encoders emit the same bytes for the
+payloads sent here.
+"""
+import json
+from datetime import timedelta
+from typing import Dict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from config.deletion import delete_in_batches
+
+from .models import WebhookEvent
+from .rollups import PRUNE_BATCH_SIZE
+
+try:  # Faster encoder, optional.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the deployment
+    orjson = None
+
+_django_default = DjangoJSONEncoder().default
+
+
+def encode_json(value) -> bytes:
+    """
+    Compact UTF-8 JSON. Decimals, UUIDs, dates etc. are encoded as Django's
+    JSON encoder does.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_django_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(value, cls=DjangoJSONEncoder, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def envelope(event: str, data: bytes) -> bytes:
+    """
+    The request body for one delivery, around already-encoded `data`.
+    """
+    return b"".join(
+        (
+            b'{"event":',
+            encode_json(event),
+            b',"sent_at":',
+            encode_json(timezone.now().isoformat()),
+            b',"data":',
+            data,
+            b"}",
+        )
+    )
+
+
+def publish_event(event: str, payload: Dict) -> WebhookEvent:
+    return WebhookEvent.objects.create(event=event, payload=encode_json(payload))
+
+
+def prune_events(batch_size: int = PRUNE_BATCH_SIZE) -> int:
+    """
+    Delete events older than settings.WEBHOOK_EVENT_RETENTION_HOURS. Their
+    deliveries have long been sent (or given up on) by then.
+    """
+    cutoff = timezone.now() - timedelta(hours=settings.WEBHOOK_EVENT_RETENTION_HOURS)
+    return delete_in_batches(WebhookEvent.objects.filter(created_at__lt=cutoff), batch_size)
@@ -0,0 +1,22 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from webhooks.events import prune_events
+from webhooks.rollups import PRUNE_BATCH_SIZE, prune_delivery_log
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete webhook deliveries, delivery rollups and stored event "
+        "payloads older than their retention windows, in bounded batches. "
+        "Runs via Celery beat; use this for a one-off cleanup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=PRUNE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        result = prune_delivery_log(batch_size=options["batch_size"])
+        result["events"] = prune_events(batch_size=options["batch_size"])
+        self.stdout.write(json.dumps(result))
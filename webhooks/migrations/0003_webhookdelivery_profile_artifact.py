@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("webhooks", "0002_alter_webhookdelivery_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="webhookdelivery",
+            name="profile_artifact",
+            field=models.FileField(blank=True, null=True, upload_to="profiles/"),
+        ),
+    ]
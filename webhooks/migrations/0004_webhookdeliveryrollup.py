@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("webhooks", "0003_webhookdelivery_profile_artifact"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WebhookDeliveryRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "granularity",
+                    models.CharField(
+                        choices=[("minute", "Minute"), ("hour", "Hour")], max_length=8
+                    ),
+                ),
+                ("bucket_start", models.DateTimeField()),
+                ("total", models.IntegerField(default=0)),
+                ("successes", models.IntegerField(default=0)),
+                ("latency_sum_ms", models.BigIntegerField(default=0)),
+                ("latency_histogram", models.JSONField(default=list)),
+                ("p50_ms", models.IntegerField(blank=True, null=True)),
+                ("p95_ms", models.IntegerField(blank=True, null=True)),
+            ],
+            options={
+                "ordering": ("-bucket_start",),
+            },
+        ),
+        migrations.AddField(
+            model_name="webhookdeliveryrollup",
+            name="webhook",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="rollups",
+                to="webhooks.webhook",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="webhookdeliveryrollup",
+            index=models.Index(
+                fields=["granularity", "bucket_start"], name="webhook_rollup_bucket_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="webhookdeliveryrollup",
+            constraint=models.UniqueConstraint(
+                fields=("webhook", "granularity", "bucket_start"),
+                name="uniq_webhook_rollup_bucket",
+            ),
+        ),
+    ]
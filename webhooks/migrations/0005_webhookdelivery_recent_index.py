@@ -0,0 +1,37 @@
+from django.db import migrations, models
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """
+    AddIndex that, on PostgreSQL, builds the index CONCURRENTLY so the
+    (large) delivery log stays writable while it is built.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        schema_editor.add_index(model, self.index, concurrently=True)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        schema_editor.remove_index(model, self.index, concurrently=True)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("webhooks", "0004_webhookdeliveryrollup"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="webhookdelivery",
+            index=models.Index(
+                fields=["webhook", "-triggered_at"], name="webhook_delivery_recent_idx"
+            ),
+        ),
+    ]
@@ -35,9 +35,94 @@ class WebhookDelivery(models.Model):
     response_time_ms = models.IntegerField(null=True, blank=True)
     success = models.BooleanField(default=False)
     error_message = models.TextField(blank=True)
+    # Collapsed-stack profile, for the sampled share of deliveries
+    # (settings.WEBHOOK_PROFILE_SAMPLE_RATE).
+    profile_artifact = models.FileField(upload_to="profiles/", blank=True, null=True)
 
     class Meta:
         ordering = ("-triggered_at",)
+        indexes = [
+            # Deliveries page and per-webhook retention pruning.
+            models.Index(fields=["webhook", "-triggered_at"], name="webhook_delivery_recent_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Delivery #{self.pk} for {self.webhook_id}"
+
+
+class WebhookDeliveryRollup(models.Model):
+    """
+    Per-webhook delivery totals for one minute or one hour, updated as each
+    delivery is recorded (see webhooks/rollups.py), so stats never scan the
+    raw delivery log.
+
+    `latency_histogram` holds counts per rollups.LATENCY_BUCKETS_MS bucket;
+    p50/p95 are estimated from it on every update.
+    """
+
+    GRANULARITY_MINUTE = "minute"
+    GRANULARITY_HOUR = "hour"
+
+    GRANULARITY_CHOICES = [
+        (GRANULARITY_MINUTE, "Minute"),
+        (GRANULARITY_HOUR, "Hour"),
+    ]
+
+    webhook = models.ForeignKey(
+        Webhook,
+        on_delete=models.CASCADE,
+        related_name="rollups",
+    )
+    granularity = models.CharField(max_length=8, choices=GRANULARITY_CHOICES)
+    bucket_start = models.DateTimeField()
+
+    total = models.IntegerField(default=0)
+    successes = models.IntegerField(default=0)
+    latency_sum_ms = models.BigIntegerField(default=0)
+    latency_histogram = models.JSONField(default=list)
+    p50_ms = models.IntegerField(null=True, blank=True)
+    p95_ms = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("-bucket_start",)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["webhook", "granularity", "bucket_start"],
+                name="uniq_webhook_rollup_bucket",
+            ),
+        ]
+        indexes = [
+            # Retention pruning across all webhooks.
+            models.Index(fields=["granularity", "bucket_start"], name="webhook_rollup_bucket_idx"),
+        ]
+
+    @property
+    def success_rate(self) -> float | None:
+        return self.successes / self.total if self.total else None
+
+    def __str__(self) -> str:
+        return f"{self.webhook_id} {self.granularity} {self.bucket_start:%Y-%m-%d %H:%M}"
+
+
+class WebhookEvent(models.Model):
+    """
+    One triggered event's payload, JSON-encoded once (see webhooks/events.py)
+    and shared by every delivery of it: the broker only carries
+    (webhook_id, event_id), and workers send `payload` as the request body
+    without re-serializing it.
+
+    Short-lived; pruned after settings.WEBHOOK_EVENT_RETENTION_HOURS.
+    """
+
+    event = models.CharField(max_length=64)
+    payload = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Retention pruning.
+            models.Index(fields=["created_at"], name="webhook_event_created_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event} #{self.pk}"
@@ -0,0 +1,174 @@
+"""
+Incremental delivery statistics and delivery-log retention.
+
+Every recorded delivery adds itself to its webhook's minute and hour
+WebhookDeliveryRollup rows (a locked read-modify-write of two small rows),
+so success rates and latency percentiles are read from a few dozen rollup
+rows instead of the raw delivery log. The raw log and the fine-grained
+rollups are pruned in bounded batches by `prune_delivery_log()`.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Sequence
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from config.deletion import delete_in_batches
+
+from .models import Webhook, WebhookDelivery, WebhookDeliveryRollup
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency buckets; the last bucket is open-ended
+# (deliveries time out at 5s).
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+PRUNE_BATCH_SIZE = 5000
+
+
+def bucket_start(ts: datetime, granularity: str) -> datetime:
+    ts = ts.replace(second=0, microsecond=0)
+    if granularity == WebhookDeliveryRollup.GRANULARITY_HOUR:
+        ts = ts.replace(minute=0)
+    return ts
+
+
+def _bucket_index(latency_ms: int) -> int:
+    for idx, bound in enumerate(LATENCY_BUCKETS_MS):
+        if latency_ms <= bound:
+            return idx
+    return len(LATENCY_BUCKETS_MS)
+
+
+def percentile(histogram: Sequence[int], q: float) -> int | None:
+    """
+    Estimate the q-quantile (0..1) from bucket counts, interpolating
+    linearly inside the bucket. The open-ended last bucket reports its lower
+    bound.
+    """
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for idx, count in enumerate(histogram):
+        if count and seen + count >= rank:
+            lower = LATENCY_BUCKETS_MS[idx - 1] if idx else 0
+            if idx >= len(LATENCY_BUCKETS_MS):
+                return lower
+            upper = LATENCY_BUCKETS_MS[idx]
+            return int(lower + (upper - lower) * (rank - seen) / count)
+        seen += count
+    return LATENCY_BUCKETS_MS[-1]
+
+
+def record_delivery(delivery: WebhookDelivery) -> None:
+    """
+    Add a finished delivery to its minute and hour rollups.
+    """
+    latency = delivery.response_time_ms or 0
+    bucket = _bucket_index(latency)
+
+    with transaction.atomic():
+        for granularity, _ in WebhookDeliveryRollup.GRANULARITY_CHOICES:
+            rollup, _ = WebhookDeliveryRollup.objects.select_for_update().get_or_create(
+                webhook_id=delivery.webhook_id,
+                granularity=granularity,
+                bucket_start=bucket_start(delivery.triggered_at, granularity),
+                defaults={"latency_histogram": [0] * (len(LATENCY_BUCKETS_MS) + 1)},
+            )
+            histogram = list(rollup.latency_histogram) or [0] * (len(LATENCY_BUCKETS_MS) + 1)
+            histogram[bucket] += 1
+
+            rollup.total += 1
+            rollup.successes += 1 if delivery.success else 0
+            rollup.latency_sum_ms += latency
+            rollup.latency_histogram = histogram
+            rollup.p50_ms = percentile(histogram, 0.50)
+            rollup.p95_ms = percentile(histogram, 0.95)
+            rollup.save()
+
+
+def summarize(rollups: Iterable[WebhookDeliveryRollup]) -> Dict[int, Dict[str, object]]:
+    """
+    Merge rollup rows per webhook into {webhook_id: {total, successes,
+    success_rate, p50_ms, p95_ms}}.
+    """
+    merged: Dict[int, Dict[str, object]] = {}
+    for rollup in rollups:
+        entry = merged.setdefault(
+            rollup.webhook_id,
+            {"total": 0, "successes": 0, "histogram": [0] * (len(LATENCY_BUCKETS_MS) + 1)},
+        )
+        entry["total"] += rollup.total
+        entry["successes"] += rollup.successes
+        for idx, count in enumerate(rollup.latency_histogram):
+            entry["histogram"][idx] += count
+
+    for entry in merged.values():
+        histogram = entry.pop("histogram")
+        entry["success_rate"] = entry["successes"] / entry["total"] if entry["total"] else None
+        entry["p50_ms"] = percentile(histogram, 0.50)
+        entry["p95_ms"] = percentile(histogram, 0.95)
+    return merged
+
+
+def recent_stats(webhook_ids: List[int]) -> Dict[str, Dict[int, Dict[str, object]]]:
+    """
+    Last-hour (from minute rollups) and last-24h (from hour rollups) stats
+    for the given webhooks: two indexed queries regardless of volume.
+    """
+    now = timezone.now()
+    minute_rows = WebhookDeliveryRollup.objects.filter(
+        webhook_id__in=webhook_ids,
+        granularity=WebhookDeliveryRollup.GRANULARITY_MINUTE,
+        bucket_start__gte=bucket_start(now - timedelta(hours=1), WebhookDeliveryRollup.GRANULARITY_MINUTE),
+    )
+    hour_rows = WebhookDeliveryRollup.objects.filter(
+        webhook_id__in=webhook_ids,
+        granularity=WebhookDeliveryRollup.GRANULARITY_HOUR,
+        bucket_start__gte=bucket_start(now - timedelta(hours=24), WebhookDeliveryRollup.GRANULARITY_HOUR),
+    )
+    return {"hour": summarize(minute_rows), "day": summarize(hour_rows)}
+
+
+def _delete_profile_files(pks: List[int]) -> None:
+    for delivery in WebhookDelivery.objects.filter(pk__in=pks).exclude(profile_artifact="").exclude(
+        profile_artifact__isnull=True
+    ):
+        delivery.profile_artifact.delete(save=False)
+
+
+def prune_delivery_log(batch_size: int = PRUNE_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Delete raw deliveries and minute rollups past their retention windows
+    (settings.WEBHOOK_DELIVERY_RETENTION_DAYS / WEBHOOK_MINUTE_ROLLUP_RETENTION_DAYS).
+    Hour rollups are small and kept for WEBHOOK_HOUR_ROLLUP_RETENTION_DAYS.
+    """
+    now = timezone.now()
+    deliveries = 0
+    cutoff = now - timedelta(days=settings.WEBHOOK_DELIVERY_RETENTION_DAYS)
+    # Per webhook, so each batch is a range scan on (webhook, -triggered_at).
+    for webhook_id in Webhook.objects.values_list("pk", flat=True):
+        deliveries += delete_in_batches(
+            WebhookDelivery.objects.filter(webhook_id=webhook_id, triggered_at__lt=cutoff),
+            batch_size,
+            on_batch=_delete_profile_files,
+        )
+
+    rollups = 0
+    for granularity, days in (
+        (WebhookDeliveryRollup.GRANULARITY_MINUTE, settings.WEBHOOK_MINUTE_ROLLUP_RETENTION_DAYS),
+        (WebhookDeliveryRollup.GRANULARITY_HOUR, settings.WEBHOOK_HOUR_ROLLUP_RETENTION_DAYS),
+    ):
+        rollups += delete_in_batches(
+            WebhookDeliveryRollup.objects.filter(
+                granularity=granularity, bucket_start__lt=now - timedelta(days=days)
+            ),
+            batch_size,
+        )
+
+    logger.info("Pruned %d webhook deliveries and %d rollups", deliveries, rollups)
+    return {"deliveries": deliveries, "rollups": rollups}
@@ -1,41 +1,81 @@
 import logging
+import random
 import time
 from typing import Dict
 
 import requests
 from celery import shared_task
-from django.utils import timezone
+from django.conf import settings
+from django.db import transaction
 
-from .models import Webhook, WebhookDelivery
+from config.metrics import Counter, Histogram
+from config.profiling import capture_profile
+
+from .events import encode_json, envelope, prune_events, publish_event
+from .models import Webhook, WebhookDelivery, WebhookEvent
+from .rollups import prune_delivery_log, record_delivery
 
 logger = logging.getLogger(__name__)
 
+WEBHOOK_DELIVERIES = Counter(
+    "importer_webhook_deliveries",
+    "Webhook delivery attempts, by event and outcome.",
+    ["event", "outcome"],
+)
+WEBHOOK_DELIVERY_SECONDS = Histogram(
+    "importer_webhook_delivery_seconds",
+    "Webhook HTTP round-trip time, by event.",
+    ["event"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0),
+)
+
 
 @shared_task
-def deliver_webhook(webhook_id: int, payload: Dict, event: str | None = None) -> None:
+def deliver_event(webhook_id: int, event_id: int) -> None:
     """
-    Send a webhook and record a WebhookDelivery.
+    Send one stored WebhookEvent to a webhook and record a WebhookDelivery.
 
     This runs in Celery, so HTTP latency does not block the main app.
     """
     webhook = Webhook.objects.get(pk=webhook_id)
-    event = event or webhook.event
+    row = WebhookEvent.objects.filter(pk=event_id).values_list("event", "payload").first()
+    if row is None:
+        logger.warning("Webhook event %s no longer exists; not delivering to %s", event_id, webhook_id)
+        return
+    event, payload = row
+    _deliver(webhook, event, bytes(payload))
+
+
+@shared_task
+def deliver_webhook(webhook_id: int, payload: Dict, event: str | None = None) -> None:
+    """
+    Send an inline payload. Kept for messages queued before deliveries
+    referenced stored events; new code goes through deliver_event.
+    """
+    webhook = Webhook.objects.get(pk=webhook_id)
+    _deliver(webhook, event or webhook.event, encode_json(payload))
+
 
+def _deliver(webhook: Webhook, event: str, data: bytes) -> None:
     delivery = WebhookDelivery.objects.create(
         webhook=webhook,
         success=False,
         error_message="",
     )
 
+    # Profile a sampled share of deliveries; the rest never start the sampler.
+    sampled = random.random() < settings.WEBHOOK_PROFILE_SAMPLE_RATE
+    with capture_profile(delivery, "profile_artifact", enabled=sampled):
+        _send(webhook, delivery, data, event)
+
+
+def _send(webhook: Webhook, delivery: WebhookDelivery, data: bytes, event: str) -> None:
     t0 = time.time()
     try:
         r = requests.post(
             webhook.url,
-            json={
-                "event": event,
-                "sent_at": timezone.now().isoformat(),
-                "data": payload,
-            },
+            data=envelope(event, data),
+            headers={"Content-Type": "application/json"},
             timeout=5,  # keep workers responsive
         )
         elapsed_ms = int((time.time() - t0) * 1000)
@@ -45,15 +85,26 @@ def deliver_webhook(webhook_id: int, payload: Dict, event: str | None = None) ->
         delivery.success = r.ok
         delivery.error_message = "" if r.ok else r.text[:500]
         delivery.save()
+        outcome = "success" if r.ok else "http_error"
 
     except Exception as exc:  # noqa: BLE001
-        logger.warning("Webhook %s delivery failed: %s", webhook_id, exc)
+        logger.warning("Webhook %s delivery failed: %s", webhook.pk, exc)
         elapsed_ms = int((time.time() - t0) * 1000)
         delivery.status_code = None
         delivery.response_time_ms = elapsed_ms
         delivery.success = False
         delivery.error_message = str(exc)[:500]
         delivery.save()
+        outcome = "exception"
+
+    WEBHOOK_DELIVERIES.inc(event=event, outcome=outcome)
+    WEBHOOK_DELIVERY_SECONDS.observe(elapsed_ms / 1000, event=event)
+
+    try:
+        record_delivery(delivery)
+    except Exception:  # noqa: BLE001
+        # Stats are best-effort; the delivery itself is already recorded.
+        logger.exception("Could not update rollups for delivery %s", delivery.pk)
 
 
 @shared_task
@@ -66,15 +117,43 @@ def send_test_webhook(webhook_id: int) -> None:
         "type": "test",
         "message": "Test webhook from Product Importer",
     }
-    deliver_webhook.delay(webhook.id, payload, event=webhook.event)
+    record = publish_event(webhook.event, payload)
+    deliver_event.delay(webhook.id, record.pk)
+
+
+@shared_task
+def prune_webhook_deliveries() -> Dict[str, int]:
+    """
+    Periodic retention job for the raw delivery log and fine-grained rollups
+    (scheduled in CELERY_BEAT_SCHEDULE).
+    """
+    return prune_delivery_log()
+
+
+@shared_task
+def prune_webhook_events() -> int:
+    """
+    Periodic cleanup of stored event payloads (scheduled in
+    CELERY_BEAT_SCHEDULE).
+    """
+    return prune_events()
 
 
 def trigger_event_webhooks(event: str, payload: Dict) -> None:
     """
     Called from the products app (signals and import task).
 
-    Finds all enabled webhooks for `event` and queues deliveries.
+    Finds all enabled webhooks for `event`, stores the payload once and
+    queues one delivery per webhook referencing it. Queued on commit, so
+    workers never look for an event that isn't visible yet.
     """
-    qs = Webhook.objects.filter(event=event, is_enabled=True)
-    for webhook in qs:
-        deliver_webhook.delay(webhook.id, payload, event=event)
+    webhook_ids = list(Webhook.objects.filter(event=event, is_enabled=True).values_list("pk", flat=True))
+    if not webhook_ids:
+        return
+    record = publish_event(event, payload)
+
+    def enqueue() -> None:
+        for webhook_id in webhook_ids:
+            deliver_event.delay(webhook_id, record.pk)
+
+    transaction.on_commit(enqueue)
@@ -1,3 +1,137 @@
+import json
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from config.querycount import QueryBudgetTestMixin
+
+from . import events
+from .events import encode_json, prune_events
+from .models import Webhook, WebhookDelivery, WebhookDeliveryRollup, WebhookEvent
+from .rollups import prune_delivery_log, recent_stats, record_delivery
+from .tasks import deliver_event, trigger_event_webhooks
+
+
+class QueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    """
+    Declared per-view query budgets (see config/querycount.py).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.webhook = Webhook.objects.create(url="https://example.com/hook", event="product.created")
+        WebhookDelivery.objects.bulk_create(
+            WebhookDelivery(webhook=cls.webhook, status_code=200, success=True) for _ in range(60)
+        )
+
+    def test_webhook_deliveries(self):
+        response = self.assertQueryBudget(reverse("webhook_deliveries", args=[self.webhook.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["deliveries"]), 50)
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.webhook = Webhook.objects.create(url="https://example.com/hook", event="product.created")
+
+    def _deliver(self, ms: int, success: bool = True, **fields) -> WebhookDelivery:
+        delivery = WebhookDelivery.objects.create(
+            webhook=self.webhook, response_time_ms=ms, success=success, **fields
+        )
+        record_delivery(delivery)
+        return delivery
+
+    def test_record_delivery_updates_minute_and_hour(self):
+        for ms in (20, 40, 60, 80):
+            self._deliver(ms)
+        self._deliver(4000, success=False)
+
+        self.assertEqual(WebhookDeliveryRollup.objects.count(), 2)
+        for rollup in WebhookDeliveryRollup.objects.all():
+            self.assertEqual((rollup.total, rollup.successes), (5, 4))
+            self.assertEqual(rollup.latency_sum_ms, 4200)
+            self.assertTrue(25 <= rollup.p50_ms <= 100)
+            self.assertTrue(rollup.p95_ms > 1000)
+
+        stats = recent_stats([self.webhook.pk])
+        self.assertEqual(stats["hour"][self.webhook.pk]["total"], 5)
+        self.assertEqual(stats["day"][self.webhook.pk]["success_rate"], 0.8)
+
+    def test_prune_delivery_log(self):
+        old = self._deliver(10)
+        WebhookDelivery.objects.filter(pk=old.pk).update(triggered_at=timezone.now() - timedelta(days=60))
+        WebhookDeliveryRollup.objects.filter(granularity="minute").update(
+            bucket_start=timezone.now() - timedelta(days=60)
+        )
+        recent = self._deliver(10)
+
+        result = prune_delivery_log(batch_size=1)
+
+        self.assertEqual(result, {"deliveries": 1, "rollups": 1})
+        self.assertEqual(list(WebhookDelivery.objects.values_list("pk", flat=True)), [recent.pk])
+
+    def test_webhook_list_shows_rollups(self):
+        self._deliver(30)
+        response = self.client.get(reverse("webhook_list"))
+        self.assertContains(response, "1 sent")
+
+
+class EventFanOutTests(TestCase):
+    def setUp(self):
+        self.hooks = [
+            Webhook.objects.create(url=f"https://example.com/{i}", event="product.updated") for i in range(3)
+        ]
+
+    def test_payload_is_stored_once_for_all_subscribers(self):
+        with mock.patch("webhooks.tasks.deliver_event.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                trigger_event_webhooks("product.updated", {"sku": "A-1", "price": "9.50"})
+
+        event = WebhookEvent.objects.get()
+        self.assertEqual(json.loads(bytes(event.payload)), {"sku": "A-1", "price": "9.50"})
+        self.assertEqual(sorted(delay.call_args_list), sorted(mock.call(h.pk, event.pk) for h in self.hooks))
+
+    def test_no_subscribers_stores_nothing(self):
+        trigger_event_webhooks("import.completed", {"job_id": "x"})
+        self.assertFalse(WebhookEvent.objects.exists())
+
+    def test_delivery_sends_pre_encoded_body(self):
+        event = WebhookEvent.objects.create(event="product.updated", payload=b'{"sku":"A-1"}')
+        with mock.patch("webhooks.tasks.requests.post") as post:
+            post.return_value = mock.Mock(status_code=200, ok=True)
+            deliver_event(self.hooks[0].pk, event.pk)
+
+        body = json.loads(post.call_args.kwargs["data"])
+        self.assertEqual((body["event"], body["data"]), ("product.updated", {"sku": "A-1"}))
+        self.assertTrue(WebhookDelivery.objects.get().success)
+
+    def test_pruned_event_is_skipped(self):
+        event = WebhookEvent.objects.create(event="product.updated", payload=b"{}")
+        WebhookEvent.objects.filter(pk=event.pk).update(created_at=timezone.now() - timedelta(days=2))
+
+        self.assertEqual(prune_events(), 1)
+        with mock.patch("webhooks.tasks.requests.post") as post:
+            deliver_event(self.hooks[0].pk, event.pk)
+        post.assert_not_called()
+        self.assertFalse(WebhookDelivery.objects.exists())
+
+
+class EncodeJsonTests(TestCase):
+    def test_encoders_agree(self):
+        value = {
+            "at": datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=dt_timezone.utc),
+            "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "price": Decimal("1.50"),
+            "name": "Caf\u00e9",
+        }
+        fast = encode_json(value)
+        with mock.patch.object(events, "orjson", None):
+            stdlib = encode_json(value)
 
-# Create your tests here.
+        self.assertEqual(fast, stdlib)
+        self.assertEqual(json.loads(stdlib)["at"], "2026-01-02T03:04:05.123Z")
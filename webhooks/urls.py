@@ -8,4 +8,5 @@ urlpatterns = [
     path("<int:pk>/delete/", views.WebhookDeleteView.as_view(), name="webhook_delete"),
     path("<int:pk>/test/", views.webhook_test, name="webhook_test"),
     path("<int:pk>/deliveries/", views.webhook_deliveries, name="webhook_deliveries"),
+    path("deliveries/<int:pk>/profile/", views.webhook_delivery_profile, name="webhook_delivery_profile"),
 ]
\ No newline at end of file
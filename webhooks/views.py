@@ -1,10 +1,16 @@
 from django.contrib import messages
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
+from config.db_router import use_replica
+from config.querycount import query_budget
+from config.streaming import FileResponse
+
 from .forms import WebhookForm
 from .models import Webhook, WebhookDelivery
+from .rollups import recent_stats
 from .tasks import send_test_webhook
 
 
@@ -17,6 +23,15 @@ class WebhookListView(ListView):
     def get_queryset(self):
         return Webhook.objects.order_by("-created_at")
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # Stats come from the rollup tables, never the raw delivery log.
+        stats = recent_stats([w.pk for w in context["object_list"]])
+        for webhook in context["object_list"]:
+            webhook.stats_hour = stats["hour"].get(webhook.pk)
+            webhook.stats_day = stats["day"].get(webhook.pk)
+        return context
+
 
 class WebhookCreateView(CreateView):
     model = Webhook
@@ -48,6 +63,8 @@ def webhook_test(request, pk):
     return redirect("webhook_list")
 
 
+@query_budget(2)
+@use_replica
 def webhook_deliveries(request, pk):
     """
     Show latest deliveries for a given webhook.
@@ -59,3 +76,18 @@ def webhook_deliveries(request, pk):
         "webhooks/webhook_deliveries.html",
         {"webhook": webhook, "deliveries": deliveries},
     )
+
+
+def webhook_delivery_profile(request, pk):
+    """
+    Downloads the collapsed-stack profile of a sampled delivery.
+    """
+    delivery = get_object_or_404(WebhookDelivery, pk=pk)
+    if not delivery.profile_artifact:
+        raise Http404("This delivery was not profiled.")
+    return FileResponse(
+        delivery.profile_artifact.open("rb"),
+        as_attachment=True,
+        filename=f"webhook-delivery-{delivery.pk}.folded",
+        content_type="text/plain",
+    )